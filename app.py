@@ -15,7 +15,9 @@ import requests
 import time
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
+from urllib.parse import quote
 import pandas as pd
 import chardet
 from PyPDF2 import PdfReader
@@ -25,15 +27,69 @@ from azure.storage.blob import (
     ContainerClient,
     generate_blob_sas,
 )
+from blob_stream import open_blob_download, write_csv_blob
 from db_connect import get_conn
+from export_jobs import EXPORT_REUSE_SECONDS, EXPORT_STALE_SECONDS, ExportJobQueue
+from export_formats import (
+    EXPORT_COLUMNS,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMATS,
+    columnar_export_available,
+    parse_export_columns,
+    parse_export_format,
+    write_columnar_blob,
+)
 from daily_logs import search_daily_logs
-from search_sql import search_by_name, build_search_sql
+from demographic_codes import code_label, has_code_columns
+from dv_pdf import DV_PDF_SECTION, ensure_dv_pdf_search_columns, parse_dv_issue_date, search_dv_pdf_records
+from name_index import NAME_INDEX_COLUMNS, delete_record_names, normalize_name_text, refresh_record_names
+from name_suggest import (
+    NAME_SUGGEST_DEFAULT_LIMIT,
+    NAME_SUGGEST_MAX_LIMIT,
+    NAME_SUGGEST_MIN_PREFIX,
+    get_name_suggest_index,
+)
+from row_format import RowFormatter, format_date, format_eastern_datetime
+from schema_registry import has_column, has_columns, invalidate_schema, table_exists
+from search_cache import (
+    ALL_RECORD_DEPARTMENTS_SCOPE,
+    DAILY_LOGS_SCOPE,
+    DV_PDF_SCOPE,
+    RECORDS_SCOPE,
+    RETURNS_SCOPE,
+    bump_all,
+    bump_records,
+    bump_scopes,
+    get_search_cache,
+    record_department_scope,
+    search_cache_key,
+)
+from search_fanout import SEARCH_SOURCE_OK, iter_search_sources
+from search_timing import SearchProfile, log_slow_search, profile_phase
+from search_sql import (
+    build_search_sql,
+    CASE_NUMBER_MATCH_CONTAINS,
+    CASE_NUMBER_MATCH_PREFIX,
+    NAME_MATCH_LIKE,
+    NAME_MATCH_PHONETIC,
+    normalize_case_number,
+    decode_page_cursor,
+    group_rows_by_department,
+    has_record_date_column,
+    next_page_cursor,
+    json_list_param,
+    resolve_case_number_match,
+    search_by_name,
+    search_facets,
+)
 from returns import (
     RETURN_STATUS_VALUES,
+    RETURNS_SECTION,
     ensure_returns_tables,
     fetch_return_activity,
     get_return,
     log_return_activity,
+    next_returns_cursor,
     normalize_return_payload,
     normalize_service_disposition,
     parse_cognito_entry_details,
@@ -129,6 +185,11 @@ COURT_DOC_TYPE_CANONICAL_TO_VALUES = {
     "Wrongful Detainer-Grantor in Possession": ["Wrongful Detainer-Grantor in Possession"],
 }
 COURT_DOC_TYPE_OPTIONS = list(COURT_DOC_TYPE_CANONICAL_TO_VALUES.keys())
+COURT_DOC_TYPE_VARIATION_TO_CANONICAL = {
+    value.strip().lower(): canonical
+    for canonical, values in COURT_DOC_TYPE_CANONICAL_TO_VALUES.items()
+    for value in values
+}
 
 ADMIN_STATUS_CANONICAL_TO_VALUES = {
     "Cancelled": [
@@ -619,29 +680,24 @@ def _format_sql_datetime(value):
 
 
 def _dv_pdf_table_exists(cur):
-    cur.execute(
-        """
-        SELECT 1
-        FROM INFORMATION_SCHEMA.TABLES
-        WHERE TABLE_SCHEMA = 'search' AND TABLE_NAME = 'dv_pdf_records'
-        """
-    )
-    return cur.fetchone() is not None
+    return table_exists(cur, "search.dv_pdf_records")
 
 
 def _ensure_dv_pdf_optional_columns(cur):
+    ensure_dv_pdf_search_columns(cur)
+    if has_column(cur, "search.dv_pdf_records", "order_status"):
+        return
     cur.execute(
         """
         IF COL_LENGTH('search.dv_pdf_records', 'order_status') IS NULL
             ALTER TABLE search.dv_pdf_records ADD order_status NVARCHAR(255) NULL;
         """
     )
+    invalidate_schema()
 
 
 def _dv_pdf_column_exists(cur, column_name):
-    cur.execute("SELECT COL_LENGTH('search.dv_pdf_records', ?) AS len_val", column_name)
-    row = cur.fetchone()
-    return row is not None and row[0] is not None
+    return has_column(cur, "search.dv_pdf_records", column_name)
 
 
 def fetch_dv_pdf_records_from_sql():
@@ -719,6 +775,7 @@ def append_dv_pdf_record(record):
             fieldnames=["case_number", "respondent_name", "issue_date", "type", "pdf_download", "uploaded_at"],
         )
         writer.writerow(record)
+    bump_scopes(DV_PDF_SCOPE)
 
 
 def find_duplicate_dv_pdf_record(case_number, respondent_name):
@@ -786,13 +843,7 @@ def find_duplicate_dv_pdf_record(case_number, respondent_name):
 
 
 def insert_dv_pdf_record_in_sql(record, is_reissue):
-    issue_date = (record.get("issue_date") or "").strip()
-    issue_date_value = None
-    if issue_date:
-        try:
-            issue_date_value = datetime.strptime(issue_date, "%m/%d/%Y").date()
-        except ValueError:
-            issue_date_value = None
+    issue_date_value = parse_dv_issue_date(record.get("issue_date"))
 
     uploaded_at = (record.get("uploaded_at") or "").strip()
     uploaded_at_value = None
@@ -844,6 +895,7 @@ def insert_dv_pdf_record_in_sql(record, is_reissue):
         conn.commit()
     finally:
         conn.close()
+    bump_scopes(DV_PDF_SCOPE)
 
 
 def build_dv_pdf_csv_bytes(records):
@@ -1094,7 +1146,7 @@ def build_dv_email_record(payload):
     record = {
         "case_number": str(entry_details.get("Case Number") or entry_details.get("Warrant Case Number") or "").strip(),
         "respondent_name": str(entry_details.get("Respondent Name") or "").strip(),
-        "issue_date": str(entry_details.get("Date Order Was Issued") or "").strip(),
+        "issue_date": parse_dv_issue_date(entry_details.get("Date Order Was Issued")),
         "order_type": str(entry_details.get("Order Type") or "").strip(),
         "order_status": str(entry_details.get("Order Status") or "").strip(),
         "blob_name": str(payload.get("blob_name") or "").strip(),
@@ -1147,6 +1199,7 @@ def insert_dv_email_record_in_sql(payload):
         conn.commit()
     finally:
         conn.close()
+    bump_scopes(DV_PDF_SCOPE)
 
 
 def ingest_dv_email_payloads_for_run():
@@ -1362,7 +1415,23 @@ def ingest_dv_email():
 
 
 
+CIVIL_RETURN_PDFS_SCHEMA_LOCK = threading.Lock()
+_civil_return_pdfs_schema_ready = False
+
+
 def ensure_civil_return_pdfs_table(conn):
+    global _civil_return_pdfs_schema_ready
+    if _civil_return_pdfs_schema_ready:
+        return
+    with CIVIL_RETURN_PDFS_SCHEMA_LOCK:
+        if _civil_return_pdfs_schema_ready:
+            return
+        _ensure_civil_return_pdfs_table(conn)
+        invalidate_schema()
+        _civil_return_pdfs_schema_ready = True
+
+
+def _ensure_civil_return_pdfs_table(conn):
     cur = conn.cursor()
     cur.execute("""
         IF OBJECT_ID('search.civil_return_pdfs', 'U') IS NULL
@@ -1685,11 +1754,15 @@ def find_civil_return_record(cur, case_number, intake_date):
     if not case_number or not intake_date:
         return None
     normalized = normalize_case_number_for_match(case_number)
+    if has_column(cur, "search.records", "case_number_norm"):
+        case_number_sql = "case_number_norm"
+    else:
+        case_number_sql = "REPLACE(REPLACE(REPLACE(UPPER(COALESCE(case_number, '')), '-', ''), ' ', ''), '/', '')"
     cur.execute(f"""
         SELECT TOP 1 record_id
         FROM search.records
-        WHERE LOWER(LTRIM(RTRIM(COALESCE(department, '')))) = 'civil papers'
-          AND REPLACE(REPLACE(REPLACE(UPPER(COALESCE(case_number, '')), '-', ''), ' ', ''), '/', '') = ?
+        WHERE {case_number_sql} = ?
+          AND LOWER(LTRIM(RTRIM(COALESCE(department, '')))) = 'civil papers'
           AND CAST(intake_date AS date) BETWEEN DATEADD(day, -5, CAST(? AS date)) AND DATEADD(day, 5, CAST(? AS date))
         ORDER BY
           CASE WHEN CAST(intake_date AS date) = CAST(? AS date) THEN 0 ELSE 1 END,
@@ -1702,6 +1775,26 @@ def find_civil_return_record(cur, case_number, intake_date):
     return int(row[0]) if row else None
 
 
+# Optional denormalized count (sql/add_return_pdf_count.sql). It counts the
+# same distinct files the history shows; NULL means not computed yet.
+RECORD_RETURN_PDF_COUNT_SQL = """
+    UPDATE r
+    SET return_pdf_count = (
+        SELECT COUNT(DISTINCT LOWER(LTRIM(RTRIM(COALESCE(p.original_filename, p.blob_name)))))
+        FROM search.civil_return_pdfs AS p
+        WHERE p.record_id = r.record_id
+    )
+    FROM search.records AS r
+    WHERE r.record_id = ?
+"""
+
+
+def refresh_record_return_pdf_count(cur, record_id):
+    if not record_id or not has_column(cur, "search.records", "return_pdf_count"):
+        return
+    cur.execute(RECORD_RETURN_PDF_COUNT_SQL, int(record_id))
+
+
 def insert_civil_return_pdf_record(conn, payload):
     ensure_civil_return_pdfs_table(conn)
     cur = conn.cursor()
@@ -1746,7 +1839,10 @@ def insert_civil_return_pdf_record(conn, payload):
         json.dumps(payload.get("source_json") or {}, ensure_ascii=False),
     )
     new_id = int(cur.fetchone()[0])
+    refresh_record_return_pdf_count(cur, payload.get("record_id"))
     conn.commit()
+    # Civil papers rows carry their return PDF history.
+    bump_records("Civil Papers")
     return new_id, True
 
 
@@ -1793,6 +1889,7 @@ def mark_civil_record_return_pdf_comment(conn, record_id):
         WHERE record_id = ?
     """, int(record_id))
     conn.commit()
+    bump_records("Civil Papers")
 
 
 def upload_civil_return_pdf_to_blob(
@@ -2112,63 +2209,65 @@ def _ingest_civil_return_email_payloads_for_run(source_folder="inbox", move_to_p
         return {"status": "failed", "source": "graph", "ingested": 0, "error": error_text}
 
 
-def fetch_civil_return_pdf_history_for_records(record_ids):
-    ids = [int(rid) for rid in record_ids if rid]
+CIVIL_RETURN_PDF_HISTORY_FORMATTER = RowFormatter({
+    "intake_date": (("intake_date", format_date),),
+    "email_received_at": (("email_received_at", format_eastern_datetime),),
+})
+
+
+def fetch_civil_return_pdf_history_for_records(conn, record_ids):
+    """Return PDF history per record id, read on the caller's connection.
+
+    The ids go in as one JSON array parameter, so any number of records
+    takes two queries with a stable plan.
+    """
+    ids = sorted({int(rid) for rid in record_ids if rid})
     if not ids:
         return {}
-    conn = get_conn()
-    try:
-        ensure_civil_return_pdfs_table(conn)
-        cur = conn.cursor()
-        placeholders = ", ".join("?" for _ in ids)
-        cur.execute(f"""
-            WITH ranked_return_pdfs AS (
-                SELECT
-                    id, record_id, case_number, FORMAT(intake_date, 'yyyy-MM-dd') AS intake_date,
-                    email_subject, email_from,
-                    FORMAT(email_received_at AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time', 'yyyy-MM-dd h:mm tt') AS email_received_at,
-                    original_filename, blob_name, parse_status, created_at,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY record_id, LOWER(LTRIM(RTRIM(COALESCE(original_filename, blob_name))))
-                        ORDER BY email_received_at DESC, created_at DESC, id DESC
-                    ) AS rn
-                FROM search.civil_return_pdfs
-                WHERE record_id IN ({placeholders})
-            )
-            SELECT id, record_id, case_number, intake_date, email_subject, email_from,
-                   email_received_at, original_filename, blob_name, parse_status, created_at
-            FROM ranked_return_pdfs
-            WHERE rn = 1
-            ORDER BY email_received_at DESC, created_at DESC, id DESC
-        """, *ids)
-        rows = cur.fetchall()
-        columns = [col[0] for col in cur.description]
-        return_pdf_ids = [int(row[0]) for row in rows if row and row[0]]
-        download_history = {}
-        if return_pdf_ids:
-            download_placeholders = ", ".join("?" for _ in return_pdf_ids)
-            cur.execute(f"""
-                SELECT
-                    return_pdf_id,
-                    downloaded_by_email,
-                    download_route,
-                    FORMAT(downloaded_at AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time', 'yyyy-MM-dd h:mm tt') AS downloaded_at
-                FROM search.civil_return_pdf_downloads
-                WHERE return_pdf_id IN ({download_placeholders})
-                ORDER BY downloaded_at DESC, id DESC
-            """, *return_pdf_ids)
-            for download_row in cur.fetchall():
-                return_pdf_id, downloaded_by_email, download_route, downloaded_at = download_row
-                download_history.setdefault(int(return_pdf_id), []).append({
-                    "downloaded_by_email": downloaded_by_email,
-                    "download_route": download_route,
-                    "downloaded_at": downloaded_at,
-                })
-    finally:
-        conn.close()
+    ensure_civil_return_pdfs_table(conn)
+    cur = conn.cursor()
+    cur.execute("""
+        WITH ranked_return_pdfs AS (
+            SELECT
+                p.id, p.record_id, p.case_number, p.intake_date,
+                p.email_subject, p.email_from, p.email_received_at,
+                p.original_filename, p.blob_name, p.parse_status, p.created_at,
+                ROW_NUMBER() OVER (
+                    PARTITION BY p.record_id, LOWER(LTRIM(RTRIM(COALESCE(p.original_filename, p.blob_name))))
+                    ORDER BY p.email_received_at DESC, p.created_at DESC, p.id DESC
+                ) AS rn
+            FROM OPENJSON(?) WITH (record_id INT '$') AS wanted
+            JOIN search.civil_return_pdfs AS p ON p.record_id = wanted.record_id
+        )
+        SELECT id, record_id, case_number, intake_date, email_subject, email_from,
+               email_received_at, original_filename, blob_name, parse_status, created_at
+        FROM ranked_return_pdfs
+        WHERE rn = 1
+        ORDER BY email_received_at DESC, created_at DESC, id DESC
+    """, json_list_param(ids))
+    rows = CIVIL_RETURN_PDF_HISTORY_FORMATTER.format_rows(cur)
+    return_pdf_ids = [int(row["id"]) for row in rows if row.get("id")]
+    download_history = {}
+    if return_pdf_ids:
+        cur.execute("""
+            SELECT
+                d.return_pdf_id,
+                d.downloaded_by_email,
+                d.download_route,
+                d.downloaded_at
+            FROM OPENJSON(?) WITH (return_pdf_id INT '$') AS wanted
+            JOIN search.civil_return_pdf_downloads AS d ON d.return_pdf_id = wanted.return_pdf_id
+            ORDER BY d.downloaded_at DESC, d.id DESC
+        """, json_list_param(return_pdf_ids))
+        for download_row in cur.fetchall():
+            return_pdf_id, downloaded_by_email, download_route, downloaded_at = download_row
+            download_history.setdefault(int(return_pdf_id), []).append({
+                "downloaded_by_email": downloaded_by_email,
+                "download_route": download_route,
+                "downloaded_at": format_eastern_datetime(downloaded_at) if downloaded_at else None,
+            })
     history = {}
-    for row in rows:
-        item = dict(zip(columns, row))
+    for item in rows:
         rid = item.get("record_id")
         item["download_url"] = f"/civil-papers/return-pdfs/{item.get('id')}/download"
         item["download_history"] = download_history.get(int(item.get("id")), [])
@@ -2176,9 +2275,11 @@ def fetch_civil_return_pdf_history_for_records(record_ids):
     return history
 
 
-def enrich_civil_return_pdf_history(records):
+def enrich_civil_return_pdf_history(conn, records):
     civil_records = [r for r in records if str(r.get("department") or "").lower() == "civil papers"]
-    history_by_record = fetch_civil_return_pdf_history_for_records([r.get("record_id") for r in civil_records])
+    # Rows whose stored search.records.return_pdf_count is 0 skip the lookup.
+    lookup_records = [r for r in civil_records if r.get("return_pdf_count") != 0]
+    history_by_record = fetch_civil_return_pdf_history_for_records(conn, [r.get("record_id") for r in lookup_records])
     for row in civil_records:
         history = history_by_record.get(row.get("record_id"), [])
         row["return_pdf_history"] = history
@@ -2508,19 +2609,7 @@ def normalize_department_name(value) -> str:
 
 
 def records_has_columns(cur, column_names) -> bool:
-    placeholders = ", ".join("?" for _ in column_names)
-    cur.execute(
-        f"""
-        SELECT COLUMN_NAME
-        FROM INFORMATION_SCHEMA.COLUMNS
-        WHERE TABLE_SCHEMA = 'search'
-          AND TABLE_NAME = 'records'
-          AND COLUMN_NAME IN ({placeholders})
-        """,
-        tuple(column_names),
-    )
-    found = {str(row[0]).strip().lower() for row in cur.fetchall()}
-    return all(str(column).strip().lower() in found for column in column_names)
+    return has_columns(cur, "search.records", column_names)
 
 
 def records_has_xy_columns(cur) -> bool:
@@ -2532,12 +2621,15 @@ def records_has_geocode_confidence_column(cur) -> bool:
 
 
 def ensure_records_geocode_confidence_column(cur):
+    if records_has_geocode_confidence_column(cur):
+        return
     cur.execute("""
         IF COL_LENGTH('search.records', 'geocode_confidence') IS NULL
         BEGIN
             ALTER TABLE search.records ADD geocode_confidence FLOAT NULL
         END
     """)
+    invalidate_schema()
 
 
 def upsert_set_value(set_parts, values, column_name, db_value):
@@ -2588,12 +2680,11 @@ def record_civil_return_pdf_downloads(conn, return_pdf_ids, route_name):
     ensure_civil_return_pdfs_table(conn)
     cur = conn.cursor()
     downloaded_by_email = get_current_user_email(cur)
-    placeholders = ", ".join("?" for _ in ids)
-    cur.execute(f"""
+    cur.execute("""
         SELECT id, record_id
         FROM search.civil_return_pdfs
-        WHERE id IN ({placeholders})
-    """, *ids)
+        WHERE id IN (SELECT id FROM OPENJSON(?) WITH (id INT '$'))
+    """, json_list_param(ids))
     rows = cur.fetchall()
     for return_pdf_id, record_id in rows:
         cur.execute("""
@@ -2603,6 +2694,25 @@ def record_civil_return_pdf_downloads(conn, return_pdf_ids, route_name):
             VALUES (?, ?, ?, ?)
         """, int(return_pdf_id), record_id, downloaded_by_email, route_name)
     conn.commit()
+    if rows:
+        # Cached Civil Papers pages embed each PDF's download history.
+        bump_records("Civil Papers")
+
+
+def record_civil_return_pdf_downloads_if_sent(response, return_pdf_ids, route_name):
+    """Log the downloads only for a full (200) response.
+
+    Range (206) and If-None-Match (304) requests resume or revalidate a
+    download that was already logged; error tuples are not downloads.
+    """
+    if isinstance(response, tuple) or response.status_code != 200 or not return_pdf_ids:
+        return response
+    conn = get_conn()
+    try:
+        record_civil_return_pdf_downloads(conn, return_pdf_ids, route_name)
+    finally:
+        conn.close()
+    return response
 
 
 def format_edit_value(value):
@@ -2660,6 +2770,8 @@ CONNECTION_STRING = os.environ.get("AZURE_STORAGE_CONNECTION_STRING")
 LATEST_LT_WITH_APT_BLOB_NAME = "latest_landlord_tenant_with_apt.csv"
 EXPORT_CONTAINER_NAME = os.environ.get("EXPORT_CONTAINER_NAME", "fscsv")
 EXPORTS_BLOB_PREFIX = os.environ.get("EXPORTS_BLOB_PREFIX", "exports")
+# Store exports gzip-compressed; downloads carry Content-Encoding: gzip.
+EXPORT_GZIP = (os.environ.get("EXPORT_GZIP") or "").strip().lower() in {"1", "true", "yes"}
 DV_PDF_CSV_PATH = os.path.join("static", "uploads", "dv_pdf_records.csv")
 DV_PDF_BLOB_CONTAINER = os.environ.get("DV_PDF_BLOB_CONTAINER", "dvcsv").strip() or "dvcsv"
 DV_PDF_BLOB_PREFIX = os.environ.get("DV_PDF_BLOB_PREFIX", "dv_pdf").strip().strip("/") or "dv_pdf"
@@ -3020,13 +3132,7 @@ def download_latest_landlord_tenant_with_apt():
     if not blob.exists():
         return jsonify({"error": "Latest landlord/tenant file is not ready yet."}), 404
 
-    data = blob.download_blob().readall()
-    return send_file(
-        pd.io.common.BytesIO(data),
-        mimetype="text/csv",
-        as_attachment=True,
-        download_name=LATEST_LT_WITH_APT_BLOB_NAME,
-    )
+    return send_blob(blob, LATEST_LT_WITH_APT_BLOB_NAME, mimetype="text/csv")
 
 
 @app.route("/dv-pdf/upload", methods=["POST"])
@@ -3152,6 +3258,7 @@ def upload_wor_file():
         conn.commit()
     finally:
         conn.close()
+    bump_records()
 
     return jsonify({"ok": True, "blob_name": blob_name}), 201
 
@@ -3175,15 +3282,13 @@ def download_wor_file():
     try:
         container = get_wor_files_container()
         blob_client = container.get_blob_client(blob_name)
-        data = blob_client.download_blob().readall()
         props = blob_client.get_blob_properties()
+        filename = (props.metadata or {}).get("original_filename") or os.path.basename(blob_name)
+        content_type = (props.content_settings.content_type if props.content_settings else None) or "application/octet-stream"
+        return send_blob(blob_client, filename, mimetype=content_type, properties=props)
     except Exception as exc:
         return jsonify({"error": f"Unable to download file from blob storage: {exc}"}), 500
 
-    filename = (props.metadata or {}).get("original_filename") or os.path.basename(blob_name)
-    content_type = (props.content_settings.content_type if props.content_settings else None) or "application/octet-stream"
-    return send_file(io.BytesIO(data), mimetype=content_type, as_attachment=True, download_name=filename)
-
 
 @app.route("/civil-papers/files/upload", methods=["POST"])
 def upload_civil_papers_file():
@@ -3218,6 +3323,32 @@ def upload_civil_papers_file():
     return jsonify({"ok": True, "blob_name": blob_name}), 201
 
 
+def send_blob(blob_client, download_name, mimetype=None, properties=None):
+    """Stream ``blob_client`` as an attachment, honouring Range, If-Range and If-None-Match."""
+    status, headers, chunks = open_blob_download(
+        blob_client,
+        range_header=request.headers.get("Range"),
+        if_range=request.headers.get("If-Range"),
+        if_none_match=request.headers.get("If-None-Match"),
+        properties=properties,
+    )
+    response = app.response_class(chunks, status=status, headers=headers, mimetype=mimetype)
+    try:
+        download_name.encode("ascii")
+        response.headers.set("Content-Disposition", "attachment", filename=download_name)
+    except UnicodeEncodeError:
+        response.headers.set(
+            "Content-Disposition",
+            "attachment",
+            filename=download_name.encode("ascii", "ignore").decode("ascii") or "download",
+            **{"filename*": f"UTF-8''{quote(download_name)}"},
+        )
+    # Downloads are per-user; let the browser keep them but revalidate by ETag.
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
 def send_civil_blob_collection(container, blob_names, zip_download_name, empty_message="No files found"):
     unique_blob_names = []
     seen = set()
@@ -3233,20 +3364,13 @@ def send_civil_blob_collection(container, blob_names, zip_download_name, empty_m
         blob_name = unique_blob_names[0]
         try:
             blob_client = container.get_blob_client(blob_name)
-            data = blob_client.download_blob().readall()
             props = blob_client.get_blob_properties()
+            filename = (props.metadata or {}).get("original_filename") or os.path.basename(blob_name)
+            content_type = (props.content_settings.content_type if props.content_settings else None) or "application/octet-stream"
+            return send_blob(blob_client, filename, mimetype=content_type, properties=props)
         except Exception as exc:
             return jsonify({"error": f"Unable to download file from blob storage: {exc}"}), 500
 
-        filename = (props.metadata or {}).get("original_filename") or os.path.basename(blob_name)
-        content_type = (props.content_settings.content_type if props.content_settings else None) or "application/octet-stream"
-        return send_file(
-            io.BytesIO(data),
-            mimetype=content_type,
-            as_attachment=True,
-            download_name=filename,
-        )
-
     zip_buffer = io.BytesIO()
     try:
         with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
@@ -3288,14 +3412,13 @@ def download_civil_return_pdf(return_pdf_id):
             WHERE id = ?
         """, return_pdf_id)
         row = cur.fetchone()
-        if row and row[0]:
-            record_civil_return_pdf_downloads(conn, [return_pdf_id], "return_pdf")
     finally:
         conn.close()
     if not row or not row[0]:
         return jsonify({"error": "Return PDF not found"}), 404
     container = get_civil_files_container()
-    return send_civil_blob_collection(container, [row[0]], "return_pdf.pdf", "Return PDF not found")
+    response = send_civil_blob_collection(container, [row[0]], "return_pdf.pdf", "Return PDF not found")
+    return record_civil_return_pdf_downloads_if_sent(response, [return_pdf_id], "return_pdf")
 
 
 @app.route("/civil-papers/files/download")
@@ -3305,6 +3428,7 @@ def download_civil_papers_files():
     if not case_number and not record_id:
         return jsonify({"error": "Missing case number or record ID"}), 400
 
+    return_pdf_ids = []
     try:
         container = get_civil_files_container()
         blob_names = []
@@ -3336,18 +3460,18 @@ def download_civil_papers_files():
                 return_rows = cur.fetchall()
                 return_pdf_ids = [int(row[0]) for row in return_rows if row[0]]
                 blob_names.extend(row[1] for row in return_rows if row[1])
-                record_civil_return_pdf_downloads(conn, return_pdf_ids, "record_files")
             finally:
                 conn.close()
     except Exception as exc:
         return jsonify({"error": f"Unable to list files from blob storage: {exc}"}), 500
 
-    return send_civil_blob_collection(
+    response = send_civil_blob_collection(
         container,
         blob_names,
         f"civil_papers_{case_key}_files.zip",
         "No files found for this record",
     )
+    return record_civil_return_pdf_downloads_if_sent(response, return_pdf_ids, "record_files")
 
 
 @app.route("/dv-pdf/files/upload", methods=["POST"])
@@ -3409,20 +3533,13 @@ def download_dv_case_files():
         blob_name = blobs[0]
         try:
             blob_client = container.get_blob_client(blob_name)
-            data = blob_client.download_blob().readall()
             props = blob_client.get_blob_properties()
+            filename = (props.metadata or {}).get("original_filename") or os.path.basename(blob_name)
+            content_type = (props.content_settings.content_type if props.content_settings else None) or "application/octet-stream"
+            return send_blob(blob_client, filename, mimetype=content_type, properties=props)
         except Exception as exc:
             return jsonify({"error": f"Unable to download file from blob storage: {exc}"}), 500
 
-        filename = (props.metadata or {}).get("original_filename") or os.path.basename(blob_name)
-        content_type = (props.content_settings.content_type if props.content_settings else None) or "application/octet-stream"
-        return send_file(
-            io.BytesIO(data),
-            mimetype=content_type,
-            as_attachment=True,
-            download_name=filename,
-        )
-
     zip_buffer = io.BytesIO()
     try:
         with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
@@ -3453,22 +3570,15 @@ def download_dv_pdf_file(blob_name):
     if not normalized or ".." in normalized:
         return jsonify({"error": "Invalid file path"}), 400
 
+    filename = os.path.basename(normalized) or "dv_pdf.pdf"
     try:
         blob_client = get_dv_pdf_blob_client(normalized)
         if not blob_client.exists():
             return jsonify({"error": "DV PDF file not found in blob storage"}), 404
-        data = blob_client.download_blob().readall()
+        return send_blob(blob_client, filename, mimetype="application/pdf")
     except Exception as exc:
         return jsonify({"error": f"Unable to download DV PDF from blob storage: {exc}"}), 500
 
-    filename = os.path.basename(normalized) or "dv_pdf.pdf"
-    return send_file(
-        io.BytesIO(data),
-        mimetype="application/pdf",
-        as_attachment=True,
-        download_name=filename,
-    )
-
 
 @app.route("/downloads/dv-pdf.csv")
 def download_dv_pdf_csv():
@@ -3479,13 +3589,7 @@ def download_dv_pdf_csv():
             container = ContainerClient.from_connection_string(CONNECTION_STRING, DV_PDF_BLOB_CONTAINER)
             blob = container.get_blob_client(DV_PDF_CSV_BLOB_NAME)
             if blob.exists():
-                data = blob.download_blob().readall()
-                return send_file(
-                    io.BytesIO(data),
-                    mimetype="text/csv",
-                    as_attachment=True,
-                    download_name="dv_pdf_records.csv",
-                )
+                return send_blob(blob, "dv_pdf_records.csv", mimetype="text/csv")
     except Exception:
         pass
 
@@ -3582,9 +3686,11 @@ def create_record():
         cur = conn.cursor()
         cur.execute(sql, tuple(insert_data[c] for c in columns))
         record_id = cur.fetchone()[0]
+        refresh_record_names(cur, record_id)
         conn.commit()
     finally:
         conn.close()
+    bump_records(insert_data["department"])
 
     return jsonify({"status": "success", "record_id": record_id})
 
@@ -3640,6 +3746,7 @@ def esri_webhook():
         conn.commit()
     finally:
         conn.close()
+    bump_records("Civil Papers")
 
     return jsonify({"status": "ok"})
 
@@ -3737,6 +3844,7 @@ def esri_webhook1():
         conn.commit()
     finally:
         conn.close()
+    bump_records("Civil Papers")
 
     return jsonify({"status": "ok"})
 
@@ -3815,6 +3923,8 @@ def update_record(record_id):
             f"UPDATE search.records SET {', '.join(set_parts)} WHERE record_id = ?",
             tuple(values)
         )
+        if any(column in NAME_INDEX_COLUMNS for column in updates):
+            refresh_record_names(cur, record_id)
 
         if is_bcso_active_warrants and changed_fields:
             edited_by_email = get_current_user_email(cur)
@@ -3849,6 +3959,7 @@ def update_record(record_id):
         conn.commit()
     finally:
         conn.close()
+    bump_records(existing_record.get("department"))
 
     return jsonify({"status": "success", "edits": edits})
 
@@ -3938,6 +4049,7 @@ def update_dv_pdf_record(record_id):
         conn.commit()
     finally:
         conn.close()
+    bump_scopes(DV_PDF_SCOPE)
 
     return jsonify({"status": "success"})
 
@@ -3960,9 +4072,11 @@ def delete_record(record_id):
             return jsonify({"error": "Deleting is not allowed for this department"}), 403
 
         cur.execute("DELETE FROM search.records WHERE record_id = ?", record_id)
+        delete_record_names(cur, record_id)
         conn.commit()
     finally:
         conn.close()
+    bump_records(existing[0])
 
     return jsonify({"status": "success"})
 @app.route("/run-ingest", methods=["GET"])
@@ -4089,11 +4203,15 @@ def _run_ingest_pipeline_background():
                 "finished_at": datetime.now(UTC).isoformat(),
                 "error": str(e),
             })
+    finally:
+        # Even a failed run may have written some sources before stopping.
+        bump_all()
 @app.route("/run-active-warrants", methods=["POST"])
 def run_active_warrants():
     
     from ingest import ingest_bcso_active_warrants_csv
     ingest_bcso_active_warrants_csv()
+    bump_records("BCSO_ACTIVE_WARRANTS")
     return "OK"
 
 @app.route("/run-warrant-of-restitution", methods=["POST"])
@@ -4106,6 +4224,7 @@ from ingest import ingest_wor
 def ingest_wor_route():
     payload = request.get_json(silent=True) or {}
     result = ingest_wor(payload)
+    bump_records()
     return jsonify(result)
 
 
@@ -4130,10 +4249,13 @@ def parse_search_filters(source):
     dob = source.get("dob", "").strip()
     court_document_type = source.get("court_document_type", "").strip()
     admin_status = source.get("admin_status", "").strip()
+    case_match = source.get("case_match", "").strip().lower()
+    fuzzy = str(source.get("fuzzy") or "").strip().lower() in {"1", "true", "yes"}
 
     return {
         "query": query,
         "case_number": case_number or None,
+        "case_number_match": CASE_NUMBER_MATCH_CONTAINS if case_match == CASE_NUMBER_MATCH_CONTAINS else CASE_NUMBER_MATCH_PREFIX,
         "date_start": date_start,
         "date_end": date_end,
         "last_x_days": last_x_days or None,
@@ -4146,9 +4268,249 @@ def parse_search_filters(source):
         "court_document_type_values": get_court_doc_type_values(court_document_type),
         "admin_status": admin_status or None,
         "admin_status_values": get_admin_status_values(admin_status),
+        "fuzzy": fuzzy,
+    }
+
+
+DEFAULT_SEARCH_PAGE_SIZE = int(os.environ.get("SEARCH_PAGE_SIZE", "200"))
+MAX_SEARCH_PAGE_SIZE = 1000
+# "trigram" narrows name search with search.name_trigrams; search stays on LIKE
+# until scripts/backfill_name_trigrams.py has completed once.
+SEARCH_NAME_MATCH = (os.environ.get("SEARCH_NAME_MATCH") or NAME_MATCH_LIKE).strip().lower()
+
+
+# Bounded pool shared by all /search_all requests; each source holds one
+# connection while it runs, so this also caps search connections per worker.
+SEARCH_FANOUT_WORKERS = int(os.environ.get("SEARCH_FANOUT_WORKERS", "12"))
+SEARCH_DEADLINE_SECONDS = float(os.environ.get("SEARCH_DEADLINE_SECONDS", "20"))
+SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=SEARCH_FANOUT_WORKERS, thread_name_prefix="search")
+
+
+def parse_search_page_size(source):
+    text = str(source.get("page_size") or "").strip()
+    try:
+        page_size = int(text) if text else DEFAULT_SEARCH_PAGE_SIZE
+    except ValueError:
+        page_size = DEFAULT_SEARCH_PAGE_SIZE
+    return max(1, min(page_size, MAX_SEARCH_PAGE_SIZE))
+
+
+def search_records_kwargs(filters):
+    return {
+        "name_query": filters["query"],
+        "case_number": filters["case_number"],
+        "dob": filters["dob"],
+        "sex": filters["sex"],
+        "race": filters["race"],
+        "date_start": filters["date_start"],
+        "date_end": filters["date_end"],
+        "issuing_county": filters["issuing_county"],
+        "last_x_days": filters["last_x_days"],
+        "sid": filters["sid"],
+        "court_doc_types": filters["court_document_type_values"],
+        "admin_status_values": filters["admin_status_values"],
+        "name_match": NAME_MATCH_PHONETIC if filters["fuzzy"] else SEARCH_NAME_MATCH,
+        "case_number_match": filters["case_number_match"],
     }
 
 
+def search_cache_filters(filters):
+    """``parse_search_filters`` output with case-insensitive values folded for cache keys."""
+    normalized = dict(filters)
+    normalized["query"] = " ".join(str(filters["query"] or "").lower().split())
+    if filters["case_number"]:
+        normalized["case_number"] = normalize_case_number(filters["case_number"])
+    for key in ("sex", "race", "issuing_county"):
+        if filters[key]:
+            normalized[key] = filters[key].lower()
+    return normalized
+
+
+def json_body_response(body, cache_status, profile=None):
+    response = app.response_class(body, mimetype="application/json")
+    response.headers["X-Search-Cache"] = cache_status
+    if profile is not None:
+        response.headers["Server-Timing"] = profile.server_timing()
+    return response
+
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+SEARCH_SOURCE_NAMES = ("records", "dv_pdf", "daily_logs", "returns")
+DEFAULT_RECORD_DEPARTMENTS = (
+    "Civil Papers",
+    "Bcso Active Warrants",
+    "Active Warrants",
+    "Baltimore Jail Population",
+    "Doc Jail Population",
+    "Field Services Department",
+    "Warrant Of Restitution - Mdec",
+)
+SOURCE_SECTION_NAMES = {
+    "dv_pdf": DV_PDF_SECTION,
+    "daily_logs": "Daily Logs",
+    "returns": RETURNS_SECTION,
+}
+
+
+def search_source_sections(source_name, value, status, page_size):
+    """Department sections contributed by one /search_all source."""
+    if source_name == "records":
+        department_counts, department_rows = value or ({}, {})
+        sections = {
+            dept: {"count": department_counts[dept], **build_department_page(rows, page_size, dept)}
+            for dept, rows in department_rows.items()
+        }
+        for dept in DEFAULT_RECORD_DEPARTMENTS:
+            section = {"count": 0, "records": []}
+            if status != SEARCH_SOURCE_OK:
+                section["status"] = status
+            sections.setdefault(dept, section)
+        return sections
+    if source_name in ("dv_pdf", "returns"):
+        count, page = value or (0, {"records": [], "next_cursor": None})
+        section = {"count": count, **page}
+        if status != SEARCH_SOURCE_OK:
+            section["status"] = status
+        return {SOURCE_SECTION_NAMES[source_name]: section}
+    records = value or []
+    section = {"count": len(records), "records": records}
+    if status != SEARCH_SOURCE_OK:
+        section["status"] = status
+    return {SOURCE_SECTION_NAMES[source_name]: section}
+
+
+def iter_search_all_sections(sources, page_size, profile=None):
+    """Yield ``(department, section)`` as each source finishes, then ``("_sources", statuses)``.
+
+    Sources that were not run for this request still yield their empty sections.
+    """
+    for source_name in SEARCH_SOURCE_NAMES:
+        if source_name not in sources:
+            yield from search_source_sections(source_name, None, SEARCH_SOURCE_OK, page_size).items()
+    source_statuses = {}
+    for source_name, value, status in iter_search_sources(SEARCH_EXECUTOR, sources, SEARCH_DEADLINE_SECONDS):
+        source_statuses[source_name] = status
+        with profile_phase(profile, "group"):
+            sections = search_source_sections(source_name, value, status["status"], page_size)
+        yield from sections.items()
+    # Keys starting with "_" are metadata, not department sections.
+    yield "_sources", source_statuses
+
+
+def search_sources_complete(source_statuses):
+    return all(status["status"] == SEARCH_SOURCE_OK for status in source_statuses.values())
+
+
+def ndjson_frame(frame, profile=None):
+    with profile_phase(profile, "serialize"):
+        return app.json.dumps(frame) + "\n"
+
+
+def ndjson_response(frames, cache_status, profile=None):
+    response = app.response_class(frames, mimetype=NDJSON_MIMETYPE)
+    response.headers["X-Search-Cache"] = cache_status
+    if profile is not None:
+        # Only the phases finished before the first frame; the slow-search
+        # log gets the full profile once the stream ends.
+        response.headers["Server-Timing"] = profile.server_timing()
+    # Keep reverse proxies from buffering the stream.
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def stream_search_all_frames(sections, search_cache, cache_key, generations, profile, log_filters):
+    """Emit one NDJSON frame per department section as it becomes available."""
+    response = {}
+    for dept, section in sections:
+        response[dept] = section
+        yield ndjson_frame({dept: section}, profile)
+    if search_sources_complete(response["_sources"]):
+        with profile_phase(profile, "serialize"):
+            body = app.json.dumps(response).encode("utf-8")
+        search_cache.put(cache_key, generations, body)
+    log_slow_search(profile, log_filters)
+
+
+def iter_cached_frames(body):
+    for dept, section in json.loads(body).items():
+        yield ndjson_frame({dept: section})
+
+
+def build_department_page(rows, page_size, department):
+    next_cursor = next_page_cursor(rows, page_size, department)
+    for row in rows:
+        row.pop("page_created_at", None)
+    return {"records": rows, "next_cursor": next_cursor}
+
+
+def search_department_records(record_kwargs, page_size, profile=None):
+    conn = get_conn()
+    try:
+        rows = search_by_name(conn, **record_kwargs, per_department=page_size, profile=profile)
+        with profile_phase(profile, "group"):
+            department_counts, department_rows = group_rows_by_department(rows)
+        with profile_phase(profile, "civil_pdf_history"):
+            enrich_civil_return_pdf_history(conn, [row for dept_rows in department_rows.values() for row in dept_rows])
+    finally:
+        conn.close()
+    return department_counts, department_rows
+
+
+def search_daily_logs_source(filters, profile=None):
+    conn = get_conn()
+    try:
+        with profile_phase(profile, "daily_logs"):
+            records = search_daily_logs(conn, filters)
+    finally:
+        conn.close()
+    if profile is not None:
+        profile.add_rows("daily_logs", len(records))
+    return records
+
+
+def search_returns_source(filters, exclude_uploaded, page_size, cursor=None, profile=None):
+    """Return ``(count, page)`` for the Returns section; ``count`` is None after the first page."""
+    conn = get_conn()
+    try:
+        with profile_phase(profile, "returns"):
+            count, records = search_returns(
+                conn, filters, exclude_uploaded=exclude_uploaded, page_size=page_size, cursor=cursor
+            )
+    finally:
+        conn.close()
+    next_cursor = next_returns_cursor(records, page_size)
+    for record in records:
+        record.pop("page_created_at", None)
+    if profile is not None:
+        profile.add_rows("returns", len(records))
+    return count, {"records": records, "next_cursor": next_cursor}
+
+
+def search_dv_pdf_source(filters, page_size, cursor=None, profile=None):
+    """Return ``(count, page)`` for the DV PDF section; ``count`` is None after the first page."""
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        if _dv_pdf_table_exists(cur):
+            _ensure_dv_pdf_optional_columns(cur)
+            with profile_phase(profile, "dv_pdf"):
+                count, rows = search_dv_pdf_records(conn, filters, page_size, cursor=cursor)
+            page = build_department_page(rows, page_size, DV_PDF_SECTION)
+        else:
+            # Legacy CSV store, only used before search.dv_pdf_records existed.
+            with profile_phase(profile, "dv_pdf_filter"):
+                ensure_dv_pdf_storage()
+                with open(DV_PDF_CSV_PATH, "r", newline="", encoding="utf-8") as f:
+                    rows = filter_dv_pdf_records(list(csv.DictReader(f)), filters)
+            count = len(rows)
+            page = {"records": rows, "next_cursor": None}
+    finally:
+        conn.close()
+    if profile is not None:
+        profile.add_rows("dv_pdf", len(page["records"]))
+    return count, page
+
+
 def json_safe_return(record):
     output = {}
     for key, value in (record or {}).items():
@@ -4256,10 +4618,89 @@ def ensure_exports_table(conn):
                 updated_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
             )
         END
+        IF COL_LENGTH('search.exports', 'format') IS NULL
+            ALTER TABLE search.exports ADD format NVARCHAR(20) NULL
+        IF COL_LENGTH('search.exports', 'job_key') IS NULL
+            ALTER TABLE search.exports ADD job_key CHAR(64) NULL
+    """)
+    cur.execute("""
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'IX_exports_job_key'
+              AND object_id = OBJECT_ID('search.exports')
+        )
+        CREATE INDEX IX_exports_job_key ON search.exports(job_key, created_at DESC) INCLUDE (status, updated_at)
     """)
     conn.commit()
 
 
+EXPORT_IN_FLIGHT_STATUSES = ("queued", "started", "processing")
+EXPORT_IN_FLIGHT_SQL = f"status IN ({', '.join(repr(status) for status in EXPORT_IN_FLIGHT_STATUSES)})"
+
+
+def heartbeat_exports(tokens):
+    """Mark this worker's queued and running exports as still alive."""
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            UPDATE search.exports SET updated_at = SYSUTCDATETIME()
+            WHERE token IN (SELECT value FROM OPENJSON(?)) AND {EXPORT_IN_FLIGHT_SQL}
+            """,
+            json.dumps(tokens)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+EXPORT_QUEUE = ExportJobQueue(heartbeat=heartbeat_exports)
+
+
+def fail_stale_exports(cur, column, value):
+    """Fail in-flight exports matching ``column = value`` whose worker stopped heartbeating."""
+    cur.execute(
+        f"""
+        UPDATE search.exports
+        SET status = 'failed', error = 'Export was interrupted. Please start it again.', updated_at = SYSUTCDATETIME()
+        WHERE {column} = ? AND {EXPORT_IN_FLIGHT_SQL}
+          AND updated_at < DATEADD(second, -?, SYSUTCDATETIME())
+        """,
+        value, int(EXPORT_STALE_SECONDS)
+    )
+
+
+def export_job_key(filters, export_format, columns):
+    return search_cache_key({
+        "export": search_cache_filters(filters),
+        "format": export_format,
+        "columns": columns,
+        "gzip": EXPORT_GZIP,
+    })
+
+
+def find_reusable_export(cur, job_key):
+    """Token and status of a queued, running or recently ready export with ``job_key``.
+
+    Takes an update lock on the key range so a concurrent identical request
+    waits for this transaction instead of starting a second job. Orphaned
+    jobs are failed first so nothing attaches to them.
+    """
+    fail_stale_exports(cur, "job_key", job_key)
+    cur.execute(
+        f"""
+        SELECT TOP 1 token, status
+        FROM search.exports WITH (UPDLOCK, HOLDLOCK)
+        WHERE job_key = ?
+          AND ({EXPORT_IN_FLIGHT_SQL} OR (status = 'ready' AND updated_at >= DATEADD(second, -?, SYSUTCDATETIME())))
+        ORDER BY created_at DESC
+        """,
+        job_key, int(EXPORT_REUSE_SECONDS)
+    )
+    return cur.fetchone()
+
+
 def _sanitize_column_name(name, used):
     safe = re.sub(r"[^0-9a-zA-Z_]+", "_", str(name)).strip("_").lower()
     if not safe:
@@ -4323,6 +4764,9 @@ def _iter_export_rows(cursor, filters):
         court_doc_types=filters["court_document_type_values"],
         admin_status_values=filters["admin_status_values"],
         extra_where=["LOWER(LTRIM(RTRIM(r.department))) = 'field services department'"],
+        case_number_match=resolve_case_number_match(cursor, filters["case_number_match"]),
+        record_date_column=has_record_date_column(cursor),
+        code_columns=has_code_columns(cursor),
     )
     cursor.execute(sql, params)
 
@@ -4349,39 +4793,57 @@ def _iter_export_rows(cursor, filters):
             yield mapped, flattened
 
 
-def run_export_csv_job(token, filters):
+def export_file_name(token, export_format=EXPORT_FORMAT_CSV):
+    extension, _ = EXPORT_FORMATS[export_format]
+    return f"landlord_tenant_export_{token}{extension}"
+
+
+def export_blob_name(token, export_format=EXPORT_FORMAT_CSV):
+    return f"{EXPORTS_BLOB_PREFIX}/{export_file_name(token, export_format)}"
+
+
+def _export_csv_rows(rows):
+    for base_row, _ in rows:
+        out = dict(base_row)
+        out["Event Type"] = out.pop("disposition", "")
+        yield out
+
+
+def run_export_csv_job(token, filters, export_format=EXPORT_FORMAT_CSV, columns=None):
     conn = get_conn()
-    tmp_path = None
     try:
         ensure_exports_table(conn)
         cur = conn.cursor()
         cur.execute("UPDATE search.exports SET status = 'processing', updated_at = SYSUTCDATETIME() WHERE token = ?", token)
         conn.commit()
 
-        base_headers = [
-            "record_id", "full_name", "case_number",
-            "address", "apt", "city", "state", "postal_code", "notes", "case_type", "intake_date",
-            "record_date", "Event Type", "x", "y"
-        ]
-
-        headers = base_headers
-
-        with tempfile.NamedTemporaryFile(mode="w", newline="", encoding="utf-8", suffix=".csv", delete=False) as tmp:
-            tmp_path = tmp.name
-            writer = csv.DictWriter(tmp, fieldnames=headers, extrasaction="ignore")
-            writer.writeheader()
-
-            write_cur = conn.cursor()
-            for base_row, _ in _iter_export_rows(write_cur, filters):
-                out = dict(base_row)
-                out["Event Type"] = out.pop("disposition", "")
-                writer.writerow(out)
+        headers = columns or list(EXPORT_COLUMNS)
+        _, content_type = EXPORT_FORMATS[export_format]
 
         container = ContainerClient.from_connection_string(CONNECTION_STRING, EXPORT_CONTAINER_NAME)
-        blob_name = f"{EXPORTS_BLOB_PREFIX}/landlord_tenant_export_{token}.csv"
-        blob_client = container.get_blob_client(blob_name)
-        with open(tmp_path, "rb") as data:
-            blob_client.upload_blob(data, overwrite=True)
+        blob_client = container.get_blob_client(export_blob_name(token, export_format))
+        write_cur = conn.cursor()
+        rows = _export_csv_rows(_iter_export_rows(write_cur, filters))
+        if export_format == EXPORT_FORMAT_CSV:
+            write_csv_blob(
+                blob_client,
+                headers,
+                rows,
+                compress=EXPORT_GZIP,
+                content_settings=ContentSettings(
+                    content_type=content_type,
+                    content_encoding="gzip" if EXPORT_GZIP else None,
+                ),
+            )
+        else:
+            # Parquet and Arrow compress internally; no gzip layer.
+            write_columnar_blob(
+                blob_client,
+                export_format,
+                headers,
+                rows,
+                content_settings=ContentSettings(content_type=content_type),
+            )
 
         blob_url = f"/export-download?token={token}"
         cur.execute(
@@ -4397,8 +4859,6 @@ def run_export_csv_job(token, filters):
         )
         conn.commit()
     finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
         conn.close()
 
 
@@ -4409,24 +4869,43 @@ def export_csv():
 
     payload = request.get_json(silent=True) or {}
     filters = parse_search_filters(payload)
-
+    try:
+        export_format = parse_export_format(payload.get("format"))
+        columns = parse_export_columns(payload.get("columns"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if export_format != EXPORT_FORMAT_CSV and not columnar_export_available():
+        return jsonify({"error": f"{export_format} export requires pyarrow"}), 400
+
+    job_key = export_job_key(filters, export_format, columns)
     conn = get_conn()
     try:
         ensure_exports_table(conn)
-        token = uuid.uuid4().hex
         cur = conn.cursor()
+        existing = find_reusable_export(cur, job_key)
+        if existing:
+            conn.commit()
+            token, status = existing
+            return jsonify({"status": "ready" if status == "ready" else "started", "token": token, "reused": True})
+
+        token = uuid.uuid4().hex
         cur.execute(
-            "INSERT INTO search.exports (token, status) VALUES (?, 'started')",
-            token
+            "INSERT INTO search.exports (token, status, format, job_key) VALUES (?, 'queued', ?, ?)",
+            token, export_format, job_key
         )
         conn.commit()
+
+        if not EXPORT_QUEUE.submit(token, run_export_csv_job, token, filters, export_format, columns):
+            cur.execute(
+                "UPDATE search.exports SET status = 'failed', error = ?, updated_at = SYSUTCDATETIME() WHERE token = ?",
+                "Export queue is full", token
+            )
+            conn.commit()
+            return jsonify({"error": "Too many exports are running. Try again in a few minutes."}), 503
     finally:
         conn.close()
 
-    thread = threading.Thread(target=run_export_csv_job, args=(token, filters), daemon=True)
-    thread.start()
-
-    return jsonify({"status": "started", "token": token})
+    return jsonify({"status": "started", "token": token, "position": EXPORT_QUEUE.position(token)})
 
 
 @app.route("/export-status")
@@ -4442,6 +4921,8 @@ def export_status():
     try:
         ensure_exports_table(conn)
         cur = conn.cursor()
+        fail_stale_exports(cur, "token", token)
+        conn.commit()
         cur.execute("SELECT status, url, error FROM search.exports WHERE token = ?", token)
         row = cur.fetchone()
     finally:
@@ -4455,6 +4936,9 @@ def export_status():
         return jsonify({"status": "ready", "url": url})
     if status == "failed":
         return jsonify({"status": "failed", "error": error})
+    if status == "queued":
+        # Position is only known to the worker process that queued the job.
+        return jsonify({"status": "queued", "position": EXPORT_QUEUE.position(token)})
     return jsonify({"status": "processing"})
 
 
@@ -4471,7 +4955,7 @@ def export_download():
     try:
         ensure_exports_table(conn)
         cur = conn.cursor()
-        cur.execute("SELECT status FROM search.exports WHERE token = ?", token)
+        cur.execute("SELECT status, format FROM search.exports WHERE token = ?", token)
         row = cur.fetchone()
     finally:
         conn.close()
@@ -4480,20 +4964,16 @@ def export_download():
         return jsonify({"error": "token not found"}), 404
     if row[0] != "ready":
         return jsonify({"error": "export not ready"}), 409
+    export_format = row[1] if row[1] in EXPORT_FORMATS else EXPORT_FORMAT_CSV
+    _, content_type = EXPORT_FORMATS[export_format]
 
     container = ContainerClient.from_connection_string(CONNECTION_STRING, EXPORT_CONTAINER_NAME)
-    blob_name = f"{EXPORTS_BLOB_PREFIX}/landlord_tenant_export_{token}.csv"
-    blob_client = container.get_blob_client(blob_name)
+    blob_client = container.get_blob_client(export_blob_name(token, export_format))
     if not blob_client.exists():
         return jsonify({"error": "export file not found"}), 404
 
-    data = blob_client.download_blob().readall()
-    return send_file(
-        io.BytesIO(data),
-        mimetype="text/csv",
-        as_attachment=True,
-        download_name=f"landlord_tenant_export_{token}.csv",
-    )
+    # Content-Encoding (gzip CSV exports) comes from the blob's properties.
+    return send_blob(blob_client, export_file_name(token, export_format), mimetype=content_type)
 
 
 # ============================================================
@@ -4505,88 +4985,211 @@ def export_download():
 @app.route("/search_all")
 def search_all():
     global _apt_backfill_attempted
+    profile = SearchProfile()
     filters = parse_search_filters(request.args)
     returns_queue = str(request.args.get("returns_queue") or "").strip().lower() in {"1", "true", "yes"}
     include_uploaded_returns = str(request.args.get("include_uploaded") or "").strip().lower() in {"1", "true", "yes"}
+    page_size = parse_search_page_size(request.args)
+    page_cursor = (request.args.get("cursor") or "").strip()
+    wants_ndjson = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+    record_kwargs = search_records_kwargs(filters)
+    search_cache = get_search_cache()
+    cache_key = search_cache_key({
+        "filters": search_cache_filters(filters),
+        "returns_queue": returns_queue,
+        "include_uploaded": include_uploaded_returns,
+        "page_size": page_size,
+        "cursor": page_cursor,
+        "name_match": SEARCH_NAME_MATCH,
+    })
+    log_filters = {
+        **filters,
+        "returns_queue": returns_queue,
+        "include_uploaded": include_uploaded_returns,
+        "page_size": page_size,
+        "cursor": page_cursor,
+    }
 
-    conn = get_conn()
-    try:
-        if not returns_queue and ENABLE_APT_BACKFILL_ON_SEARCH and not _apt_backfill_attempted:
+    if page_cursor:
+        try:
+            cursor_department, _, _ = decode_page_cursor(page_cursor)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        if cursor_department == DV_PDF_SECTION:
+            cache_scopes = [DV_PDF_SCOPE]
+        elif cursor_department == RETURNS_SECTION:
+            cache_scopes = [RETURNS_SCOPE]
+        else:
+            cache_scopes = [ALL_RECORD_DEPARTMENTS_SCOPE, record_department_scope(cursor_department)]
+        with profile.phase("cache"):
+            cached_body = search_cache.get(cache_key, cache_scopes)
+        if cached_body is not None:
+            if wants_ndjson:
+                return ndjson_response(iter_cached_frames(cached_body), "hit", profile)
+            return json_body_response(cached_body, "hit", profile)
+        # Snapshot before querying: a write that lands mid-query makes this entry stale.
+        generations = search_cache.generations(cache_scopes)
+        if cursor_department == DV_PDF_SECTION:
+            _, dv_pdf_page = search_dv_pdf_source(filters, page_size, cursor=page_cursor, profile=profile)
+            page = {DV_PDF_SECTION: dv_pdf_page}
+        elif cursor_department == RETURNS_SECTION:
+            _, returns_page = search_returns_source(
+                filters,
+                exclude_uploaded=returns_queue and not include_uploaded_returns,
+                page_size=page_size,
+                cursor=page_cursor,
+                profile=profile,
+            )
+            page = {RETURNS_SECTION: returns_page}
+        else:
+            conn = get_conn()
             try:
+                rows = search_by_name(conn, **record_kwargs, page_size=page_size, cursor=page_cursor, profile=profile)
+                with profile.phase("civil_pdf_history"):
+                    rows = enrich_civil_return_pdf_history(conn, rows)
+            finally:
+                conn.close()
+            with profile.phase("group"):
+                page = {cursor_department: build_department_page(rows, page_size, cursor_department)}
+        with profile.phase("serialize"):
+            body = app.json.dumps(page).encode("utf-8")
+        search_cache.put(cache_key, generations, body)
+        log_slow_search(profile, log_filters)
+        if wants_ndjson:
+            return ndjson_response(iter([ndjson_frame(page)]), "miss", profile)
+        return json_body_response(body, "miss", profile)
+
+    if not returns_queue and ENABLE_APT_BACKFILL_ON_SEARCH and not _apt_backfill_attempted:
+        conn = get_conn()
+        try:
+            with profile.phase("apt_backfill"):
                 backfill_landlord_tenant_apt(conn)
                 conn.commit()
-            except Exception as exc:
-                print(f"WARN apt backfill skipped due to error: {exc}")
-            finally:
-                _apt_backfill_attempted = True
-        records = [] if returns_queue else search_by_name(
-            conn,
-            filters["query"],
-            date_start=filters["date_start"],
-            date_end=filters["date_end"],
-            case_number=filters["case_number"],
-            sid=filters["sid"],
-            dob=filters["dob"],
-            sex=filters["sex"],
-            race=filters["race"],
-            issuing_county=filters["issuing_county"],
-            last_x_days=filters["last_x_days"],
-            court_doc_types=filters["court_document_type_values"],
-            admin_status_values=filters["admin_status_values"],
-            limit=None
-        )
-        daily_logs = [] if returns_queue or filters["admin_status"] else search_daily_logs(conn, filters)
-        return_records = search_returns(
-            conn,
+            bump_records("Field Services Department")
+        except Exception as exc:
+            print(f"WARN apt backfill skipped due to error: {exc}")
+        finally:
+            _apt_backfill_attempted = True
+            conn.close()
+
+    if returns_queue:
+        cache_scopes = [RETURNS_SCOPE, DV_PDF_SCOPE]
+    else:
+        cache_scopes = [RECORDS_SCOPE, DAILY_LOGS_SCOPE, RETURNS_SCOPE, DV_PDF_SCOPE]
+    with profile.phase("cache"):
+        cached_body = search_cache.get(cache_key, cache_scopes)
+    if cached_body is not None:
+        if wants_ndjson:
+            return ndjson_response(iter_cached_frames(cached_body), "hit", profile)
+        return json_body_response(cached_body, "hit", profile)
+    generations = search_cache.generations(cache_scopes)
+
+    sources = {
+        "returns": lambda: search_returns_source(
             filters,
             exclude_uploaded=returns_queue and not include_uploaded_returns,
+            page_size=page_size,
+            profile=profile,
+        ),
+        "dv_pdf": lambda: search_dv_pdf_source(filters, page_size, profile=profile),
+    }
+    if not returns_queue:
+        sources["records"] = lambda: search_department_records(record_kwargs, page_size, profile)
+    if not (returns_queue or filters["admin_status"]):
+        sources["daily_logs"] = lambda: search_daily_logs_source(filters, profile)
+    sections = iter_search_all_sections(sources, page_size, profile)
+
+    if wants_ndjson:
+        return ndjson_response(
+            stream_search_all_frames(sections, search_cache, cache_key, generations, profile, log_filters),
+            "miss",
+            profile,
         )
+
+    response = dict(sections)
+    with profile.phase("serialize"):
+        body = app.json.dumps(response).encode("utf-8")
+    # Partial results are never cached; the next request retries the slow source.
+    if search_sources_complete(response["_sources"]):
+        search_cache.put(cache_key, generations, body)
+    log_slow_search(profile, log_filters)
+    return json_body_response(body, "miss", profile)
+
+
+FACET_CANONICALIZERS = {
+    "sex": lambda value: code_label("sex_code", value),
+    "race": lambda value: code_label("race_code", value),
+    "issuing_county": lambda value: code_label("issuing_county_code", value),
+    "court_document_type": lambda value: COURT_DOC_TYPE_VARIATION_TO_CANONICAL.get(value.strip().lower()),
+    "admin_status": canonicalize_admin_status_option,
+}
+
+
+def fold_facet_counts(counts, canonicalize=None):
+    """Merge spelling variants into the filter panel's option values, largest first."""
+    folded = {}
+    for value, count in counts.items():
+        key = (canonicalize(value) if canonicalize and value else None) or value
+        folded[key] = folded.get(key, 0) + count
+    return dict(sorted(folded.items(), key=lambda item: (-item[1], item[0].lower())))
+
+
+@app.route("/search_facets")
+def search_facets_endpoint():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    profile = SearchProfile()
+    filters = parse_search_filters(request.args)
+    search_cache = get_search_cache()
+    cache_key = search_cache_key({"facets": search_cache_filters(filters), "name_match": SEARCH_NAME_MATCH})
+    cache_scopes = [RECORDS_SCOPE]
+    with profile.phase("cache"):
+        cached_body = search_cache.get(cache_key, cache_scopes)
+    if cached_body is not None:
+        return json_body_response(cached_body, "hit", profile)
+    generations = search_cache.generations(cache_scopes)
+
+    conn = get_conn()
+    try:
+        facets = search_facets(conn, **search_records_kwargs(filters), profile=profile)
     finally:
         conn.close()
+    response = {
+        "total": facets["total"],
+        "departments": fold_facet_counts(facets["department"]),
+    }
+    for facet, canonicalize in FACET_CANONICALIZERS.items():
+        response[facet] = fold_facet_counts(facets[facet], canonicalize)
+    with profile.phase("serialize"):
+        body = app.json.dumps(response).encode("utf-8")
+    search_cache.put(cache_key, generations, body)
+    log_slow_search(profile, {**filters, "facets": True})
+    return json_body_response(body, "miss", profile)
 
-    records = enrich_civil_return_pdf_history(records)
-    
-    grouped = {}
-    for r in records:
-        dept = r["department"].title()
-        grouped.setdefault(dept, []).append(r)
-
-    default_departments = [
-        "Civil Papers",
-        "Bcso Active Warrants",
-        "Active Warrants",
-        "Baltimore Jail Population",
-        "Doc Jail Population",
-        "Field Services Department",
-        "Warrant Of Restitution - Mdec",
-        "Returns",
-    ]
 
-    response = {}
-    for dept, rows in grouped.items():
-        response[dept] = {
-            "count": len(rows),
-            "records": rows,
-        }
+@app.route("/suggest/names")
+def suggest_names():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    prefix = normalize_name_text(request.args.get("prefix"))
+    try:
+        limit = int(request.args.get("limit") or NAME_SUGGEST_DEFAULT_LIMIT)
+    except ValueError:
+        limit = NAME_SUGGEST_DEFAULT_LIMIT
+    limit = max(1, min(limit, NAME_SUGGEST_MAX_LIMIT))
+    if len(prefix) < NAME_SUGGEST_MIN_PREFIX:
+        return jsonify({"prefix": prefix, "suggestions": []})
 
-    for dept in default_departments:
-        response.setdefault(dept, {"count": 0, "records": []})
+    index = get_name_suggest_index()
+    index.ensure_fresh(get_conn)
+    response = jsonify({"prefix": prefix, "suggestions": index.suggest(prefix, limit), "ready": index.ready})
+    # While the first build runs the suggestions are empty; don't let the browser keep them.
+    response.headers["Cache-Control"] = "private, max-age=30" if index.ready else "no-store"
+    return response
 
-    dv_records = filter_dv_pdf_records(read_dv_pdf_records(), filters)
-    response["DV PDF"] = {
-        "count": len(dv_records),
-        "records": dv_records,
-    }
-    response["Daily Logs"] = {
-        "count": len(daily_logs),
-        "records": daily_logs,
-    }
-    response["Returns"] = {
-        "count": len(return_records),
-        "records": return_records,
-    }
 
-    return jsonify(response)
+# Build the name suggest index as the worker starts so requests never wait on the first scan.
+get_name_suggest_index().refresh_in_background(get_conn)
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,7 @@
+"""Search benchmarks against seeded synthetic data.
+
+``generate`` builds deterministic rows for the tables the search stack reads,
+``load`` puts them into a local SQL Server stand-in, ``run`` times the search
+functions and the /search_all route, and ``report`` writes the JSON report and
+compares it with a stored baseline. See ``python -m bench.run --help``.
+"""
@@ -0,0 +1,336 @@
+"""Seeded synthetic rows for the tables /search_all reads.
+
+Every generator takes ``(seed, count)`` and yields tuples in the order of the
+matching ``*_COLUMNS`` constant, so a (seed, size) pair always produces the
+same dataset. Each table draws from its own ``random.Random`` stream, so the
+records do not change when another table's size does.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import date, datetime, time, timedelta
+
+
+DATASET_SIZES = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+# Companion tables scale with search.records.
+TABLE_RATIOS = {
+    "esri_events": 0.2,
+    "returns": 0.1,
+    "dv_pdf_records": 0.02,
+}
+
+END_DATE = date(2026, 10, 1)
+SPAN_DAYS = 3 * 365
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Christopher", "Lisa", "Daniel", "Nancy",
+    "Matthew", "Betty", "Anthony", "Sandra", "Mark", "Ashley", "Donald", "Kimberly",
+    "Tyrone", "Keisha", "DeShawn", "Aaliyah", "Jose", "Maria", "Wei", "Mei",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson",
+    "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker",
+    "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Green",
+)
+STREETS = (
+    "N Charles St", "E Baltimore St", "W North Ave", "Greenmount Ave", "Harford Rd",
+    "Belair Rd", "Liberty Heights Ave", "Edmondson Ave", "Park Heights Ave",
+    "Eastern Ave", "Frederick Ave", "Reisterstown Rd", "York Rd", "Loch Raven Blvd",
+)
+POSTAL_CODES = ("21201", "21202", "21205", "21206", "21212", "21213", "21215", "21217", "21218", "21224", "21229", "21230")
+COUNTIES = ("Baltimore City", "Baltimore County", "Anne Arundel", "Howard", "Harford", "Prince George's")
+SEX_VALUES = ("M", "F", "Male", "Female")
+RACE_VALUES = ("B", "W", "A", "H", "Black", "White")
+DEPUTIES = ("Dep. Carter", "Dep. Reyes", "Dep. Okafor", "Dep. Mills", "Sgt. Brooks", "Cpl. Nash")
+COURT_DOCUMENT_TYPES = (
+    "Summons", "Writ of Garnishment", "Subpoena", "Protective Order",
+    "Show Cause", "Writ of Execution", "Warrant of Restitution",
+)
+CIVIL_DISPOSITIONS = ("Served", "Not Served", "Non Est", "Pending", "Returned to Court", None)
+WARRANT_STATUSES = ("Active", "Served", "Recalled", "Pending")
+FACILITIES = ("BCBIC", "MTC", "JI", "CDF", "WDC")
+
+# (department, source_file, weight)
+DEPARTMENTS = (
+    ("Civil Papers", "civil_papers.csv", 40),
+    ("BCSO_ACTIVE_WARRANTS", "bcso_active_warrants.csv", 10),
+    ("Active Warrants", "AllActiveWarrants_0.csv", 10),
+    ("Baltimore Jail Population", "jail_population.csv", 10),
+    ("Doc Jail Population", "doc_population.csv", 5),
+    ("Field Services Department", "field_services.csv", 20),
+    ("Warrant Of Restitution - Mdec", "wor_mdec.csv", 5),
+)
+
+RECORD_COLUMNS = (
+    "record_id", "department", "source_file", "full_name", "tenant_defendant_or_respondent",
+    "resp_name", "petitioner_name", "petitioner_or_plaintiff_name", "sid", "date_of_birth",
+    "facility", "case_number", "address", "tenant_defendant_or_respondent_address", "apt",
+    "city", "state", "postal_code", "global_id", "created_at", "served_by", "x", "y",
+    "geocode_confidence", "notes", "warrant_type", "court_document_type", "issue_date",
+    "intake_date", "date_time_attempted", "date_time_served", "prior_attempt_date",
+    "date_received", "warrant_status", "disposition", "administrative_status",
+    "warrant_id_number", "sex", "race", "issuing_county", "blob_name",
+)
+RAW_RECORD_COLUMNS = ("record_id", "source_file", "raw_payload")
+ESRI_EVENT_COLUMNS = (
+    "id", "event_number", "generated_event_number", "arrival_time", "event_status",
+    "activity_type", "address", "city", "state", "postal_code", "notes_or_narrative",
+    "additional_report", "name", "radio_id",
+)
+RETURN_COLUMNS = (
+    "case_number", "submitted_at", "document_type", "date_issued", "petitioner_name",
+    "respondent_name", "service_address", "attempt_date", "service_disposition",
+    "member_reporting", "return_deputy", "date_signed", "date_received", "intake_date",
+    "court_issue_date", "bcso_status", "mdec_status", "blob_name", "original_filename",
+    "is_active", "created_at", "updated_at",
+)
+DV_PDF_COLUMNS = (
+    "id", "case_number", "respondent_name", "issue_date", "csv_reverse_geocode_output",
+    "order_type", "csv_order_disposition", "order_status", "blob_name", "pdf_download",
+    "uploaded_at", "is_reissue",
+)
+
+ESRI_ACTIVITY_TYPES = ("Traffic Stop", "Peace Order Service", "Protective Order Service", "Warrant Service", "Assist Other Agency", "Eviction")
+ESRI_STATUSES = ("Closed", "Open", "Cleared")
+RETURN_STATUSES = ("Signed", "Uploaded", "Hard Copy Returned", "Hold", "Pending")
+DV_ORDER_TYPES = ("Temporary Protective Order", "Final Protective Order", "Interim Protective Order", "Peace Order")
+DV_DISPOSITIONS = ("Served", "Not Served", "Pending", "")
+
+
+def dataset_row_counts(size):
+    """``{table: row count}`` for a named size (``10k``/``100k``/``1m``) or an int."""
+    records = DATASET_SIZES[size] if isinstance(size, str) else int(size)
+    counts = {"records": records, "raw_records": records}
+    for table, ratio in TABLE_RATIOS.items():
+        counts[table] = max(1, int(records * ratio))
+    return counts
+
+
+def _rng(seed, table):
+    return random.Random(f"{seed}:{table}")
+
+
+def _day(rng):
+    return END_DATE - timedelta(days=rng.randrange(SPAN_DAYS))
+
+
+def _moment(rng):
+    return datetime.combine(_day(rng), time(rng.randrange(24), rng.randrange(60), rng.randrange(60)))
+
+
+def _person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _address(rng):
+    return f"{rng.randrange(100, 9999)} {rng.choice(STREETS)}"
+
+
+def _case_number(rng, department, year):
+    yy = year % 100
+    serial = rng.randrange(1, 999999)
+    if department == "Civil Papers":
+        # Mixed separators exercise case_number_norm.
+        return rng.choice((
+            f"C-24-CV-{yy:02d}-{serial:06d}",
+            f"D-08-CV-{yy:02d}-{serial:06d}",
+            f"{yy:02d}/CV/{serial:06d}",
+        ))
+    if department == "Warrant Of Restitution - Mdec":
+        return f"D-081-LT-{yy:02d}-{serial:06d}"
+    if department in ("BCSO_ACTIVE_WARRANTS", "Active Warrants"):
+        return f"{rng.choice('0123456789')}B0{serial:07d}"
+    return f"{yy:02d}{serial:07d}"
+
+
+def _pick_department(rng):
+    total = sum(weight for _, _, weight in DEPARTMENTS)
+    roll = rng.randrange(total)
+    for department, source_file, weight in DEPARTMENTS:
+        if roll < weight:
+            return department, source_file
+        roll -= weight
+    return DEPARTMENTS[-1][:2]
+
+
+def _record(rng, record_id):
+    department, source_file = _pick_department(rng)
+    issued = _day(rng)
+    person = _person(rng)
+    row = {
+        "record_id": record_id,
+        "department": department,
+        "source_file": source_file,
+        "case_number": _case_number(rng, department, issued.year),
+        "created_at": _moment(rng),
+        "city": "Baltimore",
+        "state": "MD",
+        "postal_code": rng.choice(POSTAL_CODES),
+        "sex": rng.choice(SEX_VALUES),
+        "race": rng.choice(RACE_VALUES),
+    }
+    if department == "Civil Papers":
+        attempted = datetime.combine(issued + timedelta(days=rng.randrange(1, 30)), time(rng.randrange(8, 20), rng.randrange(60)))
+        served = attempted if rng.random() < 0.5 else None
+        row.update({
+            "tenant_defendant_or_respondent": person,
+            "petitioner_or_plaintiff_name": _person(rng),
+            "tenant_defendant_or_respondent_address": _address(rng),
+            "court_document_type": rng.choice(COURT_DOCUMENT_TYPES),
+            "issue_date": issued,
+            "intake_date": issued + timedelta(days=rng.randrange(0, 5)),
+            "date_time_attempted": attempted,
+            "date_time_served": served,
+            "disposition": rng.choice(CIVIL_DISPOSITIONS),
+            "served_by": rng.choice(DEPUTIES),
+            "global_id": f"{{{rng.getrandbits(128):032x}}}",
+            "x": -76.6 + rng.uniform(-0.1, 0.1),
+            "y": 39.3 + rng.uniform(-0.1, 0.1),
+            "geocode_confidence": round(rng.uniform(0.5, 1.0), 3),
+        })
+    elif department in ("BCSO_ACTIVE_WARRANTS", "Active Warrants"):
+        row.update({
+            "full_name": person,
+            "sid": str(rng.randrange(1_000_000, 9_999_999)),
+            "date_of_birth": date(rng.randrange(1950, 2006), rng.randrange(1, 13), rng.randrange(1, 29)),
+            "address": _address(rng),
+            "warrant_type": rng.choice(("Bench", "Arrest", "Body Attachment")),
+            "issue_date": issued,
+            "warrant_status": rng.choice(WARRANT_STATUSES),
+            "warrant_id_number": f"W{rng.randrange(10**8):08d}",
+            "issuing_county": rng.choice(COUNTIES),
+        })
+    elif department in ("Baltimore Jail Population", "Doc Jail Population"):
+        row.update({
+            "full_name": person,
+            "sid": str(rng.randrange(1_000_000, 9_999_999)),
+            "date_of_birth": date(rng.randrange(1950, 2006), rng.randrange(1, 13), rng.randrange(1, 29)),
+            "facility": rng.choice(FACILITIES),
+            "intake_date": issued,
+        })
+    else:
+        row.update({
+            "resp_name": person,
+            "petitioner_name": _person(rng),
+            "address": _address(rng),
+            "apt": str(rng.randrange(1, 400)) if rng.random() < 0.3 else None,
+            "issue_date": issued,
+            "intake_date": issued + timedelta(days=rng.randrange(0, 5)),
+            "date_received": issued + timedelta(days=rng.randrange(0, 3)),
+            "notes": "Tenant not home; posted notice." if rng.random() < 0.2 else None,
+            "blob_name": f"wor/{issued:%Y/%m}/{record_id}.pdf" if rng.random() < 0.5 else None,
+        })
+    return row
+
+
+def iter_records(seed, count):
+    rng = _rng(seed, "records")
+    for record_id in range(1, count + 1):
+        row = _record(rng, record_id)
+        yield tuple(row.get(column) for column in RECORD_COLUMNS)
+
+
+def iter_raw_records(seed, count):
+    """One raw payload per record; regenerates the record stream to stay in step."""
+    for values in iter_records(seed, count):
+        row = dict(zip(RECORD_COLUMNS, values))
+        payload = {key: value for key, value in row.items() if value is not None and key != "record_id"}
+        yield row["record_id"], row["source_file"], json.dumps(payload, default=str)
+
+
+def iter_esri_events(seed, count):
+    rng = _rng(seed, "esri_events")
+    epoch = datetime(1970, 1, 1)
+    for event_id in range(1, count + 1):
+        arrived = _moment(rng)
+        activity = rng.choice(ESRI_ACTIVITY_TYPES)
+        has_number = rng.random() < 0.8
+        yield (
+            event_id,
+            f"P{arrived:%y%m%d}{event_id % 10000:04d}" if has_number else None,
+            f"G{event_id:08d}",
+            str(int((arrived - epoch).total_seconds() * 1000)),
+            rng.choice(ESRI_STATUSES),
+            activity,
+            _address(rng),
+            "Baltimore",
+            "MD",
+            rng.choice(POSTAL_CODES),
+            "Contact made with resident." if rng.random() < 0.4 else None,
+            None,
+            _person(rng),
+            f"{rng.randrange(100, 999)}",
+        )
+
+
+def iter_returns(seed, count):
+    rng = _rng(seed, "returns")
+    for _ in range(count):
+        issued = _day(rng)
+        attempted = issued + timedelta(days=rng.randrange(1, 30))
+        submitted = datetime.combine(attempted, time(rng.randrange(8, 20), rng.randrange(60)))
+        yield (
+            _case_number(rng, "Civil Papers", issued.year),
+            submitted,
+            rng.choice(COURT_DOCUMENT_TYPES),
+            issued,
+            _person(rng),
+            _person(rng),
+            _address(rng),
+            attempted,
+            rng.choice(("Served", "Non Est", "Attempted")),
+            rng.choice(DEPUTIES),
+            rng.choice(DEPUTIES),
+            attempted,
+            issued + timedelta(days=rng.randrange(0, 3)),
+            issued + timedelta(days=rng.randrange(0, 5)),
+            issued,
+            rng.choice(RETURN_STATUSES),
+            None,
+            f"returns/{submitted:%Y/%m}/{rng.getrandbits(64):016x}.pdf",
+            "return.pdf",
+            1 if rng.random() < 0.97 else 0,
+            submitted,
+            submitted,
+        )
+
+
+def iter_dv_pdf_records(seed, count):
+    rng = _rng(seed, "dv_pdf_records")
+    for row_id in range(1, count + 1):
+        issued = _day(rng)
+        blob_name = f"dv_pdf/{issued:%Y/%m}/{row_id}.pdf"
+        yield (
+            row_id,
+            _case_number(rng, "Civil Papers", issued.year),
+            _person(rng),
+            issued,
+            f"{_address(rng)}, Baltimore, MD",
+            rng.choice(DV_ORDER_TYPES),
+            rng.choice(DV_DISPOSITIONS),
+            rng.choice(("Active", "Expired", "")),
+            blob_name,
+            f"/dv-pdf/file/{blob_name}",
+            _moment(rng),
+            1 if rng.random() < 0.05 else 0,
+        )
+
+
+TABLE_GENERATORS = {
+    "records": ("search.records", RECORD_COLUMNS, iter_records),
+    "raw_records": ("search.raw_records", RAW_RECORD_COLUMNS, iter_raw_records),
+    "esri_events": ("dbo.esri_events", ESRI_EVENT_COLUMNS, iter_esri_events),
+    "returns": ("search.Returns", RETURN_COLUMNS, iter_returns),
+    "dv_pdf_records": ("search.dv_pdf_records", DV_PDF_COLUMNS, iter_dv_pdf_records),
+}
@@ -0,0 +1,110 @@
+"""Load a generated dataset into the local SQL Server stand-in."""
+
+from __future__ import annotations
+
+import itertools
+import os
+import re
+import time
+from pathlib import Path
+
+from bench.generate import TABLE_GENERATORS, dataset_row_counts
+from daily_logs import ensure_esri_event_search_columns
+from demographic_codes import ensure_records_code_columns
+from dv_pdf import ensure_dv_pdf_search_columns
+from name_index import backfill_name_trigrams
+from returns import ensure_returns_tables
+from schema_registry import invalidate_schema
+
+
+BENCH_CONNECTION_ENV = "BENCH_SQL_CONNECTION_STRING"
+SCHEMA_PATH = Path(__file__).with_name("schema.sql")
+LOAD_BATCH_SIZE = 5000
+_GO_LINE = re.compile(r"^\s*GO\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def bench_connection_string():
+    """Connection string for the stand-in; refuses to fall back to the app database."""
+    connection_string = (os.environ.get(BENCH_CONNECTION_ENV) or "").strip()
+    if not connection_string:
+        raise RuntimeError(
+            f"Set {BENCH_CONNECTION_ENV} to a pyodbc connection string for a local SQL Server."
+        )
+    production_server = (os.environ.get("AZURE_SQL_SERVER") or "").strip().lower()
+    if production_server and production_server in connection_string.lower():
+        raise RuntimeError(f"{BENCH_CONNECTION_ENV} points at AZURE_SQL_SERVER; use a local stand-in.")
+    return connection_string
+
+
+def bench_connect():
+    import pyodbc
+
+    return pyodbc.connect(bench_connection_string())
+
+
+def sql_batches(script):
+    """Split a script on ``GO`` lines the way sqlcmd does."""
+    return [batch.strip() for batch in _GO_LINE.split(script) if batch.strip()]
+
+
+def create_schema(conn):
+    # ingest pulls in pandas and the Azure SDK; only loading needs it.
+    from ingest import ensure_records_case_number_norm_column, ensure_records_record_date_column
+
+    cur = conn.cursor()
+    for batch in sql_batches(SCHEMA_PATH.read_text(encoding="utf-8")):
+        cur.execute(batch)
+    conn.commit()
+    invalidate_schema()
+    ensure_returns_tables(conn)
+    ensure_records_case_number_norm_column(cur)
+    ensure_records_record_date_column(cur)
+    ensure_records_code_columns(cur)
+    ensure_dv_pdf_search_columns(cur)
+    ensure_esri_event_search_columns(cur)
+    conn.commit()
+
+
+def _insert_rows(conn, table_name, columns, rows):
+    cur = conn.cursor()
+    cur.fast_executemany = True
+    sql = (
+        f"INSERT INTO {table_name} ({', '.join(f'[{column}]' for column in columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    inserted = 0
+    while True:
+        batch = list(itertools.islice(rows, LOAD_BATCH_SIZE))
+        if not batch:
+            break
+        cur.executemany(sql, batch)
+        conn.commit()
+        inserted += len(batch)
+    return inserted
+
+
+def load_dataset(conn, size, seed):
+    """Replace the stand-in tables with the ``(size, seed)`` dataset.
+
+    Returns ``{table: {"rows": n, "seconds": s}}``.
+    """
+    create_schema(conn)
+    counts = dataset_row_counts(size)
+    cur = conn.cursor()
+    for posting_table in ("search.name_trigrams", "search.name_phonetic_keys"):
+        cur.execute(f"IF OBJECT_ID('{posting_table}', 'U') IS NOT NULL TRUNCATE TABLE {posting_table}")
+    for table_name, _, _ in TABLE_GENERATORS.values():
+        cur.execute(f"TRUNCATE TABLE {table_name}")
+    conn.commit()
+
+    loaded = {}
+    for table, (table_name, columns, generator) in TABLE_GENERATORS.items():
+        started = time.perf_counter()
+        rows = _insert_rows(conn, table_name, columns, generator(seed, counts[table]))
+        loaded[table] = {"rows": rows, "seconds": round(time.perf_counter() - started, 2)}
+        print(f"Loaded {rows} rows into {table_name}")
+
+    started = time.perf_counter()
+    backfill_name_trigrams(conn, batch_size=LOAD_BATCH_SIZE)
+    loaded["name_trigrams"] = {"seconds": round(time.perf_counter() - started, 2)}
+    return loaded
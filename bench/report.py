@@ -0,0 +1,77 @@
+"""Benchmark JSON reports and baseline comparison."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+REPORT_VERSION = 1
+DEFAULT_TOLERANCE = 0.2
+COMPARE_METRIC = "median_ms"
+
+
+def summarize(samples_ms):
+    """Min/median/p95/max of one benchmark's timings in milliseconds."""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        raise ValueError("no samples")
+    p95_index = max(0, int(round(0.95 * len(ordered))) - 1)
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0], 2),
+        "median_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[p95_index], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+def build_report(size, seed, row_counts, results, load=None):
+    return {
+        "version": REPORT_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "size": size,
+        "seed": seed,
+        "row_counts": row_counts,
+        "load": load,
+        "results": results,
+    }
+
+
+def write_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True, default=str) + "\n", encoding="utf-8")
+
+
+def read_report(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare_reports(report, baseline, tolerance=DEFAULT_TOLERANCE, metric=COMPARE_METRIC):
+    """Benchmarks whose ``metric`` grew by more than ``tolerance`` over the baseline.
+
+    Raises ValueError when the two reports were run on different datasets.
+    Benchmarks missing from either side are skipped.
+    """
+    for key in ("size", "seed"):
+        if report.get(key) != baseline.get(key):
+            raise ValueError(f"reports differ in {key}: {report.get(key)!r} vs {baseline.get(key)!r}")
+    regressions = []
+    for name, result in sorted(report["results"].items()):
+        expected = baseline["results"].get(name)
+        if not expected or not expected.get(metric):
+            continue
+        change = (result[metric] - expected[metric]) / expected[metric]
+        if change > tolerance:
+            regressions.append({
+                "name": name,
+                "baseline_ms": expected[metric],
+                "current_ms": result[metric],
+                "change": round(change, 3),
+            })
+    return regressions
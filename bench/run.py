@@ -0,0 +1,184 @@
+"""Time the search stack against a seeded synthetic dataset.
+
+Point BENCH_SQL_CONNECTION_STRING at a local SQL Server (for example the
+mcr.microsoft.com/mssql/server developer image), then:
+
+    python -m bench.run --size 10k --load                # load once and time
+    python -m bench.run --size 10k --write-baseline      # store the baseline
+    python -m bench.run --size 10k --baseline bench/baselines/10k.json
+
+The report lists min/median/p95/max milliseconds per benchmark. With
+--baseline the run exits non-zero when any median regressed by more than
+--tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench.generate import DATASET_SIZES, dataset_row_counts
+from bench.load import bench_connect, load_dataset
+from bench.report import (
+    DEFAULT_TOLERANCE,
+    build_report,
+    compare_reports,
+    read_report,
+    summarize,
+    write_report,
+)
+
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_SEED = 1
+BENCH_DEPARTMENT = "Civil Papers"
+
+# /search_all query strings; the function benchmarks parse the same args.
+SCENARIOS = {
+    "name": {"name": "smith"},
+    "name_two_tokens": {"name": "maria smith"},
+    "name_fuzzy": {"name": "mariah smyth", "fuzzy": "1"},
+    "case_prefix": {"case_number": "C-24-CV-25"},
+    "case_contains": {"case_number": "012345", "case_match": "contains"},
+    "date_range": {"intake_date": "2025-01-01 to 2025-03-31"},
+    "admin_status": {"name": "smith", "admin_status": "Served"},
+    "demographics": {"sex": "Male", "race": "Black", "issuing_county": "Baltimore County"},
+}
+SUGGEST_PREFIXES = ("sm", "smi", "smith", "mar", "maria sm")
+
+
+def time_call(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def run_benchmarks(repeat):
+    # The app module needs the full runtime (Flask, Azure SDK); import it late
+    # so --help works without it.
+    import app as search_app
+    from daily_logs import search_daily_logs
+    from name_suggest import NamePrefixIndex
+    from returns import search_returns
+    from search_cache import bump_all
+    from search_sql import build_search_sql, search_by_name
+
+    search_app.get_conn = bench_connect
+    client = search_app.app.test_client()
+    results = {}
+    server_timing = {}
+
+    conn = bench_connect()
+    try:
+        for scenario, args in SCENARIOS.items():
+            filters = search_app.parse_search_filters(args)
+            record_kwargs = search_app.search_records_kwargs(filters)
+            results[f"build_search_sql.{scenario}"] = summarize(time_call(
+                lambda: build_search_sql(
+                    select_sql="record_id",
+                    from_sql="search.records",
+                    page_size=search_app.DEFAULT_SEARCH_PAGE_SIZE,
+                    **record_kwargs,
+                ),
+                repeat * 100,
+            ))
+            results[f"search_by_name.{scenario}"] = summarize(time_call(
+                lambda: search_by_name(
+                    conn,
+                    **record_kwargs,
+                    page_size=search_app.DEFAULT_SEARCH_PAGE_SIZE,
+                    department=BENCH_DEPARTMENT,
+                ),
+                repeat,
+            ))
+            results[f"search_daily_logs.{scenario}"] = summarize(time_call(
+                lambda: search_daily_logs(conn, filters), repeat,
+            ))
+            results[f"search_returns.{scenario}"] = summarize(time_call(
+                lambda: search_returns(conn, filters, page_size=search_app.DEFAULT_SEARCH_PAGE_SIZE), repeat,
+            ))
+            results[f"search_returns_queue.{scenario}"] = summarize(time_call(
+                lambda: search_returns(
+                    conn, filters, exclude_uploaded=True, page_size=search_app.DEFAULT_SEARCH_PAGE_SIZE,
+                ),
+                repeat,
+            ))
+
+            def search_all(cold):
+                if cold:
+                    bump_all()
+                response = client.get("/search_all", query_string=args)
+                response.get_data()
+                if response.status_code != 200:
+                    raise RuntimeError(f"/search_all {args} returned {response.status_code}")
+                server_timing[scenario] = response.headers.get("Server-Timing")
+
+            results[f"search_all.{scenario}"] = summarize(time_call(lambda: search_all(True), repeat))
+            results[f"search_all_cached.{scenario}"] = summarize(time_call(lambda: search_all(False), repeat))
+
+        index = NamePrefixIndex()
+        results["name_suggest.build"] = summarize(time_call(lambda: index.refresh(conn, full=True), repeat, warmup=0))
+        results["name_suggest.refresh"] = summarize(time_call(lambda: index.refresh(conn), repeat))
+        for prefix in SUGGEST_PREFIXES:
+            results[f"name_suggest.{prefix.replace(' ', '_')}"] = summarize(time_call(
+                lambda: index.suggest(prefix), repeat * 100,
+            ))
+    finally:
+        conn.close()
+    return results, server_timing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(DATASET_SIZES), default="10k")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--load", action="store_true", help="(re)load the dataset before timing")
+    parser.add_argument("--output", type=Path, help="report path (default bench/results/<size>.json)")
+    parser.add_argument("--baseline", type=Path, help="baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--write-baseline", action="store_true", help="also store the report as bench/baselines/<size>.json")
+    args = parser.parse_args()
+
+    load = None
+    if args.load:
+        conn = bench_connect()
+        try:
+            load = load_dataset(conn, args.size, args.seed)
+        finally:
+            conn.close()
+
+    results, server_timing = run_benchmarks(args.repeat)
+    report = build_report(args.size, args.seed, dataset_row_counts(args.size), results, load=load)
+    report["server_timing"] = server_timing
+    output = args.output or BENCH_DIR / "results" / f"{args.size}.json"
+    write_report(report, output)
+    print(f"Wrote {output}")
+    if args.write_baseline:
+        baseline_path = BENCH_DIR / "baselines" / f"{args.size}.json"
+        write_report(report, baseline_path)
+        print(f"Wrote {baseline_path}")
+
+    if args.baseline:
+        regressions = compare_reports(report, read_report(args.baseline), tolerance=args.tolerance)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['name']}: {regression['baseline_ms']} ms -> "
+                f"{regression['current_ms']} ms (+{regression['change']:.0%})"
+            )
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions over {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+-- Benchmark stand-in schema: only the columns the search stack reads.
+-- Loaded by bench/load.py into a local SQL Server (developer edition or
+-- Azure SQL Edge container); never run this against the production database.
+-- search.Returns, the name posting tables, search.civil_return_pdfs and the
+-- persisted case_number_norm, record_date and *_code columns come from the
+-- app's own ensure_* code.
+
+IF SCHEMA_ID('search') IS NULL
+    EXEC('CREATE SCHEMA search');
+GO
+
+IF OBJECT_ID('search.records', 'U') IS NULL
+CREATE TABLE search.records (
+    record_id INT NOT NULL PRIMARY KEY,
+    department NVARCHAR(100) NULL,
+    source_file NVARCHAR(260) NULL,
+    full_name NVARCHAR(255) NULL,
+    tenant_defendant_or_respondent NVARCHAR(255) NULL,
+    resp_name NVARCHAR(255) NULL,
+    petitioner_name NVARCHAR(255) NULL,
+    petitioner_or_plaintiff_name NVARCHAR(255) NULL,
+    sid NVARCHAR(50) NULL,
+    date_of_birth DATE NULL,
+    facility NVARCHAR(100) NULL,
+    case_number NVARCHAR(150) NULL,
+    address NVARCHAR(500) NULL,
+    tenant_defendant_or_respondent_address NVARCHAR(500) NULL,
+    doc_address NVARCHAR(500) NULL,
+    location_of_prior_attempt NVARCHAR(500) NULL,
+    apt NVARCHAR(50) NULL,
+    unit NVARCHAR(50) NULL,
+    apartment_unit_or_secondary_address NVARCHAR(100) NULL,
+    city NVARCHAR(100) NULL,
+    state NVARCHAR(20) NULL,
+    postal_code NVARCHAR(20) NULL,
+    global_id NVARCHAR(64) NULL,
+    globalid NVARCHAR(64) NULL,
+    parent_document NVARCHAR(255) NULL,
+    created_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+    served_by NVARCHAR(255) NULL,
+    serving_or_attempting_deputy NVARCHAR(255) NULL,
+    member_reporting NVARCHAR(255) NULL,
+    return_deputy NVARCHAR(255) NULL,
+    x FLOAT NULL,
+    y FLOAT NULL,
+    geocode_confidence FLOAT NULL,
+    notes NVARCHAR(MAX) NULL,
+    notes_from_attempt NVARCHAR(MAX) NULL,
+    warrant_type NVARCHAR(100) NULL,
+    court_document_type NVARCHAR(255) NULL,
+    issue_date DATE NULL,
+    court_issued_date DATE NULL,
+    intake_date DATE NULL,
+    date_time_attempted DATETIME2 NULL,
+    date_time_served DATETIME2 NULL,
+    prior_attempt_date DATE NULL,
+    date_received DATE NULL,
+    warrant_status NVARCHAR(100) NULL,
+    disposition NVARCHAR(255) NULL,
+    administrative_status NVARCHAR(255) NULL,
+    service_disp NVARCHAR(255) NULL,
+    warrant_id_number NVARCHAR(100) NULL,
+    sex NVARCHAR(20) NULL,
+    race NVARCHAR(20) NULL,
+    issuing_county NVARCHAR(100) NULL,
+    blob_name NVARCHAR(512) NULL
+);
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_records_created_at_record_id'
+      AND object_id = OBJECT_ID('search.records')
+)
+CREATE INDEX IX_records_created_at_record_id
+    ON search.records(created_at DESC, record_id DESC);
+GO
+
+IF OBJECT_ID('search.raw_records', 'U') IS NULL
+CREATE TABLE search.raw_records (
+    record_id INT NOT NULL PRIMARY KEY,
+    source_file NVARCHAR(260) NULL,
+    raw_payload NVARCHAR(MAX) NULL
+);
+GO
+
+IF OBJECT_ID('dbo.esri_events', 'U') IS NULL
+CREATE TABLE dbo.esri_events (
+    id INT NOT NULL PRIMARY KEY,
+    event_number NVARCHAR(100) NULL,
+    generated_event_number NVARCHAR(100) NULL,
+    arrival_time NVARCHAR(50) NULL,
+    event_status NVARCHAR(100) NULL,
+    activity_type NVARCHAR(255) NULL,
+    address NVARCHAR(500) NULL,
+    city NVARCHAR(100) NULL,
+    state NVARCHAR(20) NULL,
+    postal_code NVARCHAR(20) NULL,
+    notes_or_narrative NVARCHAR(MAX) NULL,
+    additional_report NVARCHAR(MAX) NULL,
+    [name] NVARCHAR(255) NULL,
+    radio_id NVARCHAR(50) NULL
+);
+GO
+
+IF OBJECT_ID('search.dv_pdf_records', 'U') IS NULL
+CREATE TABLE search.dv_pdf_records (
+    id INT NOT NULL PRIMARY KEY,
+    case_number NVARCHAR(150) NULL,
+    respondent_name NVARCHAR(255) NULL,
+    issue_date DATE NULL,
+    csv_reverse_geocode_output NVARCHAR(1000) NULL,
+    order_type NVARCHAR(255) NULL,
+    csv_order_disposition NVARCHAR(255) NULL,
+    order_status NVARCHAR(255) NULL,
+    blob_name NVARCHAR(1000) NULL,
+    pdf_download NVARCHAR(1000) NULL,
+    uploaded_at DATETIME2 NULL,
+    is_reissue BIT NOT NULL DEFAULT (0)
+);
+GO
@@ -0,0 +1,210 @@
+"""Streaming writes to, and reads from, Azure block blobs.
+
+Exports used to be written to a local temp file and then uploaded in one
+call, which doubled disk I/O and could fill the App Service temp disk.
+``BlockBlobWriter`` is a write-only binary file: bytes collect in one
+``block_size`` buffer, each full buffer is uploaded with ``stage_block`` and
+``commit`` stages the rest and commits the block list. Memory stays at about
+one block and nothing touches local disk. Blocks that are never committed
+are discarded by the service, so a failed export leaves no partial blob.
+
+``open_blob_download`` is the read side for HTTP downloads: it answers
+``If-None-Match`` and single-range ``Range`` requests from the blob's
+properties and yields the body in ``BLOB_DOWNLOAD_CHUNK_SIZE`` reads, so a
+response never holds more than one chunk of the blob.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import itertools
+import os
+
+
+EXPORT_BLOCK_SIZE = int(float(os.environ.get("EXPORT_BLOCK_SIZE_MB", "4")) * 1024 * 1024)
+BLOB_DOWNLOAD_CHUNK_SIZE = int(float(os.environ.get("BLOB_DOWNLOAD_CHUNK_SIZE_MB", "4")) * 1024 * 1024)
+
+
+class BlockBlobWriter(io.RawIOBase):
+    def __init__(self, blob_client, block_size=EXPORT_BLOCK_SIZE):
+        super().__init__()
+        self.blob_client = blob_client
+        self.block_size = block_size
+        self.block_ids = []
+        self.bytes_written = 0
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self.bytes_written + len(self._buffer)
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._stage(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+        return len(data)
+
+    def _stage(self, chunk):
+        # Ids must all have the same length; the SDK base64-encodes them.
+        block_id = f"{len(self.block_ids):06d}"
+        self.blob_client.stage_block(block_id, chunk)
+        self.block_ids.append(block_id)
+        self.bytes_written += len(chunk)
+
+    def commit(self, content_settings=None):
+        """Stage the buffered tail and commit every block as the blob's content."""
+        if self._buffer or not self.block_ids:
+            self._stage(bytes(self._buffer))
+            self._buffer.clear()
+        self.blob_client.commit_block_list(self.block_ids, content_settings=content_settings)
+        self.close()
+
+    def close(self):
+        # Closing without commit() abandons the staged blocks. The buffer is
+        # kept because writers such as pyarrow close their sink before the
+        # caller commits.
+        super().close()
+
+
+def write_csv_blob(blob_client, fieldnames, rows, compress=False, content_settings=None, block_size=EXPORT_BLOCK_SIZE):
+    """Stream ``rows`` (dicts) as CSV into ``blob_client``; returns the row count.
+
+    With ``compress`` the blob holds gzip bytes; pass content settings with
+    ``content_encoding="gzip"`` so downloads are decompressed by the client.
+    """
+    writer = BlockBlobWriter(blob_client, block_size)
+    try:
+        binary = gzip.GzipFile(fileobj=writer, mode="wb") if compress else writer
+        text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+        csv_writer = csv.DictWriter(text, fieldnames=fieldnames, extrasaction="ignore")
+        csv_writer.writeheader()
+        count = 0
+        for row in rows:
+            csv_writer.writerow(row)
+            count += 1
+        text.flush()
+        # Detach so closing the text layer cannot close (and abandon) the writer.
+        text.detach()
+        if compress:
+            binary.close()
+        writer.commit(content_settings)
+    finally:
+        writer.close()
+    return count
+
+
+def _etag_value(etag):
+    text = str(etag or "").strip()
+    if text.startswith("W/"):
+        text = text[2:]
+    return text.strip('"')
+
+
+def etag_matches(header, etag):
+    """True when an ``If-None-Match`` / ``If-Range`` header names ``etag`` (weak comparison)."""
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = _etag_value(etag)
+    return any(_etag_value(candidate) == wanted for candidate in header.split(","))
+
+
+def parse_byte_range(header, size):
+    """Inclusive ``(start, end)`` for a single-range ``Range`` header.
+
+    Returns None when the whole blob should be sent (no header, another unit,
+    several ranges or a malformed value) and raises ValueError when the range
+    cannot be satisfied for a blob of ``size`` bytes.
+    """
+    text = str(header or "").strip()
+    if not text.startswith("bytes=") or "," in text:
+        return None
+    first, sep, last = text[len("bytes="):].partition("-")
+    try:
+        start = int(first) if first.strip() else None
+        end = int(last) if last.strip() else None
+    except ValueError:
+        return None
+    if not sep or (start is None and end is None):
+        return None
+    if start is None:
+        # Suffix range: the last ``end`` bytes.
+        if end < 0:
+            return None
+        if end == 0 or size == 0:
+            raise ValueError(f"unsatisfiable range: {text}")
+        return max(size - end, 0), size - 1
+    if start < 0 or (end is not None and end < start):
+        return None
+    if start >= size:
+        raise ValueError(f"unsatisfiable range: {text}")
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def _iter_blob_chunks(blob_client, offset, length, etag, chunk_size):
+    end = offset + length
+    while offset < end:
+        size = min(chunk_size, end - offset)
+        downloader = blob_client.download_blob(offset=offset, length=size)
+        # Each chunk is its own GET; refuse to splice two versions of the blob.
+        if etag and downloader.properties.etag != etag:
+            raise RuntimeError(f"{blob_client.blob_name} changed during download")
+        yield downloader.readall()
+        offset += size
+
+
+def open_blob_download(
+    blob_client,
+    range_header=None,
+    if_range=None,
+    if_none_match=None,
+    properties=None,
+    chunk_size=BLOB_DOWNLOAD_CHUNK_SIZE,
+):
+    """``(status, headers, chunks)`` for serving ``blob_client`` over HTTP.
+
+    304 when ``if_none_match`` names the blob's ETag, 206 for a satisfiable
+    ``Range`` (ignored when ``if_range`` names another version), 416 for an
+    unsatisfiable one and 200 otherwise. The first chunk is read before
+    returning so storage errors surface before the response starts.
+    """
+    props = properties or blob_client.get_blob_properties()
+    size = props.size
+    etag = props.etag
+    headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+    content_settings = props.content_settings
+    if content_settings and content_settings.content_type:
+        headers["Content-Type"] = content_settings.content_type
+    if content_settings and content_settings.content_encoding:
+        headers["Content-Encoding"] = content_settings.content_encoding
+
+    if etag_matches(if_none_match, etag):
+        return 304, headers, iter(())
+
+    if if_range and not etag_matches(if_range, etag):
+        range_header = None
+    try:
+        byte_range = parse_byte_range(range_header, size)
+    except ValueError:
+        headers["Content-Range"] = f"bytes */{size}"
+        return 416, headers, iter(())
+
+    if byte_range is None:
+        status, offset, length = 200, 0, size
+    else:
+        start, end = byte_range
+        status, offset, length = 206, start, end - start + 1
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+
+    chunks = _iter_blob_chunks(blob_client, offset, length, etag, chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        return status, headers, iter(())
+    return status, headers, itertools.chain([first], chunks)
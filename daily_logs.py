@@ -1,27 +1,171 @@
-ARRIVAL_TIME_EASTERN_SQL = """
+import os
+import time
+
+from schema_registry import has_column, invalidate_schema
+
+
+def arrival_time_eastern_sql(prefix="e."):
+    return f"""
 CAST(
-    DATEADD(SECOND, TRY_CONVERT(INT, TRY_CONVERT(BIGINT, e.arrival_time) / 1000), '1970-01-01')
+    DATEADD(SECOND, TRY_CONVERT(INT, TRY_CONVERT(BIGINT, {prefix}arrival_time) / 1000), '1970-01-01')
     AT TIME ZONE 'UTC'
     AT TIME ZONE 'Eastern Standard Time'
     AS DATETIME2
 )
 """.strip()
 
-EVENT_NUMBER_DISPLAY_SQL = """
+
+def event_number_display_sql(prefix="e."):
+    return f"""
 COALESCE(
-    NULLIF(LTRIM(RTRIM(e.event_number)), ''),
+    NULLIF(LTRIM(RTRIM({prefix}event_number)), ''),
     CASE
-        WHEN LOWER(COALESCE(e.activity_type, '')) LIKE '%peace%'
-          OR LOWER(COALESCE(e.activity_type, '')) LIKE '%protective%'
-        THEN e.generated_event_number
+        WHEN LOWER(COALESCE({prefix}activity_type, '')) LIKE '%peace%'
+          OR LOWER(COALESCE({prefix}activity_type, '')) LIKE '%protective%'
+        THEN {prefix}generated_event_number
         ELSE NULL
     END
 )
 """.strip()
 
 
+ARRIVAL_TIME_EASTERN_SQL = arrival_time_eastern_sql()
+EVENT_NUMBER_DISPLAY_SQL = event_number_display_sql()
+ESRI_EVENT_BACKFILL_BATCH_SIZE = 5000
+ARRIVAL_TIME_READY_TTL_SECONDS = int(os.environ.get("ARRIVAL_TIME_READY_TTL_SECONDS", "60"))
+
+_arrival_time_ready = None
+_arrival_time_checked_at = 0.0
+
+
+def arrival_time_eastern_ready(cur):
+    """True once every event with a parseable arrival_time has arrival_time_eastern.
+
+    Until then (backfill still running, or a loader that skipped the trigger)
+    searching the column would drop those events, so callers use the inline
+    expression instead. Rows whose arrival_time does not parse stay NULL in
+    both forms and are not waited for. The check reads only the filtered
+    pending index and is cached for ``ARRIVAL_TIME_READY_TTL_SECONDS``.
+    """
+    global _arrival_time_ready, _arrival_time_checked_at
+    if not has_column(cur, "dbo.esri_events", "arrival_time_eastern"):
+        return False
+    if _arrival_time_ready is not None and time.monotonic() - _arrival_time_checked_at < ARRIVAL_TIME_READY_TTL_SECONDS:
+        return _arrival_time_ready
+    cur.execute(f"""
+        SELECT CASE WHEN EXISTS (
+            SELECT 1 FROM dbo.esri_events
+            WHERE arrival_time_eastern IS NULL AND arrival_time IS NOT NULL
+              AND {arrival_time_eastern_sql("")} IS NOT NULL
+        ) THEN 0 ELSE 1 END
+    """)
+    _arrival_time_ready = bool(cur.fetchone()[0])
+    _arrival_time_checked_at = time.monotonic()
+    return _arrival_time_ready
+
+
+def reset_arrival_time_ready():
+    global _arrival_time_ready
+    _arrival_time_ready = None
+
+
+def ensure_esri_event_search_columns(cursor):
+    """Add arrival_time_eastern and event_number_display to dbo.esri_events.
+
+    event_number_display is a persisted computed column. AT TIME ZONE is not
+    deterministic, so arrival_time_eastern is a plain column kept current by
+    a trigger for every writer of the ESRI feed; rows that predate it are
+    filled by ``backfill_arrival_time_eastern``.
+    """
+    cursor.execute(f"""
+        IF COL_LENGTH('dbo.esri_events', 'event_number_display') IS NULL
+        BEGIN
+            ALTER TABLE dbo.esri_events ADD event_number_display AS
+                CAST({event_number_display_sql("")} AS NVARCHAR(100)) PERSISTED
+        END
+    """)
+    cursor.execute("""
+        IF COL_LENGTH('dbo.esri_events', 'arrival_time_eastern') IS NULL
+        BEGIN
+            ALTER TABLE dbo.esri_events ADD arrival_time_eastern DATETIME2 NULL
+        END
+    """)
+    # Inserts always report UPDATE(arrival_time); the trigger's own update
+    # does not, so it never re-runs itself.
+    cursor.execute(f"""
+        CREATE OR ALTER TRIGGER dbo.TR_esri_events_arrival_time_eastern
+        ON dbo.esri_events
+        AFTER INSERT, UPDATE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            IF NOT UPDATE(arrival_time)
+                RETURN;
+            UPDATE e
+            SET arrival_time_eastern = {ARRIVAL_TIME_EASTERN_SQL}
+            FROM dbo.esri_events AS e
+            JOIN inserted AS i ON i.id = e.id;
+        END
+    """)
+    cursor.execute("""
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'IX_esri_events_arrival_time_eastern'
+              AND object_id = OBJECT_ID('dbo.esri_events')
+        )
+        CREATE INDEX IX_esri_events_arrival_time_eastern
+            ON dbo.esri_events(arrival_time_eastern DESC, id DESC)
+    """)
+    cursor.execute("""
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'IX_esri_events_arrival_time_eastern_pending'
+              AND object_id = OBJECT_ID('dbo.esri_events')
+        )
+        CREATE INDEX IX_esri_events_arrival_time_eastern_pending
+            ON dbo.esri_events(id)
+            INCLUDE (arrival_time)
+            WHERE arrival_time_eastern IS NULL AND arrival_time IS NOT NULL
+    """)
+    invalidate_schema()
+
+
+def backfill_arrival_time_eastern(conn, batch_size=ESRI_EVENT_BACKFILL_BATCH_SIZE):
+    """Compute arrival_time_eastern for rows still missing it, in id ranges; returns rows updated."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT MIN(id), MAX(id) FROM dbo.esri_events")
+    min_id, max_id = cursor.fetchone()
+    if min_id is None:
+        return 0
+    updated = 0
+    start = int(min_id)
+    while start <= max_id:
+        cursor.execute(
+            f"""
+            UPDATE e
+            SET arrival_time_eastern = {ARRIVAL_TIME_EASTERN_SQL}
+            FROM dbo.esri_events AS e
+            WHERE e.id >= ? AND e.id < ? AND e.arrival_time_eastern IS NULL
+            """,
+            start,
+            start + batch_size,
+        )
+        updated += max(cursor.rowcount, 0)
+        conn.commit()
+        start += batch_size
+    reset_arrival_time_ready()
+    return updated
+
+
 def search_daily_logs(conn, filters, limit=2000):
     """Return Daily Logs records from dbo.esri_events using applicable search filters."""
+    cursor = conn.cursor()
+    persisted = arrival_time_eastern_ready(cursor)
+    arrival_sql = "e.arrival_time_eastern" if persisted else ARRIVAL_TIME_EASTERN_SQL
+    if has_column(cursor, "dbo.esri_events", "event_number_display"):
+        event_number_sql = "e.event_number_display"
+    else:
+        event_number_sql = EVENT_NUMBER_DISPLAY_SQL
     where_clauses = ["1 = 1"]
     params = []
 
@@ -30,11 +174,18 @@ def search_daily_logs(conn, filters, limit=2000):
         params.append(f"%{filters['query'].lower()}%")
 
     if filters["case_number"]:
-        where_clauses.append(f"LOWER(COALESCE({EVENT_NUMBER_DISPLAY_SQL}, '')) LIKE ?")
+        where_clauses.append(f"LOWER(COALESCE({event_number_sql}, '')) LIKE ?")
         params.append(f"%{filters['case_number'].lower()}%")
 
     if filters["date_start"] and filters["date_end"]:
-        where_clauses.append(f"CAST({ARRIVAL_TIME_EASTERN_SQL} AS date) BETWEEN CAST(? AS date) AND CAST(? AS date)")
+        if persisted:
+            # A half-open range on the column itself so the index can seek.
+            where_clauses.append(
+                "e.arrival_time_eastern >= CAST(? AS date) "
+                "AND e.arrival_time_eastern < DATEADD(day, 1, CAST(? AS date))"
+            )
+        else:
+            where_clauses.append(f"CAST({arrival_sql} AS date) BETWEEN CAST(? AS date) AND CAST(? AS date)")
         params.extend([filters["date_start"], filters["date_end"]])
     elif filters["last_x_days"]:
         try:
@@ -42,15 +193,14 @@ def search_daily_logs(conn, filters, limit=2000):
         except (TypeError, ValueError):
             last_x_days = None
         if last_x_days is not None and last_x_days >= 0:
-            where_clauses.append(f"{ARRIVAL_TIME_EASTERN_SQL} >= DATEADD(day, -?, CAST(GETDATE() AS date))")
+            where_clauses.append(f"{arrival_sql} >= DATEADD(day, -?, CAST(GETDATE() AS date))")
             params.append(last_x_days)
 
-    cursor = conn.cursor()
     cursor.execute(
         f"""
         SELECT TOP {int(limit)}
-            {EVENT_NUMBER_DISPLAY_SQL} AS event_number,
-            CONVERT(varchar(19), {ARRIVAL_TIME_EASTERN_SQL}, 120) AS arrival_time,
+            {event_number_sql} AS event_number,
+            CONVERT(varchar(19), {arrival_sql}, 120) AS arrival_time,
             e.event_status,
             e.activity_type,
             e.address,
@@ -63,7 +213,7 @@ def search_daily_logs(conn, filters, limit=2000):
             e.radio_id
         FROM dbo.esri_events AS e
         WHERE {' AND '.join(where_clauses)}
-        ORDER BY {ARRIVAL_TIME_EASTERN_SQL} DESC, e.id DESC
+        ORDER BY {arrival_sql} DESC, e.id DESC
         """,
         params,
     )
@@ -0,0 +1,212 @@
+"""Code tables for the sex, race and issuing-county search filters.
+
+Ingest sources spell these values many ways ("M", "male", "Balto Co.", ...).
+Each category maps known spellings to one small integer code, and
+search.records carries a persisted computed ``*_code`` column per category
+built from the same aliases, so every insert and update path assigns codes
+without ingest changes and the filters become indexed integer equality.
+Values with no alias get a NULL code. The search.*_codes tables hold the
+code labels for reporting and joins.
+
+County codes are the Maryland FIPS county codes (510 for Baltimore City).
+"""
+
+from __future__ import annotations
+
+from schema_registry import has_columns, invalidate_schema
+
+
+# (code, label, extra spellings); the lowercased label always matches too.
+SEX_CODES = (
+    (1, "Male", ("m",)),
+    (2, "Female", ("f",)),
+    (3, "Other", ("o", "x", "nonbinary", "non-binary")),
+)
+
+RACE_CODES = (
+    (1, "Black", ("b", "african american", "black or african american", "black/african american")),
+    (2, "White", ("w", "caucasian")),
+    (3, "Asian/Pacific Islander", (
+        "a", "p", "asian", "pacific islander", "asian or pacific islander",
+        "native hawaiian or other pacific islander",
+    )),
+    (4, "Multi-Race", ("multi race", "multiracial", "multi", "two or more races")),
+    (5, "Indian or Alaskan Native", (
+        "i", "american indian", "american indian or alaska native",
+        "american indian/alaskan native", "alaskan native", "alaska native", "native american",
+    )),
+    (6, "Unknown", ("u", "unk")),
+)
+
+
+MARYLAND_COUNTIES = (
+    (1, "Allegany"),
+    (3, "Anne Arundel"),
+    (5, "Baltimore"),
+    (9, "Calvert"),
+    (11, "Caroline"),
+    (13, "Carroll"),
+    (15, "Cecil"),
+    (17, "Charles"),
+    (19, "Dorchester"),
+    (21, "Frederick"),
+    (23, "Garrett"),
+    (25, "Harford"),
+    (27, "Howard"),
+    (29, "Kent"),
+    (31, "Montgomery"),
+    (33, "Prince George's"),
+    (35, "Queen Anne's"),
+    (37, "St. Mary's"),
+    (39, "Somerset"),
+    (41, "Talbot"),
+    (43, "Washington"),
+    (45, "Wicomico"),
+    (47, "Worcester"),
+)
+
+
+def _county_codes():
+    codes = []
+    for code, name in MARYLAND_COUNTIES:
+        base = name.lower()
+        names = {base, base.replace("'", ""), base.replace(".", ""), base.replace(".", "").replace("'", "")}
+        if base.startswith("st. "):
+            names |= {n.replace("st ", "saint ", 1).replace("st. ", "saint ", 1) for n in names}
+        aliases = set()
+        for n in names:
+            aliases |= {f"{n} county", f"{n} co", f"{n} co."}
+            # A bare "Baltimore" could be the city or the county.
+            if name != "Baltimore":
+                aliases.add(n)
+        codes.append((code, f"{name} County", tuple(sorted(aliases))))
+    codes.append((510, "Baltimore City", ("balt city", "balto city", "city of baltimore")))
+    codes.append((999, "Outside of Maryland", ("outside maryland", "out of state")))
+    return tuple(codes)
+
+
+COUNTY_CODES = _county_codes()
+
+# code column -> (source column, codes, code table, SQL type)
+CODE_COLUMNS = {
+    "sex_code": ("sex", SEX_CODES, "search.sex_codes", "TINYINT"),
+    "race_code": ("race", RACE_CODES, "search.race_codes", "TINYINT"),
+    "issuing_county_code": ("issuing_county", COUNTY_CODES, "search.county_codes", "SMALLINT"),
+}
+
+
+def normalize_code_text(value):
+    """Python twin of the ``LOWER(LTRIM(RTRIM(...)))`` the code columns match on."""
+    return " ".join(str(value or "").split()).lower()
+
+
+def _alias_map(codes):
+    aliases = {}
+    for code, label, spellings in codes:
+        for spelling in (label.lower(), *spellings):
+            if aliases.setdefault(spelling, code) != code:
+                raise ValueError(f"alias {spelling!r} maps to two codes")
+    return aliases
+
+
+CODE_ALIASES = {code_column: _alias_map(codes) for code_column, (_, codes, _, _) in CODE_COLUMNS.items()}
+
+
+def code_for(code_column, value):
+    """Code for a stored or requested value, or None when it is not a known spelling."""
+    return CODE_ALIASES[code_column].get(normalize_code_text(value))
+
+
+def code_label(code_column, value):
+    """Label of the code for ``value`` ("m" -> "Male"), or None when it has no code."""
+    code = code_for(code_column, value)
+    if code is None:
+        return None
+    _, codes, _, _ = CODE_COLUMNS[code_column]
+    return next(label for candidate, label, _ in codes if candidate == code)
+
+
+def _sql_literal(text):
+    return "N'" + text.replace("'", "''") + "'"
+
+
+def code_case_sql(code_column):
+    """Deterministic CASE behind a persisted ``*_code`` column."""
+    source_column, _, _, sql_type = CODE_COLUMNS[code_column]
+    branches = "\n".join(
+        f"        WHEN {_sql_literal(alias)} THEN {code}"
+        for alias, code in sorted(CODE_ALIASES[code_column].items(), key=lambda item: (item[1], item[0]))
+    )
+    return (
+        f"CAST(CASE LOWER(LTRIM(RTRIM({source_column})))\n"
+        f"{branches}\n"
+        f"    END AS {sql_type})"
+    )
+
+
+def has_code_columns(cur):
+    return has_columns(cur, "search.records", list(CODE_COLUMNS))
+
+
+def ensure_code_tables(cursor):
+    """Create the search.*_codes label tables and sync them with this module."""
+    for _, codes, table_name, sql_type in CODE_COLUMNS.values():
+        cursor.execute(f"""
+            IF OBJECT_ID('{table_name}', 'U') IS NULL
+            CREATE TABLE {table_name} (
+                code {sql_type} NOT NULL PRIMARY KEY,
+                label NVARCHAR(100) NOT NULL
+            )
+        """)
+        for code, label, _ in codes:
+            cursor.execute(f"""
+                MERGE {table_name} AS target
+                USING (SELECT ? AS code, ? AS label) AS source
+                    ON target.code = source.code
+                WHEN MATCHED AND target.label <> source.label THEN
+                    UPDATE SET label = source.label
+                WHEN NOT MATCHED THEN
+                    INSERT (code, label) VALUES (source.code, source.label);
+            """, code, label)
+
+
+def ensure_records_code_columns(cursor, rebuild=False):
+    """Add the persisted code columns and their indexes to search.records.
+
+    Adding a column computes it for every existing row. Pass ``rebuild`` after
+    changing aliases here: the columns and indexes are dropped and re-added.
+    """
+    if not rebuild and has_code_columns(cursor):
+        return
+    ensure_code_tables(cursor)
+    for code_column in CODE_COLUMNS:
+        index_name = f"IX_records_{code_column}"
+        if rebuild:
+            cursor.execute(f"""
+                IF EXISTS (
+                    SELECT 1 FROM sys.indexes
+                    WHERE name = '{index_name}'
+                      AND object_id = OBJECT_ID('search.records')
+                )
+                DROP INDEX {index_name} ON search.records
+            """)
+            cursor.execute(f"""
+                IF COL_LENGTH('search.records', '{code_column}') IS NOT NULL
+                    ALTER TABLE search.records DROP COLUMN {code_column}
+            """)
+        cursor.execute(f"""
+            IF COL_LENGTH('search.records', '{code_column}') IS NULL
+            BEGIN
+                ALTER TABLE search.records ADD {code_column} AS {code_case_sql(code_column)} PERSISTED
+            END
+        """)
+        cursor.execute(f"""
+            IF NOT EXISTS (
+                SELECT 1 FROM sys.indexes
+                WHERE name = '{index_name}'
+                  AND object_id = OBJECT_ID('search.records')
+            )
+            CREATE INDEX {index_name}
+                ON search.records({code_column})
+        """)
+    invalidate_schema()
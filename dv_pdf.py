@@ -0,0 +1,227 @@
+"""DV PDF order search over search.dv_pdf_records.
+
+The search pushes the name, case number, issue date and disposition filters
+into SQL and reads one page at a time in ``(uploaded_at, id)`` order, the
+order the table has always been listed in. ``issue_date`` is a DATE column:
+write paths parse the order's issue date once with ``parse_dv_issue_date``
+so searches never parse dates per row.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from schema_registry import has_column, invalidate_schema
+from search_sql import (
+    CASE_NUMBER_MATCH_CONTAINS,
+    OPENJSON_VALUES_SQL,
+    case_number_norm_sql,
+    decode_page_cursor,
+    json_list_param,
+    normalize_case_number,
+)
+
+
+DV_PDF_SECTION = "DV PDF"
+DV_PDF_ISSUE_DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d")
+
+
+def parse_dv_issue_date(value):
+    """``date`` for an order's issue date ("MM/DD/YYYY" or "YYYY-MM-DD"), else None."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or "").strip()
+    if not text:
+        return None
+    for fmt in DV_PDF_ISSUE_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _format_issue_date(value):
+    if not value:
+        return ""
+    if hasattr(value, "strftime"):
+        return value.strftime("%m/%d/%Y")
+    return str(value)
+
+
+def _format_uploaded_at(value):
+    if not value:
+        return ""
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+def _text(value):
+    return (value or "").strip()
+
+
+def ensure_dv_pdf_search_columns(cursor):
+    """Add the persisted case_number_norm column and the search indexes."""
+    if has_column(cursor, "search.dv_pdf_records", "case_number_norm"):
+        return
+    cursor.execute(f"""
+        IF COL_LENGTH('search.dv_pdf_records', 'case_number_norm') IS NULL
+        BEGIN
+            ALTER TABLE search.dv_pdf_records ADD case_number_norm AS {case_number_norm_sql()} PERSISTED
+        END
+    """)
+    for index_name, key_columns in (
+        ("IX_dv_pdf_records_case_number_norm", "case_number_norm"),
+        ("IX_dv_pdf_records_issue_date", "issue_date"),
+        ("IX_dv_pdf_records_uploaded_at", "uploaded_at DESC, id DESC"),
+    ):
+        cursor.execute(f"""
+            IF NOT EXISTS (
+                SELECT 1 FROM sys.indexes
+                WHERE name = '{index_name}'
+                  AND object_id = OBJECT_ID('search.dv_pdf_records')
+            )
+            CREATE INDEX {index_name}
+                ON search.dv_pdf_records({key_columns})
+        """)
+    invalidate_schema()
+
+
+def build_dv_pdf_search_sql(
+    filters,
+    page_size,
+    cursor=None,
+    disposition_column=True,
+    reverse_geocode_column=True,
+    case_number_norm_column=True,
+):
+    """Return ``(sql, params)`` for one page of DV PDF orders, or None when nothing can match.
+
+    The first page (no ``cursor``) also selects ``total_count``, the number of
+    matching orders across all pages.
+    """
+    if filters.get("court_document_type"):
+        return None
+    clauses = []
+    params = []
+
+    query = _text(filters.get("query")).lower()
+    if query:
+        clauses.append("LOWER(COALESCE(respondent_name, '')) LIKE ?")
+        params.append(f"%{query}%")
+
+    case_number = _text(filters.get("case_number"))
+    if case_number:
+        case_column = "case_number_norm" if case_number_norm_column else case_number_norm_sql()
+        clauses.append(f"{case_column} LIKE ?")
+        if filters.get("case_number_match") == CASE_NUMBER_MATCH_CONTAINS:
+            params.append(f"%{normalize_case_number(case_number)}%")
+        else:
+            params.append(f"{normalize_case_number(case_number)}%")
+
+    start_date = parse_dv_issue_date(filters.get("date_start"))
+    end_date = parse_dv_issue_date(filters.get("date_end"))
+    if start_date and end_date:
+        clauses.append("issue_date BETWEEN ? AND ?")
+        params.extend([start_date, end_date])
+
+    last_x_days = _text(filters.get("last_x_days"))
+    if last_x_days:
+        try:
+            days = int(last_x_days)
+        except ValueError:
+            days = None
+        if days is not None:
+            clauses.append("issue_date >= DATEADD(day, -?, CAST(GETDATE() AS date))")
+            params.append(days)
+
+    admin_status_values = sorted({
+        str(value).strip().lower()
+        for value in (filters.get("admin_status_values") or [])
+        if str(value or "").strip()
+    })
+    if admin_status_values:
+        if not disposition_column:
+            return None
+        clauses.append(f"LOWER(LTRIM(RTRIM(csv_order_disposition))) IN ({OPENJSON_VALUES_SQL})")
+        params.append(json_list_param(admin_status_values))
+
+    select_count = "COUNT(*) OVER () AS total_count"
+    if cursor:
+        _, uploaded_at, record_id = decode_page_cursor(cursor)
+        clauses.append("(uploaded_at < ? OR (uploaded_at = ? AND id < ?))")
+        params.extend([uploaded_at, uploaded_at, record_id])
+        select_count = "CAST(NULL AS INT) AS total_count"
+
+    reverse_geocode_expr = "csv_reverse_geocode_output" if reverse_geocode_column else "CAST('' AS NVARCHAR(1))"
+    disposition_expr = "csv_order_disposition" if disposition_column else "CAST('' AS NVARCHAR(1))"
+    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"""
+        SELECT TOP ({int(page_size)})
+            id,
+            case_number,
+            respondent_name,
+            issue_date,
+            {reverse_geocode_expr} AS reverse_geocode_output,
+            order_type,
+            {disposition_expr} AS order_disposition,
+            order_status,
+            pdf_download,
+            uploaded_at,
+            {select_count}
+        FROM search.dv_pdf_records
+        {where_sql}
+        ORDER BY uploaded_at DESC, id DESC
+    """
+    return sql, params
+
+
+def dv_pdf_row(row):
+    """Search/listing dict for one search.dv_pdf_records row."""
+    order_type = _text(row.order_type)
+    return {
+        "case_number": _text(row.case_number),
+        "respondent_name": _text(row.respondent_name),
+        "record_id": row.id,
+        "issue_date": _format_issue_date(row.issue_date),
+        "reverse_geocode_output": _text(row.reverse_geocode_output),
+        "order_type": order_type,
+        "order_disposition": _text(row.order_disposition),
+        "order_status": _text(row.order_status),
+        "type": order_type,
+        "pdf_download": _text(row.pdf_download),
+        "uploaded_at": _format_uploaded_at(row.uploaded_at),
+    }
+
+
+def search_dv_pdf_records(conn, filters, page_size, cursor=None):
+    """Return ``(total, rows)`` for one page of matching DV PDF orders.
+
+    ``total`` is None on pages after the first. Each row carries
+    ``page_created_at`` for ``next_page_cursor``.
+    """
+    cur = conn.cursor()
+    built = build_dv_pdf_search_sql(
+        filters,
+        page_size,
+        cursor=cursor,
+        disposition_column=has_column(cur, "search.dv_pdf_records", "csv_order_disposition"),
+        reverse_geocode_column=has_column(cur, "search.dv_pdf_records", "csv_reverse_geocode_output"),
+        case_number_norm_column=has_column(cur, "search.dv_pdf_records", "case_number_norm"),
+    )
+    if built is None:
+        return (None if cursor else 0), []
+    sql, params = built
+    cur.execute(sql, params)
+    total = None if cursor else 0
+    rows = []
+    for row in cur.fetchall():
+        if total is not None:
+            total = row.total_count
+        record = dv_pdf_row(row)
+        record["page_created_at"] = row.uploaded_at
+        rows.append(record)
+    return total, rows
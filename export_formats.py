@@ -0,0 +1,169 @@
+"""Column list, formats and the Parquet / Arrow writers for the landlord/tenant export.
+
+CSV needs nothing beyond the standard library. Parquet and Arrow IPC are
+written with pyarrow, imported only when such an export runs: rows are
+gathered into typed column arrays of ``EXPORT_ROW_GROUP_SIZE`` and each group
+is written as one compressed row group (or record batch) into a
+``BlockBlobWriter``, so memory stays at one group.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+from datetime import date, datetime
+
+from blob_stream import EXPORT_BLOCK_SIZE, BlockBlobWriter
+
+
+EXPORT_ROW_GROUP_SIZE = int(os.environ.get("EXPORT_ROW_GROUP_SIZE", "50000"))
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_PARQUET = "parquet"
+EXPORT_FORMAT_ARROW = "arrow"
+# format -> (file extension, content type)
+EXPORT_FORMATS = {
+    EXPORT_FORMAT_CSV: (".csv", "text/csv"),
+    EXPORT_FORMAT_PARQUET: (".parquet", "application/vnd.apache.parquet"),
+    EXPORT_FORMAT_ARROW: (".arrow", "application/vnd.apache.arrow.file"),
+}
+
+# Export column -> type in the columnar formats, in CSV header order.
+EXPORT_COLUMNS = {
+    "record_id": "int64",
+    "full_name": "string",
+    "case_number": "string",
+    "address": "string",
+    "apt": "string",
+    "city": "string",
+    "state": "string",
+    "postal_code": "string",
+    "notes": "string",
+    "case_type": "string",
+    "intake_date": "date",
+    "record_date": "date",
+    "Event Type": "string",
+    "x": "float64",
+    "y": "float64",
+}
+
+
+def parse_export_format(value):
+    """Lowercased export format, "csv" when blank; raises ValueError when unknown."""
+    export_format = str(value or "").strip().lower() or EXPORT_FORMAT_CSV
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    return export_format
+
+
+def parse_export_columns(value):
+    """Selected columns in export order; all columns when blank.
+
+    Accepts a list or a comma-separated string. Unknown names raise ValueError.
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    requested = {str(name).strip() for name in (value or []) if str(name or "").strip()}
+    if not requested:
+        return list(EXPORT_COLUMNS)
+    unknown = sorted(requested - set(EXPORT_COLUMNS))
+    if unknown:
+        raise ValueError(f"unknown export columns: {', '.join(unknown)}")
+    return [column for column in EXPORT_COLUMNS if column in requested]
+
+
+def columnar_export_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _to_int(value):
+    try:
+        return None if value is None or value == "" else int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value):
+    try:
+        return None if value is None or value == "" else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def _to_text(value):
+    return None if value is None else str(value)
+
+
+COERCE = {"int64": _to_int, "float64": _to_float, "date": _to_date, "string": _to_text}
+
+
+def column_arrays(rows, columns):
+    """``{column: [values]}`` for ``rows`` with each value coerced to its export type."""
+    converters = [(column, COERCE[EXPORT_COLUMNS[column]]) for column in columns]
+    arrays = {column: [] for column in columns}
+    for row in rows:
+        for column, convert in converters:
+            arrays[column].append(convert(row.get(column)))
+    return arrays
+
+
+def arrow_schema(columns):
+    import pyarrow as pa
+
+    types = {"int64": pa.int64(), "float64": pa.float64(), "date": pa.date32(), "string": pa.string()}
+    return pa.schema([(column, types[EXPORT_COLUMNS[column]]) for column in columns])
+
+
+def _row_groups(rows, size):
+    group = []
+    for row in rows:
+        group.append(row)
+        if len(group) >= size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def write_columnar_blob(
+    blob_client,
+    export_format,
+    columns,
+    rows,
+    content_settings=None,
+    row_group_size=EXPORT_ROW_GROUP_SIZE,
+    block_size=EXPORT_BLOCK_SIZE,
+):
+    """Stream ``rows`` (dicts) into ``blob_client`` as Parquet or Arrow IPC; returns the row count."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(columns)
+    writer = BlockBlobWriter(blob_client, block_size)
+    try:
+        sink = pa.PythonFile(writer, mode="w")
+        if export_format == EXPORT_FORMAT_PARQUET:
+            table_writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            table_writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+        count = 0
+        for group in _row_groups(rows, row_group_size):
+            arrays = column_arrays(group, columns)
+            table_writer.write_table(pa.table(arrays, schema=schema))
+            count += len(group)
+        table_writer.close()
+        writer.commit(content_settings)
+    finally:
+        writer.close()
+    return count
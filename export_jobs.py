@@ -0,0 +1,102 @@
+"""Bounded background pool for /export-csv jobs.
+
+Every export is a full scan of search.records, so jobs run on at most
+``EXPORT_WORKERS`` threads with at most ``EXPORT_QUEUE_LIMIT`` more waiting
+behind them; anything beyond that is refused instead of stacking further
+scans on the database. Duplicate requests never reach the pool: the caller
+looks up a queued, running or recently finished job with the same key in
+search.exports and hands back its token.
+
+The pool only lives in one worker's memory, so it heartbeats
+``updated_at`` on every job it holds. A queued or processing row whose
+heartbeat is older than ``EXPORT_STALE_SECONDS`` lost its worker (restart,
+deploy) and is failed rather than reused.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", "2"))
+EXPORT_QUEUE_LIMIT = int(os.environ.get("EXPORT_QUEUE_LIMIT", "8"))
+# A ready export is reused by identical requests for this long.
+EXPORT_REUSE_SECONDS = float(os.environ.get("EXPORT_REUSE_SECONDS", "600"))
+EXPORT_HEARTBEAT_SECONDS = float(os.environ.get("EXPORT_HEARTBEAT_SECONDS", "30"))
+# Queued or running jobs without a heartbeat for this long are assumed lost with their worker.
+EXPORT_STALE_SECONDS = float(os.environ.get("EXPORT_STALE_SECONDS", "120"))
+
+
+class ExportJobQueue:
+    def __init__(
+        self,
+        max_workers=EXPORT_WORKERS,
+        max_queued=EXPORT_QUEUE_LIMIT,
+        heartbeat=None,
+        heartbeat_seconds=EXPORT_HEARTBEAT_SECONDS,
+    ):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.heartbeat = heartbeat
+        self.heartbeat_seconds = heartbeat_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._lock = threading.Lock()
+        self._queued = []
+        self._running = set()
+        self._stopped = threading.Event()
+        self._heartbeat_thread = None
+
+    def submit(self, token, fn, *args):
+        """Run ``fn(*args)`` on the pool under ``token``; False when the queue is full."""
+        with self._lock:
+            if len(self._queued) + len(self._running) >= self.max_workers + self.max_queued:
+                return False
+            self._queued.append(token)
+            if self.heartbeat and self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(
+                    target=self._beat, name="export-heartbeat", daemon=True
+                )
+                self._heartbeat_thread.start()
+        self._executor.submit(self._run, token, fn, args)
+        return True
+
+    def tokens(self):
+        """Tokens of every queued or running job."""
+        with self._lock:
+            return list(self._running) + list(self._queued)
+
+    def _beat(self):
+        while not self._stopped.wait(self.heartbeat_seconds):
+            tokens = self.tokens()
+            if not tokens:
+                continue
+            try:
+                self.heartbeat(tokens)
+            except Exception as exc:
+                print(f"Export heartbeat failed: {exc}")
+
+    def _run(self, token, fn, args):
+        with self._lock:
+            self._queued.remove(token)
+            self._running.add(token)
+        try:
+            fn(*args)
+        finally:
+            with self._lock:
+                self._running.discard(token)
+
+    def position(self, token):
+        """0 while ``token`` runs, its 1-based place in line while queued, else None."""
+        with self._lock:
+            if token in self._running:
+                return 0
+            try:
+                return self._queued.index(token) + 1
+            except ValueError:
+                return None
+
+    def shutdown(self, wait=True):
+        self._stopped.set()
+        self._executor.shutdown(wait=wait)
@@ -8,6 +8,10 @@ import pyodbc
 import re
 import requests
 from datetime import datetime
+from demographic_codes import ensure_records_code_columns
+from name_index import delete_names_where, refresh_record_names
+from schema_registry import has_column, has_columns, invalidate_schema, table_columns
+from search_sql import case_number_norm_sql, record_date_sql
 print("USING INGEST.PY FROM:", __file__)
 
 
@@ -342,6 +346,7 @@ def ingest_dv_csv_one_time(csv_file_name="dv_pdf_records.csv"):
                     ALTER TABLE search.dv_pdf_records ADD [{escaped}] NVARCHAR(MAX) NULL;
                 """
             )
+        invalidate_schema()
 
         cur.execute(
             """
@@ -521,15 +526,20 @@ def insert_search_record_warrants(cursor, record):
 
     
     
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 def ensure_records_geocode_confidence_column(cursor):
+    if has_column(cursor, "search.records", "geocode_confidence"):
+        return
     cursor.execute("""
         IF COL_LENGTH('search.records', 'geocode_confidence') IS NULL
         BEGIN
             ALTER TABLE search.records ADD geocode_confidence FLOAT NULL
         END
     """)
+    invalidate_schema()
 
 
 def insert_search_record_active_warrants(cursor, record):
@@ -579,7 +589,9 @@ def insert_search_record_active_warrants(cursor, record):
     )
 
     cursor.execute(sql, values)
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 def insert_search_record_population(cursor, record):
     sql = """
@@ -609,7 +621,9 @@ def insert_search_record_population(cursor, record):
     )
 
     cursor.execute(sql, *values)
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 
 def insert_search_record_fsdw(cursor, record):
@@ -653,7 +667,9 @@ def insert_search_record_fsdw(cursor, record):
     ))
 
     cursor.execute(sql, *values)
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 
 def insert_search_record_civil_papers_one_time(cursor, record):
@@ -736,6 +752,7 @@ def insert_search_record_civil_papers_one_time(cursor, record):
                 f"UPDATE search.records SET {assignments} WHERE record_id = ?",
                 *update_values,
             )
+            refresh_record_names(cursor, record_id)
             return record_id
 
     placeholders = ", ".join(["?"] * len(columns))
@@ -748,7 +765,9 @@ def insert_search_record_civil_papers_one_time(cursor, record):
         """,
         *values,
     )
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 
 
@@ -796,7 +815,9 @@ def insert_search_record_odyssey(cursor, record):
         record.get("notes"),
     ))
     cursor.execute(sql, *values)
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 
 def _find_civil_duplicate_record_id(cursor, case_number, administrative_status, served_by):
@@ -950,7 +971,9 @@ def insert_search_record_civil_papers(cursor, record):
 ))
 
     cursor.execute(sql, values)
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 def ensure_civil_papers_columns(cursor):
     cursor.execute("""
@@ -961,9 +984,49 @@ def ensure_civil_papers_columns(cursor):
         IF COL_LENGTH('search.records', 'served_by') IS NULL
             ALTER TABLE search.records ADD served_by NVARCHAR(500) NULL;
     """)
+    invalidate_schema()
+
+
+ESRI_WEBHOOK1_COLUMNS = (
+    "re_issue",
+    "request_for_service_type",
+    "court_issued_date",
+    "trial_date",
+    "service_days",
+    "expiration_date",
+    "check_or_money_order_number",
+    "payment_amount",
+    "tenant_defendant_or_respondent",
+    "tenant_defendant_or_respondent_address",
+    "apartment_unit_or_secondary_address",
+    "area_number",
+    "post_number",
+    "petitioner_or_plaintiff_name",
+    "petitioner_address",
+    "administrative_status",
+    "service_method",
+    "scheduled_date",
+    "unable_to_serve_reason",
+    "relationship",
+    "age",
+    "race",
+    "sex",
+    "height",
+    "weight",
+    "attempt_1",
+    "attempt_2",
+    "attempt_3",
+    "parcel_pin",
+    "serving_or_attempting_deputy",
+    "assigned_deputy",
+    "due_date",
+    "date_time_served",
+)
 
 
 def ensure_esri_webhook1_columns(cursor):
+    if has_columns(cursor, "search.records", ESRI_WEBHOOK1_COLUMNS):
+        return
     cursor.execute("""
         IF COL_LENGTH('search.records', 're_issue') IS NULL
             ALTER TABLE search.records ADD re_issue NVARCHAR(100) NULL;
@@ -1032,6 +1095,7 @@ def ensure_esri_webhook1_columns(cursor):
         IF COL_LENGTH('search.records', 'date_time_served') IS NULL
             ALTER TABLE search.records ADD date_time_served DATETIME NULL;
     """)
+    invalidate_schema()
 
 
 def insert_search_record_civil_papers_webhook1(cursor, record):
@@ -1086,12 +1150,7 @@ def insert_search_record_civil_papers_webhook1(cursor, record):
         "objectid": record.get("objectid"),
     }
 
-    cursor.execute("""
-        SELECT COLUMN_NAME
-        FROM INFORMATION_SCHEMA.COLUMNS
-        WHERE TABLE_SCHEMA = 'search' AND TABLE_NAME = 'records'
-    """)
-    available = {row[0] for row in cursor.fetchall()}
+    available = table_columns(cursor, "search.records")
     filtered = {k: clean(v) for k, v in payload.items() if k in available}
 
     columns = list(filtered.keys())
@@ -1102,7 +1161,9 @@ def insert_search_record_civil_papers_webhook1(cursor, record):
     VALUES ({placeholders})
     """
     cursor.execute(sql, tuple(filtered[c] for c in columns))
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 
 def _pick_row_value(row, *candidates):
@@ -1197,6 +1258,7 @@ def ingest_civil_papers_one_time(file_name="S123_e56eefee65cc474281ea615e46b0b89
     try:
         cursor = conn.cursor()
         ensure_civil_papers_columns(cursor)
+        delete_names_where(cursor, "department = 'CIVIL PAPERS' AND source_file = ?", source_file)
         cursor.execute("""
             DELETE FROM search.records
             WHERE department = 'CIVIL PAPERS' AND source_file = ?
@@ -1327,6 +1389,54 @@ def ensure_records_apt_column(cursor):
             ALTER TABLE search.records ADD apt NVARCHAR(100) NULL
         END
     """)
+    invalidate_schema()
+
+
+def ensure_records_case_number_norm_column(cursor):
+    if has_column(cursor, "search.records", "case_number_norm"):
+        return
+    # Persisted computed column: SQL Server keeps it current on every insert
+    # and update path, so ingest code never has to write it.
+    cursor.execute(f"""
+        IF COL_LENGTH('search.records', 'case_number_norm') IS NULL
+        BEGIN
+            ALTER TABLE search.records ADD case_number_norm AS {case_number_norm_sql()} PERSISTED
+        END
+    """)
+    cursor.execute("""
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'IX_records_case_number_norm'
+              AND object_id = OBJECT_ID('search.records')
+        )
+        CREATE INDEX IX_records_case_number_norm
+            ON search.records(case_number_norm)
+    """)
+    invalidate_schema()
+
+
+def ensure_records_record_date_column(cursor):
+    if has_column(cursor, "search.records", "record_date"):
+        return
+    # Persisted like case_number_norm; adding it computes every existing row.
+    cursor.execute(f"""
+        IF COL_LENGTH('search.records', 'record_date') IS NULL
+        BEGIN
+            ALTER TABLE search.records ADD record_date AS {record_date_sql()} PERSISTED
+        END
+    """)
+    # The filters range over record_date without a department equality, so
+    # record_date leads; department serves the per-department partitions.
+    cursor.execute("""
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'IX_records_record_date_department'
+              AND object_id = OBJECT_ID('search.records')
+        )
+        CREATE INDEX IX_records_record_date_department
+            ON search.records(record_date, department)
+    """)
+    invalidate_schema()
 
 
 def normalize_existing_fsd_apt_records(cursor):
@@ -2159,6 +2269,7 @@ def ingest_odyssey_civil_from_blob(blob_name, container_name="fscsv", existing_k
     try:
         cursor = conn.cursor()
         ensure_records_apt_column(cursor)
+        delete_names_where(cursor, "department = 'FIELD SERVICES DEPARTMENT' AND source_file = ?", blob_name)
         cursor.execute("""
             DELETE FROM search.records
             WHERE department = 'FIELD SERVICES DEPARTMENT'
@@ -2228,6 +2339,10 @@ def ingest_all_odyssey_civil_blobs(container_name="fscsv"):
     conn = get_conn()
     try:
         cursor = conn.cursor()
+        ensure_records_case_number_norm_column(cursor)
+        ensure_records_record_date_column(cursor)
+        ensure_records_code_columns(cursor)
+        conn.commit()
         cursor.execute("""
             SELECT DISTINCT source_file
             FROM search.records
@@ -2288,6 +2403,7 @@ def ingest_population_from_table(table_name, display_department, source_file):
         cursor = conn.cursor()
 
         # OPTIONAL safety: remove prior inserts for this same source_file + department
+        delete_names_where(cursor, "department = ? AND source_file = ?", display_department, source_file)
         cursor.execute("""
             DELETE FROM search.records
             WHERE department = ? AND source_file = ?
@@ -2680,6 +2796,7 @@ def ingest_bcso_active_warrants_csv(_=None):
                         record.get("geocode_confidence"),
                         record_id
                     )
+                    refresh_record_names(cursor, record_id)
 
                 else:
                     # 3) No existing case_number -> insert new
@@ -2882,6 +2999,7 @@ def ingest_wor(payload=None):
                     record["notes"],
                     record_id,
                 )
+                refresh_record_names(cursor, record_id)
                 action = "updated"
             else:
                 record_id = insert_search_record_civil_papers_one_time(cursor, record)
@@ -3,6 +3,7 @@ from datetime import datetime
 
 from db_connect import get_conn
 from ingest import insert_search_record_active_warrants
+from name_index import refresh_record_names
 
 
 CSV_PATH = "active_warrants.csv"
@@ -84,6 +85,7 @@ def update_active_warrant_if_present(cursor, record_id, record):
         record.get("address") or "",
         record_id
     )
+    refresh_record_names(cursor, record_id)
 
 
 # ------------------------------------------------------------
@@ -4,6 +4,7 @@ import re
 import pandas as pd
 import pyodbc
 from azure.storage.blob import BlobServiceClient
+from name_index import delete_names_where, delete_records_names, refresh_names_where
 
 print("=== START ingest_doc_csv.py ===")
 
@@ -97,6 +98,7 @@ def ingest_one_doc_csv(blob_name):
  
 
     # ✅ Snapshot reset: keep ONLY today's jail list
+    delete_names_where(cursor, "department = ?", DEPARTMENT_NAME)
     cursor.execute("""
         DELETE FROM search.records
         WHERE department = ?
@@ -151,10 +153,12 @@ def ingest_one_doc_csv(blob_name):
 
         inserted += 1
 
+    indexed = refresh_names_where(cursor, "department = ?", DEPARTMENT_NAME)
     conn.commit()
     conn.close()
 
     print("Inserted rows:", inserted)
+    print("Indexed names for rows:", indexed)
 
 # ============================
 # DEDUPE: KEEP NEWEST PER SID
@@ -180,8 +184,10 @@ def dedupe_doc():
             WHERE department = ?
         )
         DELETE FROM ranked
+        OUTPUT deleted.record_id
         WHERE rn > 1;
     """, DEPARTMENT_NAME)
+    delete_records_names(cursor, [row[0] for row in cursor.fetchall()])
 
     conn.commit()
     conn.close()
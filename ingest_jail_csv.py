@@ -3,6 +3,7 @@ import re
 import pandas as pd
 import pyodbc
 from azure.storage.blob import BlobServiceClient
+from name_index import delete_names_where, delete_records_names, refresh_names_where
 
 # =========================
 # CONFIG
@@ -84,6 +85,7 @@ def ingest_one_jail_csv(blob_name):
     cursor = conn.cursor()
 
     # Snapshot reset: keep ONLY newest Baltimore jail population snapshot
+    delete_names_where(cursor, "department = ?", DEPARTMENT_NAME)
     cursor.execute("""
         DELETE FROM search.records
         WHERE department = ?
@@ -146,8 +148,11 @@ def ingest_one_jail_csv(blob_name):
     WHERE rn > 1;
     """, DEPARTMENT_NAME)
 
+    # Index names only for the rows the dedupe kept.
+    indexed = refresh_names_where(cursor, "department = ?", DEPARTMENT_NAME)
     conn.commit()
     print("Deduped: kept newest row per SID")
+    print("Indexed names for rows:", indexed)
 
     conn.close()
 
@@ -190,8 +195,10 @@ def dedupe_jail_population():
           AND sid IS NOT NULL
     )
     DELETE FROM ranked
+    OUTPUT deleted.record_id
     WHERE rn > 1;
     """, "Baltimore Jail Population")
+    delete_records_names(cursor, [row[0] for row in cursor.fetchall()])
 
     conn.commit()
     conn.close()
@@ -0,0 +1,277 @@
+"""Trigram and phonetic posting tables for sargable name search over search.records.
+
+Every name column that ``_build_filters_sql`` matches with ``LIKE '%tok%'`` is
+split into words and each word into lowercase trigrams. A record is a
+candidate for a token when it has postings for every trigram of that token,
+so the exact LIKE check only runs on those candidates.
+
+The same words also get NYSIIS keys in search.name_phonetic_keys, which the
+fuzzy name match joins on instead of trying spelling variants with LIKE.
+
+Every path that inserts or deletes search.records rows keeps both tables in
+step. Search only joins on them once ``backfill_name_trigrams`` has finished
+and recorded a row in search.name_index_backfills.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from phonetic import NYSIIS_KEY_LENGTH, phonetic_keys
+from schema_registry import invalidate_schema, table_exists
+
+
+NAME_INDEX_COLUMNS = (
+    "full_name",
+    "tenant_defendant_or_respondent",
+    "resp_name",
+    "petitioner_name",
+    "petitioner_or_plaintiff_name",
+)
+NAME_POSTING_TABLES = ("search.name_trigrams", "search.name_phonetic_keys")
+TRIGRAM_LENGTH = 3
+NAME_INDEX_BACKFILLED_TTL_SECONDS = int(os.environ.get("NAME_INDEX_BACKFILLED_TTL_SECONDS", "60"))
+
+_name_index_lock = threading.Lock()
+_name_index_ready = False
+_name_index_backfilled = None
+_name_index_backfilled_checked_at = 0.0
+
+
+def normalize_name_text(value):
+    return " ".join(str(value or "").lower().split())
+
+
+def token_trigrams(token):
+    text = normalize_name_text(token)
+    return sorted({text[i:i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)})
+
+
+def name_trigrams(names):
+    trigrams = set()
+    for name in names:
+        for word in normalize_name_text(name).split():
+            trigrams.update(token_trigrams(word))
+    return trigrams
+
+
+def name_phonetic_keys(names):
+    keys = set()
+    for name in names:
+        keys.update(phonetic_keys(name))
+    return keys
+
+
+def ensure_name_index_tables(cursor):
+    global _name_index_ready
+    if _name_index_ready:
+        return
+    with _name_index_lock:
+        if _name_index_ready:
+            return
+        cursor.execute("""
+            IF OBJECT_ID('search.name_trigrams', 'U') IS NULL
+            BEGIN
+                CREATE TABLE search.name_trigrams (
+                    trigram NVARCHAR(3) NOT NULL,
+                    record_id INT NOT NULL,
+                    CONSTRAINT PK_name_trigrams PRIMARY KEY (trigram, record_id)
+                )
+            END
+            IF NOT EXISTS (
+                SELECT 1 FROM sys.indexes
+                WHERE name = 'IX_name_trigrams_record'
+                  AND object_id = OBJECT_ID('search.name_trigrams')
+            )
+            CREATE INDEX IX_name_trigrams_record
+                ON search.name_trigrams(record_id)
+        """)
+        cursor.execute(f"""
+            IF OBJECT_ID('search.name_phonetic_keys', 'U') IS NULL
+            BEGIN
+                CREATE TABLE search.name_phonetic_keys (
+                    phonetic_key NVARCHAR({NYSIIS_KEY_LENGTH}) NOT NULL,
+                    record_id INT NOT NULL,
+                    CONSTRAINT PK_name_phonetic_keys PRIMARY KEY (phonetic_key, record_id)
+                )
+            END
+            IF NOT EXISTS (
+                SELECT 1 FROM sys.indexes
+                WHERE name = 'IX_name_phonetic_keys_record'
+                  AND object_id = OBJECT_ID('search.name_phonetic_keys')
+            )
+            CREATE INDEX IX_name_phonetic_keys_record
+                ON search.name_phonetic_keys(record_id)
+        """)
+        cursor.execute("""
+            IF OBJECT_ID('search.name_index_backfills', 'U') IS NULL
+            BEGIN
+                CREATE TABLE search.name_index_backfills (
+                    completed_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+                    records INT NOT NULL
+                )
+            END
+        """)
+        invalidate_schema()
+        _name_index_ready = True
+
+
+def _insert_postings(cursor, names_by_record):
+    trigram_rows = []
+    phonetic_rows = []
+    for record_id, names in names_by_record.items():
+        trigram_rows.extend((trigram, int(record_id)) for trigram in sorted(name_trigrams(names)))
+        phonetic_rows.extend((key, int(record_id)) for key in sorted(name_phonetic_keys(names)))
+    if trigram_rows:
+        cursor.executemany(
+            "INSERT INTO search.name_trigrams (trigram, record_id) VALUES (?, ?)",
+            trigram_rows,
+        )
+    if phonetic_rows:
+        cursor.executemany(
+            "INSERT INTO search.name_phonetic_keys (phonetic_key, record_id) VALUES (?, ?)",
+            phonetic_rows,
+        )
+
+
+def refresh_record_names(cursor, record_id):
+    """Rebuild the name postings of one search.records row after an insert or update."""
+    if not record_id:
+        return
+    ensure_name_index_tables(cursor)
+    cursor.execute(
+        f"SELECT {', '.join(NAME_INDEX_COLUMNS)} FROM search.records WHERE record_id = ?",
+        int(record_id),
+    )
+    row = cursor.fetchone()
+    delete_record_names(cursor, record_id)
+    if row is not None:
+        _insert_postings(cursor, {int(record_id): row})
+
+
+def delete_record_names(cursor, record_id):
+    ensure_name_index_tables(cursor)
+    for table_name in NAME_POSTING_TABLES:
+        cursor.execute(f"DELETE FROM {table_name} WHERE record_id = ?", int(record_id))
+
+
+def delete_records_names(cursor, record_ids):
+    """Drop the postings of several records, e.g. rows a dedupe is about to delete."""
+    rows = [(int(record_id),) for record_id in record_ids]
+    if not rows:
+        return
+    ensure_name_index_tables(cursor)
+    for table_name in NAME_POSTING_TABLES:
+        cursor.executemany(f"DELETE FROM {table_name} WHERE record_id = ?", rows)
+
+
+def delete_names_where(cursor, where_sql, *params):
+    """Drop the postings of the search.records rows matching ``where_sql``.
+
+    Call it right before ``DELETE FROM search.records WHERE <where_sql>``.
+    """
+    ensure_name_index_tables(cursor)
+    for table_name in NAME_POSTING_TABLES:
+        cursor.execute(
+            f"""
+            DELETE FROM {table_name}
+            WHERE record_id IN (SELECT record_id FROM search.records WHERE {where_sql})
+            """,
+            *params,
+        )
+
+
+def refresh_names_where(cursor, where_sql, *params, batch_size=2000):
+    """Rebuild the postings of the search.records rows matching ``where_sql`` in record_id batches.
+
+    Bulk loaders insert their rows first and index them here, instead of
+    three round trips per row through ``refresh_record_names``.
+    """
+    ensure_name_index_tables(cursor)
+    last_record_id = 0
+    indexed = 0
+    while True:
+        cursor.execute(
+            f"""
+            SELECT TOP ({int(batch_size)}) record_id, {', '.join(NAME_INDEX_COLUMNS)}
+            FROM search.records
+            WHERE record_id > ? AND ({where_sql})
+            ORDER BY record_id
+            """,
+            last_record_id,
+            *params,
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        delete_records_names(cursor, [row[0] for row in rows])
+        _insert_postings(cursor, {int(row[0]): row[1:] for row in rows})
+        last_record_id = int(rows[-1][0])
+        indexed += len(rows)
+    return indexed
+
+
+def name_index_backfilled(cur):
+    """True once ``backfill_name_trigrams`` has completed at least once.
+
+    Before that the posting tables hold only rows written since they were
+    created, so trigram and phonetic search would miss everyone else. A
+    positive answer is kept for the life of the process; a negative one for
+    ``NAME_INDEX_BACKFILLED_TTL_SECONDS``.
+    """
+    global _name_index_backfilled, _name_index_backfilled_checked_at
+    if _name_index_backfilled:
+        return True
+    if not table_exists(cur, "search.name_index_backfills"):
+        return False
+    if _name_index_backfilled is not None and time.monotonic() - _name_index_backfilled_checked_at < NAME_INDEX_BACKFILLED_TTL_SECONDS:
+        return False
+    cur.execute("SELECT CASE WHEN EXISTS (SELECT 1 FROM search.name_index_backfills) THEN 1 ELSE 0 END")
+    _name_index_backfilled = bool(cur.fetchone()[0])
+    _name_index_backfilled_checked_at = time.monotonic()
+    return _name_index_backfilled
+
+
+def reset_name_index_backfilled():
+    global _name_index_backfilled
+    _name_index_backfilled = None
+
+
+def backfill_name_trigrams(conn, batch_size=2000):
+    """Rebuild trigram and phonetic postings for every search.records row in record_id order."""
+    cursor = conn.cursor()
+    ensure_name_index_tables(cursor)
+    conn.commit()
+    last_record_id = 0
+    indexed = 0
+    while True:
+        cursor.execute(
+            f"""
+            SELECT TOP ({int(batch_size)}) record_id, {', '.join(NAME_INDEX_COLUMNS)}
+            FROM search.records
+            WHERE record_id > ?
+            ORDER BY record_id
+            """,
+            last_record_id,
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        batch_last_record_id = int(rows[-1][0])
+        for table_name in NAME_POSTING_TABLES:
+            cursor.execute(
+                f"DELETE FROM {table_name} WHERE record_id > ? AND record_id <= ?",
+                last_record_id,
+                batch_last_record_id,
+            )
+        _insert_postings(cursor, {int(row[0]): row[1:] for row in rows})
+        conn.commit()
+        last_record_id = batch_last_record_id
+        indexed += len(rows)
+        print(f"Indexed names for {indexed} records (through record_id={last_record_id})")
+    cursor.execute("INSERT INTO search.name_index_backfills (records) VALUES (?)", indexed)
+    conn.commit()
+    reset_name_index_backfilled()
+    return {"indexed": indexed}
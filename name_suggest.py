@@ -0,0 +1,277 @@
+"""In-memory word prefix index of names for the /suggest/names typeahead.
+
+Names are normalized the same way as name search (lowercase, single spaces)
+and stored compactly: one UTF-8 ``bytes`` blob with an ``array`` of offsets
+and an ``array`` of record counts. Every word of a name is a key ("john
+smith" is found by "jo" and by "smi"); keys are two more arrays (name id,
+byte offset of the word) sorted by the bytes from that word to the end of
+the name, so a lookup is a binary search plus a short scan.
+
+The index refreshes incrementally: each source is read in identity id
+order from the last id seen and only the new names are merged in. The
+watermark is the id alone because pyodbc truncates DATETIME2(7) created_at
+values to microseconds, so a created_at watermark matches its own row again.
+Updates and deletes do not move the watermark, so the whole index is
+rebuilt every ``NAME_SUGGEST_REBUILD_SECONDS``. Builds and refreshes run on
+a background thread, never inside a request.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from array import array
+from collections import Counter
+
+from name_index import NAME_INDEX_COLUMNS, normalize_name_text
+from schema_registry import table_exists
+
+
+NAME_SUGGEST_REFRESH_SECONDS = float(os.environ.get("NAME_SUGGEST_REFRESH_SECONDS", "30"))
+NAME_SUGGEST_REBUILD_SECONDS = float(os.environ.get("NAME_SUGGEST_REBUILD_SECONDS", "3600"))
+NAME_SUGGEST_MIN_PREFIX = 2
+NAME_SUGGEST_DEFAULT_LIMIT = 10
+NAME_SUGGEST_MAX_LIMIT = 50
+NAME_SUGGEST_BATCH_SIZE = 5000
+
+# source -> (table, id column, name columns, extra WHERE clause)
+NAME_SOURCES = {
+    "records": ("search.records", "record_id", NAME_INDEX_COLUMNS, None),
+    "returns": ("search.Returns", "mdec_return_id", ("respondent_name", "petitioner_name"), "is_active = 1"),
+}
+
+
+def row_names(values):
+    """Distinct normalized names of one row; a row counts once per name."""
+    return {name for name in (normalize_name_text(value) for value in values) if name}
+
+
+def word_starts(encoded):
+    """Byte offsets where each word of a normalized, UTF-8 encoded name starts."""
+    return [0] + [position + 1 for position, byte in enumerate(encoded) if byte == 0x20]
+
+
+class NameSnapshot:
+    """Immutable encoded names, counts and sorted word keys; see the module docstring."""
+
+    __slots__ = ("blob", "offsets", "counts", "key_names", "key_starts")
+
+    def __init__(self, blob=b"", offsets=None, counts=None, key_names=None, key_starts=None):
+        self.blob = blob
+        self.offsets = offsets if offsets is not None else array("I", [0])
+        self.counts = counts if counts is not None else array("I")
+        self.key_names = key_names if key_names is not None else array("I")
+        self.key_starts = key_starts if key_starts is not None else array("I")
+
+    def __len__(self):
+        return len(self.counts)
+
+    def name(self, name_id):
+        return self.blob[self.offsets[name_id]:self.offsets[name_id + 1]].decode("utf-8")
+
+    def key(self, position):
+        name_id = self.key_names[position]
+        return self.blob[self.offsets[name_id] + self.key_starts[position]:self.offsets[name_id + 1]]
+
+    def bisect(self, target, lo=0):
+        """First key position whose key is not less than ``target`` (bytes)."""
+        hi = len(self.key_names)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, encoded):
+        """Id of the name equal to ``encoded``, or None."""
+        position = self.bisect(encoded)
+        while position < len(self.key_names) and self.key(position) == encoded:
+            if self.key_starts[position] == 0:
+                return self.key_names[position]
+            position += 1
+        return None
+
+
+def build_snapshot(name_counts):
+    """``NameSnapshot`` of a ``{name: count}`` mapping."""
+    return merge_names(NameSnapshot(), name_counts)
+
+
+def merge_names(snapshot, additions):
+    """New ``NameSnapshot`` with ``additions`` (``{name: count}``) merged in.
+
+    Existing names keep their ids and gain counts; new names are appended
+    and their word keys merged into the sorted key arrays with slice copies.
+    """
+    counts = array("I", snapshot.counts)
+    blob_parts = [snapshot.blob]
+    offsets = array("I", snapshot.offsets)
+    new_keys = []
+    for name, count in additions.items():
+        encoded = name.encode("utf-8")
+        name_id = snapshot.find(encoded)
+        if name_id is not None:
+            counts[name_id] += count
+            continue
+        name_id = len(counts)
+        counts.append(count)
+        blob_parts.append(encoded)
+        offsets.append(offsets[-1] + len(encoded))
+        new_keys.extend((encoded[start:], name_id, start) for start in word_starts(encoded))
+    if not new_keys:
+        return NameSnapshot(snapshot.blob, snapshot.offsets, counts, snapshot.key_names, snapshot.key_starts)
+
+    new_keys.sort()
+    key_names = array("I")
+    key_starts = array("I")
+    previous = 0
+    for key, name_id, start in new_keys:
+        position = snapshot.bisect(key, previous)
+        key_names.extend(snapshot.key_names[previous:position])
+        key_starts.extend(snapshot.key_starts[previous:position])
+        key_names.append(name_id)
+        key_starts.append(start)
+        previous = position
+    key_names.extend(snapshot.key_names[previous:])
+    key_starts.extend(snapshot.key_starts[previous:])
+    return NameSnapshot(b"".join(blob_parts), offsets, counts, key_names, key_starts)
+
+
+def fetch_new_names(cursor, source, watermark=None, batch_size=NAME_SUGGEST_BATCH_SIZE):
+    """Count names in rows of ``source`` after ``watermark``.
+
+    Returns ``(Counter, watermark)`` where the watermark is the identity id
+    of the last row read.
+    """
+    table_name, id_column, name_columns, extra_where = NAME_SOURCES[source]
+    additions = Counter()
+    while True:
+        clauses = []
+        params = []
+        if watermark is not None:
+            clauses.append(f"{id_column} > ?")
+            params.append(watermark)
+        if extra_where:
+            clauses.append(extra_where)
+        where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor.execute(
+            f"""
+            SELECT TOP ({int(batch_size)}) {id_column}, {', '.join(name_columns)}
+            FROM {table_name}
+            {where_sql}
+            ORDER BY {id_column}
+            """,
+            params,
+        )
+        rows = cursor.fetchall()
+        for row in rows:
+            additions.update(row_names(row[1:]))
+        if rows:
+            watermark = int(rows[-1][0])
+        if len(rows) < batch_size:
+            return additions, watermark
+
+
+class NamePrefixIndex:
+    def __init__(self, refresh_seconds=NAME_SUGGEST_REFRESH_SECONDS, rebuild_seconds=NAME_SUGGEST_REBUILD_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._refresh_lock = threading.Lock()
+        # Swapped as one reference so readers never lock.
+        self._snapshot = NameSnapshot()
+        self._watermarks = {}
+        self.built_at = None
+        self.refreshed_at = None
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    @property
+    def ready(self):
+        return self.built_at is not None
+
+    def suggest(self, prefix, limit=NAME_SUGGEST_DEFAULT_LIMIT):
+        """Up to ``limit`` names with a word starting with ``prefix``, in key order."""
+        key = normalize_name_text(prefix).encode("utf-8")
+        if not key:
+            return []
+        snapshot = self._snapshot
+        seen = set()
+        suggestions = []
+        position = snapshot.bisect(key)
+        while position < len(snapshot.key_names) and len(suggestions) < limit:
+            if not snapshot.key(position).startswith(key):
+                break
+            name_id = snapshot.key_names[position]
+            if name_id not in seen:
+                seen.add(name_id)
+                suggestions.append({"name": snapshot.name(name_id), "count": snapshot.counts[name_id]})
+            position += 1
+        return suggestions
+
+    def refresh(self, conn, full=False):
+        """Merge rows added since the last refresh, or rebuild when ``full`` or due."""
+        with self._refresh_lock:
+            return self._refresh(conn, full)
+
+    def _refresh(self, conn, full):
+        now = time.time()
+        full = full or self.built_at is None or now - self.built_at >= self.rebuild_seconds
+        watermarks = {} if full else dict(self._watermarks)
+        additions = Counter()
+        cursor = conn.cursor()
+        for source, (table_name, _, _, _) in NAME_SOURCES.items():
+            if not table_exists(cursor, table_name):
+                continue
+            source_additions, watermarks[source] = fetch_new_names(cursor, source, watermarks.get(source))
+            additions.update(source_additions)
+
+        if full:
+            snapshot = build_snapshot(additions)
+        elif additions:
+            snapshot = merge_names(self._snapshot, additions)
+        else:
+            snapshot = self._snapshot
+        self._snapshot = snapshot
+        self._watermarks = watermarks
+        if full:
+            self.built_at = now
+        self.refreshed_at = now
+        return {"full": full, "names": len(snapshot), "added": len(additions)}
+
+    def refresh_in_background(self, connect):
+        """Start a refresh (the first build, when not ready) on its own connection unless one is running."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                conn = connect()
+                try:
+                    self._refresh(conn, False)
+                finally:
+                    conn.close()
+            except Exception as exc:
+                # Keep serving the current snapshot; retry after the next interval.
+                self.refreshed_at = time.time()
+                print(f"Name suggest refresh failed: {exc}")
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=run, name="name-suggest-refresh", daemon=True).start()
+        return True
+
+    def ensure_fresh(self, connect):
+        """Start the first build or a due refresh in the background; never blocks the caller."""
+        if self.refreshed_at is None or time.time() - self.refreshed_at >= self.refresh_seconds:
+            self.refresh_in_background(connect)
+
+
+_default_index = NamePrefixIndex()
+
+
+def get_name_suggest_index():
+    return _default_index
@@ -8,12 +8,51 @@ import threading
 from datetime import date, datetime
 from html.parser import HTMLParser
 
+from row_format import RowFormatter, format_date, format_datetime_seconds, format_eastern_datetime
+from schema_registry import has_column, has_columns, invalidate_schema, table_exists
+from search_cache import RETURNS_SCOPE, bump_scopes
+from search_sql import (
+    CASE_NUMBER_MATCH_CONTAINS,
+    case_number_norm_sql,
+    decode_page_cursor,
+    encode_page_cursor,
+    normalize_case_number,
+)
+
 
 RETURN_STATUS_VALUES = ("Signed", "Uploaded", "Hard Copy Returned", "Hold", "Pending")
 MANUAL_RETURN_STATUSES = {"Uploaded", "Hard Copy Returned", "Hold", "Pending"}
 _schema_lock = threading.Lock()
 _schema_ready = False
 
+RETURN_SEARCH_FORMATTER = RowFormatter({
+    "submitted_at": (("submitted_at", format_datetime_seconds),),
+    "date_issued": (("date_issued", format_date),),
+    "attempt_date": (("attempt_date", format_date),),
+    "prior_attempt_date": (("prior_attempt_date", format_date),),
+    "date_signed": (("date_signed", format_date),),
+    "date_received": (("date_received", format_date),),
+    "intake_date": (("intake_date", format_date),),
+    "court_issue_date": (("court_issue_date", format_date),),
+    "updated_at": (("updated_at", format_eastern_datetime),),
+    "page_created_at": (("page_created_at", format_date),),
+})
+
+RETURNS_SECTION = "Returns"
+
+# Persisted computed columns, so every write path keeps them current. Rows
+# with no date sort last under a fixed floor instead of NULL, which keeps
+# the keyset seek on sort_date exact.
+RETURN_SEARCH_TEXT_SQL = (
+    "CAST(LOWER(CONCAT(COALESCE(case_number, ''), ' ', COALESCE(respondent_name, ''), ' ', "
+    "COALESCE(petitioner_name, ''), ' ', COALESCE(member_reporting, ''))) AS NVARCHAR(1700))"
+)
+RETURN_SORT_DATE_SQL = (
+    "COALESCE(attempt_date, date_signed, CAST(submitted_at AS date), intake_date, court_issue_date, "
+    "CONVERT(date, '19000101', 112))"
+)
+RETURN_SEARCH_COLUMNS = ("search_text", "sort_date")
+
 
 RETURN_FIELDS = (
     "cognito_entry_number",
@@ -269,6 +308,7 @@ def ensure_returns_tables(conn):
         if _schema_ready:
             return
         _ensure_returns_tables(conn)
+        invalidate_schema()
         _schema_ready = True
 
 
@@ -402,6 +442,43 @@ def _ensure_returns_tables(conn):
             f"ALTER TABLE search.Returns ADD [{column}] {definition}"
         )
 
+    cur.execute(
+        "IF COL_LENGTH('search.Returns', 'case_number_norm') IS NULL "
+        f"ALTER TABLE search.Returns ADD case_number_norm AS {case_number_norm_sql()} PERSISTED"
+    )
+    cur.execute(
+        """
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'IX_Returns_case_number_norm'
+              AND object_id = OBJECT_ID('search.Returns')
+        )
+        CREATE INDEX IX_Returns_case_number_norm
+            ON search.Returns(case_number_norm)
+        """
+    )
+
+    cur.execute(
+        "IF COL_LENGTH('search.Returns', 'search_text') IS NULL "
+        f"ALTER TABLE search.Returns ADD search_text AS {RETURN_SEARCH_TEXT_SQL} PERSISTED"
+    )
+    cur.execute(
+        "IF COL_LENGTH('search.Returns', 'sort_date') IS NULL "
+        f"ALTER TABLE search.Returns ADD sort_date AS {RETURN_SORT_DATE_SQL} PERSISTED"
+    )
+    cur.execute(
+        """
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'IX_Returns_queue'
+              AND object_id = OBJECT_ID('search.Returns')
+        )
+        CREATE INDEX IX_Returns_queue
+            ON search.Returns(is_active, bcso_status, sort_date DESC, mdec_return_id DESC)
+            INCLUDE (search_text)
+        """
+    )
+
     cur.execute(
         "UPDATE search.Returns SET bcso_status = 'Uploaded' WHERE bcso_status = 'Uploaded to MDEC'"
     )
@@ -460,6 +537,16 @@ def log_return_activity(cur, return_id, activity_type, summary, actor_email, old
     )
 
 
+# Dedupe keeps its original case-number key ('-' and ' ' stripped, '/' kept),
+# so returns that differ only by '/' stay separate; case_number_norm, which
+# also strips '/', only narrows the seek.
+RETURN_DEDUPE_CASE_NUMBER_SQL = """
+case_number_norm = ?
+AND UPPER(REPLACE(REPLACE(COALESCE(case_number, ''), '-', ''), ' ', '')) =
+    UPPER(REPLACE(REPLACE(?, '-', ''), ' ', ''))
+""".strip()
+
+
 def _find_existing_return(cur, payload):
     entry_number = clean_value(payload.get("cognito_entry_number"))
     if entry_number:
@@ -494,16 +581,15 @@ def _find_existing_return(cur, payload):
     case_number = clean_value(payload.get("case_number"))
     if original_filename and case_number:
         cur.execute(
-            """
+            f"""
             SELECT TOP 1 mdec_return_id, bcso_status
             FROM search.Returns
             WHERE LOWER(LTRIM(RTRIM(COALESCE(original_filename, '')))) =
                   LOWER(LTRIM(RTRIM(?)))
-              AND UPPER(REPLACE(REPLACE(COALESCE(case_number, ''), '-', ''), ' ', '')) =
-                  UPPER(REPLACE(REPLACE(?, '-', ''), ' ', ''))
+              AND {RETURN_DEDUPE_CASE_NUMBER_SQL}
             ORDER BY updated_at DESC, mdec_return_id DESC
             """,
-            original_filename, case_number,
+            original_filename, normalize_case_number(case_number), case_number,
         )
         row = cur.fetchone()
         if row:
@@ -513,16 +599,15 @@ def _find_existing_return(cur, payload):
     attempt_date = clean_value(payload.get("attempt_date"))
     if case_number:
         cur.execute(
-            """
+            f"""
             SELECT TOP 1 mdec_return_id, bcso_status
             FROM search.Returns
-            WHERE UPPER(REPLACE(REPLACE(COALESCE(case_number, ''), '-', ''), ' ', '')) =
-                  UPPER(REPLACE(REPLACE(?, '-', ''), ' ', ''))
+            WHERE {RETURN_DEDUPE_CASE_NUMBER_SQL}
               AND LOWER(LTRIM(RTRIM(COALESCE(respondent_name, '')))) = LOWER(LTRIM(RTRIM(COALESCE(?, ''))))
               AND (CAST(attempt_date AS date) = CAST(? AS date) OR (attempt_date IS NULL AND ? IS NULL))
             ORDER BY updated_at DESC, mdec_return_id DESC
             """,
-            case_number, respondent or "", attempt_date, attempt_date,
+            normalize_case_number(case_number), case_number, respondent or "", attempt_date, attempt_date,
         )
         row = cur.fetchone()
         if row:
@@ -585,6 +670,7 @@ def upsert_return(conn, payload, actor_email="system:cognito-email"):
         if normalized.get("blob_name"):
             log_return_activity(cur, return_id, "pdf_updated", "Return PDF received and stored.", actor_email)
         conn.commit()
+        bump_scopes(RETURNS_SCOPE)
         return return_id, False
 
     fields = []
@@ -622,6 +708,7 @@ def upsert_return(conn, payload, actor_email="system:cognito-email"):
     if normalized.get("blob_name"):
         log_return_activity(cur, return_id, "pdf_stored", "Return PDF received and stored.", actor_email)
     conn.commit()
+    bump_scopes(RETURNS_SCOPE)
     return return_id, True
 
 
@@ -630,46 +717,78 @@ def _format_rows(cursor):
     return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
 
-def search_returns(conn, filters, exclude_uploaded=False):
-    ensure_returns_tables(conn)
+def has_return_search_columns(cur):
+    return has_columns(cur, "search.Returns", RETURN_SEARCH_COLUMNS)
+
+
+def next_returns_cursor(rows, page_size):
+    """Cursor for the Returns page after ``rows``, or None when the listing is exhausted."""
+    if not page_size or len(rows) < page_size:
+        return None
+    last = rows[-1]
+    return encode_page_cursor(RETURNS_SECTION, last["page_created_at"], last["mdec_return_id"])
+
+
+def search_returns(conn, filters, exclude_uploaded=False, page_size=None, cursor=None):
+    """Return ``(total, rows)`` for active returns matching ``filters``.
+
+    With ``page_size`` only one page is read, in ``(sort_date, mdec_return_id)``
+    order from ``cursor``; ``total`` counts every match on the first page and
+    is None after it. Rows carry ``page_created_at`` for ``next_returns_cursor``.
+    """
+    cur = conn.cursor()
+    if not table_exists(cur, "search.Returns"):
+        return (None if cursor else 0), []
+    persisted = has_return_search_columns(cur)
+    search_text_sql = "search_text" if persisted else RETURN_SEARCH_TEXT_SQL
+    sort_date_sql = "sort_date" if persisted else RETURN_SORT_DATE_SQL
     clauses = ["is_active = 1"]
     params = []
     if exclude_uploaded:
-        clauses.append("COALESCE(bcso_status, '') <> 'Uploaded'")
+        clauses.append("(bcso_status <> 'Uploaded' OR bcso_status IS NULL)")
     query = clean_value(filters.get("query"))
     if query:
-        clauses.append(
-            "LOWER(CONCAT(COALESCE(case_number, ''), ' ', COALESCE(respondent_name, ''), ' ', "
-            "COALESCE(petitioner_name, ''), ' ', COALESCE(member_reporting, ''))) LIKE ?"
-        )
+        clauses.append(f"{search_text_sql} LIKE ?")
         params.append(f"%{query.lower()}%")
     case_number = clean_value(filters.get("case_number"))
     if case_number:
-        clauses.append("LOWER(COALESCE(case_number, '')) LIKE ?")
-        params.append(f"%{case_number.lower()}%")
+        case_column = "case_number_norm" if has_column(cur, "search.Returns", "case_number_norm") else case_number_norm_sql()
+        clauses.append(f"{case_column} LIKE ?")
+        if filters.get("case_number_match") == CASE_NUMBER_MATCH_CONTAINS:
+            params.append(f"%{normalize_case_number(case_number)}%")
+        else:
+            params.append(f"{normalize_case_number(case_number)}%")
     date_start = clean_value(filters.get("date_start"))
     date_end = clean_value(filters.get("date_end"))
     if date_start and date_end:
-        clauses.append(
-            "CAST(COALESCE(attempt_date, date_signed, submitted_at, intake_date, court_issue_date) AS date) BETWEEN CAST(? AS date) AND CAST(? AS date)"
-        )
+        clauses.append(f"{sort_date_sql} BETWEEN CAST(? AS date) AND CAST(? AS date)")
         params.extend([date_start, date_end])
     elif clean_value(filters.get("last_x_days")):
+        clauses.append(f"{sort_date_sql} >= DATEADD(day, -?, CAST(GETDATE() AS date))")
+        params.append(int(filters["last_x_days"]))
+
+    top_sql = ""
+    total_sql = "CAST(NULL AS INT) AS total_count"
+    if page_size:
+        top_sql = f"TOP ({int(page_size)})"
+        if not cursor:
+            total_sql = "COUNT(*) OVER () AS total_count"
+    if cursor:
+        _, sort_date, return_id = decode_page_cursor(cursor)
         clauses.append(
-            "CAST(COALESCE(attempt_date, date_signed, submitted_at, intake_date, court_issue_date) AS date) >= DATEADD(day, -?, CAST(GETDATE() AS date))"
+            f"({sort_date_sql} < CAST(? AS date) OR ({sort_date_sql} = CAST(? AS date) AND mdec_return_id < ?))"
         )
-        params.append(int(filters["last_x_days"]))
+        params.extend([sort_date, sort_date, return_id])
 
-    cur = conn.cursor()
     cur.execute(
         f"""
-        SELECT
+        SELECT {top_sql}
             mdec_return_id,
             cognito_entry_number,
             case_number,
-            FORMAT(submitted_at, 'yyyy-MM-ddTHH:mm:ss') AS submitted_at,
+            submitted_at,
             document_type,
-            FORMAT(date_issued, 'yyyy-MM-dd') AS date_issued,
+            date_issued,
             type_of_rfs,
             type_of_child_support,
             child_support_show_cause_type,
@@ -677,10 +796,10 @@ def search_returns(conn, filters, exclude_uploaded=False):
             respondent_name,
             service_address,
             service_unit,
-            FORMAT(attempt_date, 'yyyy-MM-dd') AS attempt_date,
+            attempt_date,
             service_disposition,
             method_of_service,
-            FORMAT(prior_attempt_date, 'yyyy-MM-dd') AS prior_attempt_date,
+            prior_attempt_date,
             prior_attempt_location,
             adult_served_name,
             relationship_to_respondent,
@@ -694,29 +813,34 @@ def search_returns(conn, filters, exclude_uploaded=False):
             method_to_confirm_id_age,
             signature_value,
             signature_status,
-            FORMAT(date_signed, 'yyyy-MM-dd') AS date_signed,
+            date_signed,
             member_reporting,
             return_sequence,
-            FORMAT(date_received, 'yyyy-MM-dd') AS date_received,
-            FORMAT(intake_date, 'yyyy-MM-dd') AS intake_date,
-            FORMAT(court_issue_date, 'yyyy-MM-dd') AS court_issue_date,
+            date_received,
+            intake_date,
+            court_issue_date,
             court,
             bcso_status,
             reason_for_hold,
             mdec_status,
             CASE WHEN blob_name IS NULL OR LTRIM(RTRIM(blob_name)) = '' THEN 0 ELSE 1 END AS has_pdf,
-            FORMAT(updated_at AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time', 'yyyy-MM-dd h:mm tt') AS updated_at
+            updated_at,
+            {sort_date_sql} AS page_created_at,
+            {total_sql}
         FROM search.Returns
         WHERE {' AND '.join(clauses)}
-        ORDER BY COALESCE(attempt_date, date_signed, CAST(submitted_at AS date), intake_date, court_issue_date) DESC,
-                 mdec_return_id DESC
+        ORDER BY {sort_date_sql} DESC, mdec_return_id DESC
         """,
         *params,
     )
-    rows = _format_rows(cur)
+    rows = RETURN_SEARCH_FORMATTER.format_rows(cur)
+    total = None if cursor else 0
     for row in rows:
         row["hard_copy_required"] = is_hard_copy_return(row)
-    return rows
+        count = row.pop("total_count", None)
+        if total is not None:
+            total = count if count is not None else len(rows)
+    return total, rows
 
 
 def get_return(conn, return_id):
@@ -796,4 +920,5 @@ def update_return_status(conn, return_id, status, actor_email, reason_for_hold=N
         summary += f" Reason: {clean_value(reason_for_hold)}"
     log_return_activity(cur, return_id, "status_changed", summary, actor_email, old_status, status)
     conn.commit()
+    bump_scopes(RETURNS_SCOPE)
     return True
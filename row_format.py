@@ -0,0 +1,94 @@
+"""Python-side formatting of native date/datetime columns in search results.
+
+The search queries used to call T-SQL ``FORMAT()`` (CLR-backed and slow) for
+every date variant of every row. They now select each column once as a native
+value and a ``RowFormatter`` expands it into the same strings the UI expects:
+``yyyy-MM-dd``, ``yyyy-MM-ddTHH:mm(:ss)``, ``MM-dd-yyyy hh:mm tt`` and the
+Eastern ``yyyy-MM-dd h:mm tt`` stamps.
+"""
+
+from __future__ import annotations
+
+from datetime import timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+
+EASTERN = ZoneInfo("America/New_York")
+
+
+def _meridiem(value):
+    return "AM" if value.hour < 12 else "PM"
+
+
+@lru_cache(maxsize=4096)
+def format_date(value):
+    """FORMAT(value, 'yyyy-MM-dd')"""
+    return f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+
+
+@lru_cache(maxsize=4096)
+def format_datetime_seconds(value):
+    """FORMAT(value, 'yyyy-MM-ddTHH:mm:ss')"""
+    return f"{format_date(value)}T{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
+
+
+@lru_cache(maxsize=4096)
+def format_datetime_minutes(value):
+    """FORMAT(value, 'yyyy-MM-ddTHH:mm')"""
+    return f"{format_date(value)}T{value.hour:02d}:{value.minute:02d}"
+
+
+@lru_cache(maxsize=4096)
+def format_us_datetime(value):
+    """FORMAT(value, 'MM-dd-yyyy hh:mm tt')"""
+    return (
+        f"{value.month:02d}-{value.day:02d}-{value.year:04d} "
+        f"{value.hour % 12 or 12:02d}:{value.minute:02d} {_meridiem(value)}"
+    )
+
+
+@lru_cache(maxsize=4096)
+def format_eastern_datetime(value):
+    """FORMAT(value AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time', 'yyyy-MM-dd h:mm tt')"""
+    value = value.replace(tzinfo=timezone.utc).astimezone(EASTERN)
+    return f"{format_date(value)} {value.hour % 12 or 12}:{value.minute:02d} {_meridiem(value)}"
+
+
+class RowFormatter:
+    """Turn cursor rows into dicts, expanding native values per ``formats``.
+
+    ``formats`` maps a selected column to ``(output_key, formatter)`` pairs;
+    a ``None`` formatter copies the value unchanged. Columns not listed pass
+    through as-is. The per-column plan is built once per result shape.
+    """
+
+    def __init__(self, formats):
+        self.formats = formats
+        self._plans = {}
+
+    def _plan(self, columns):
+        plan = self._plans.get(columns)
+        if plan is None:
+            plan = tuple(
+                (index, self.formats.get(name, ((name, None),)))
+                for index, name in enumerate(columns)
+            )
+            self._plans[columns] = plan
+        return plan
+
+    def format_rows(self, cursor):
+        plan = self._plan(tuple(column[0] for column in cursor.description))
+        rows = []
+        for row in cursor.fetchall():
+            item = {}
+            for index, outputs in plan:
+                value = row[index]
+                for key, formatter in outputs:
+                    # Strings come from legacy NVARCHAR columns and are already formatted.
+                    if formatter is None or value is None or isinstance(value, str):
+                        item[key] = value
+                    else:
+                        item[key] = formatter(value)
+            rows.append(item)
+        return rows
@@ -0,0 +1,89 @@
+"""Process-wide cache of which tables and columns exist in the search schema.
+
+Search and ingest code used to run COL_LENGTH / INFORMATION_SCHEMA probes on
+every request. The registry probes the tracked tables once per worker, keeps
+the result for ``SCHEMA_REGISTRY_TTL_SECONDS`` and is invalidated by the DDL
+helpers that add columns or tables.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+
+TRACKED_TABLES = (
+    "search.records",
+    "search.dv_pdf_records",
+    "search.Returns",
+    "search.civil_return_pdfs",
+    "search.name_phonetic_keys",
+    "search.name_index_backfills",
+    "dbo.esri_events",
+)
+SCHEMA_REGISTRY_TTL_SECONDS = int(os.environ.get("SCHEMA_REGISTRY_TTL_SECONDS", "600"))
+
+_registry_lock = threading.Lock()
+_columns_by_table = None
+_loaded_at = 0.0
+
+
+def _table_key(table_name):
+    name = str(table_name or "").strip().lower()
+    if "." not in name:
+        name = f"search.{name}"
+    return name
+
+
+def _probe(cur):
+    placeholders = ", ".join("?" for _ in TRACKED_TABLES)
+    cur.execute(
+        f"""
+        SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE CONCAT(TABLE_SCHEMA, '.', TABLE_NAME) IN ({placeholders})
+        """,
+        TRACKED_TABLES,
+    )
+    columns_by_table = {}
+    for schema_name, table_name, column_name in cur.fetchall():
+        key = _table_key(f"{schema_name}.{table_name}")
+        columns_by_table.setdefault(key, set()).add(str(column_name).strip().lower())
+    return columns_by_table
+
+
+def _snapshot(cur):
+    global _columns_by_table, _loaded_at
+    columns_by_table = _columns_by_table
+    if columns_by_table is not None and time.monotonic() - _loaded_at < SCHEMA_REGISTRY_TTL_SECONDS:
+        return columns_by_table
+    with _registry_lock:
+        if _columns_by_table is None or time.monotonic() - _loaded_at >= SCHEMA_REGISTRY_TTL_SECONDS:
+            _columns_by_table = _probe(cur)
+            _loaded_at = time.monotonic()
+        return _columns_by_table
+
+
+def invalidate_schema():
+    """Forget cached columns; the next lookup re-probes the database."""
+    global _columns_by_table
+    with _registry_lock:
+        _columns_by_table = None
+
+
+def table_columns(cur, table_name):
+    return frozenset(_snapshot(cur).get(_table_key(table_name), ()))
+
+
+def table_exists(cur, table_name):
+    return _table_key(table_name) in _snapshot(cur)
+
+
+def has_column(cur, table_name, column_name):
+    return str(column_name or "").strip().lower() in table_columns(cur, table_name)
+
+
+def has_columns(cur, table_name, column_names):
+    available = table_columns(cur, table_name)
+    return all(str(column).strip().lower() in available for column in column_names)
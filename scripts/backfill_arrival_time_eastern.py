@@ -0,0 +1,44 @@
+"""Add the dbo.esri_events search columns and backfill arrival_time_eastern.
+
+event_number_display is a persisted computed column, so SQL Server fills it
+for existing rows when it is added. arrival_time_eastern is maintained by a
+trigger on insert and update; this script computes it for the rows already
+in the table, and for rows written by loaders that skip triggers (bulk
+insert without FIRE_TRIGGERS), so re-run it after such loads. Daily Logs
+search keeps using the inline expression while any event is still missing
+arrival_time_eastern. Only missing rows are updated, so re-runs are cheap.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from daily_logs import ESRI_EVENT_BACKFILL_BATCH_SIZE, backfill_arrival_time_eastern, ensure_esri_event_search_columns
+from db_connect import get_conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=ESRI_EVENT_BACKFILL_BATCH_SIZE)
+    args = parser.parse_args()
+
+    conn = get_conn()
+    try:
+        cursor = conn.cursor()
+        ensure_esri_event_search_columns(cursor)
+        conn.commit()
+        updated = backfill_arrival_time_eastern(conn, batch_size=args.batch_size)
+        cursor.execute("""
+            SELECT COUNT(*), COUNT(arrival_time_eastern)
+            FROM dbo.esri_events
+        """)
+        total, converted = cursor.fetchone()
+        print(f"Updated {updated} rows; arrival_time_eastern set for {converted} of {total} events")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
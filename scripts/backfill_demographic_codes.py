@@ -0,0 +1,47 @@
+"""Add and populate the search.records sex_code, race_code and issuing_county_code columns.
+
+The columns are persisted CASE expressions generated from the aliases in
+demographic_codes.py, so SQL Server fills them for every existing row when
+they are added and keeps them current afterwards. Run with --rebuild after
+changing the aliases to drop and re-add the columns and their indexes.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db_connect import get_conn
+from demographic_codes import ensure_records_code_columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rebuild", action="store_true", help="drop and re-add the code columns")
+    args = parser.parse_args()
+
+    conn = get_conn()
+    try:
+        cursor = conn.cursor()
+        ensure_records_code_columns(cursor, rebuild=args.rebuild)
+        conn.commit()
+        cursor.execute("""
+            SELECT
+                COUNT(*),
+                SUM(CASE WHEN NULLIF(LTRIM(RTRIM(sex)), '') IS NOT NULL AND sex_code IS NULL THEN 1 ELSE 0 END),
+                SUM(CASE WHEN NULLIF(LTRIM(RTRIM(race)), '') IS NOT NULL AND race_code IS NULL THEN 1 ELSE 0 END),
+                SUM(CASE WHEN NULLIF(LTRIM(RTRIM(issuing_county)), '') IS NOT NULL AND issuing_county_code IS NULL THEN 1 ELSE 0 END)
+            FROM search.records
+        """)
+        total, sex_unmapped, race_unmapped, county_unmapped = cursor.fetchone()
+        print(
+            f"{total} records; values with no code: sex {sex_unmapped or 0}, "
+            f"race {race_unmapped or 0}, issuing_county {county_unmapped or 0}"
+        )
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Rebuild search.name_trigrams and search.name_phonetic_keys from every row in search.records.
+
+Trigram (SEARCH_NAME_MATCH=trigram) and fuzzy=1 name search stay on LIKE
+until this has completed once; ingest keeps the postings current after that.
+Run it again whenever the posting tables need to be rebuilt.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db_connect import get_conn
+from name_index import backfill_name_trigrams
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    conn = get_conn()
+    try:
+        print(backfill_name_trigrams(conn, batch_size=args.batch_size))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Add and populate the persisted search.records.record_date column.
+
+SQL Server computes record_date for every existing row when the column is
+added, and keeps it current on every insert and update afterwards. Run this
+once (or apply sql/add_record_date.sql) before deploying the record_date
+filters to a table that ingest has not touched since.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db_connect import get_conn
+from ingest import ensure_records_record_date_column
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__).parse_args()
+
+    conn = get_conn()
+    try:
+        cursor = conn.cursor()
+        ensure_records_record_date_column(cursor)
+        conn.commit()
+        cursor.execute("""
+            SELECT COUNT(*), COUNT(record_date)
+            FROM search.records
+        """)
+        total, dated = cursor.fetchone()
+        print(f"record_date populated for {dated} of {total} records")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
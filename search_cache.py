@@ -0,0 +1,211 @@
+"""Cache of serialized /search_all responses, invalidated by write generations.
+
+Entries live in an in-process LRU and, when ``SEARCH_CACHE_DIR`` is set, in a
+disk tier shared by every worker on the host. Each entry remembers the
+generation of every scope (a records department or another search source) it
+was built from. Write paths bump those generations, so an entry whose
+snapshot no longer matches is never served. Writers outside this app (web
+jobs, the ESRI event feed) are only covered by ``SEARCH_CACHE_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+RECORDS_SCOPE = "records"
+ALL_RECORD_DEPARTMENTS_SCOPE = "records:*"
+DAILY_LOGS_SCOPE = "daily logs"
+RETURNS_SCOPE = "returns"
+DV_PDF_SCOPE = "dv pdf"
+
+SEARCH_CACHE_DIR = os.environ.get("SEARCH_CACHE_DIR") or None
+# Without SEARCH_CACHE_DIR, generations live in one worker's memory and a
+# write handled by another gunicorn worker would never reach them, so the
+# cache stays off unless it is shared or SEARCH_CACHE_SIZE is set explicitly
+# (single-worker deployments).
+SEARCH_CACHE_SIZE = int(os.environ.get("SEARCH_CACHE_SIZE", "256" if SEARCH_CACHE_DIR else "0"))
+SEARCH_CACHE_TTL_SECONDS = float(os.environ.get("SEARCH_CACHE_TTL_SECONDS", "300"))
+DISK_PRUNE_EVERY_PUTS = 100
+
+
+# Search labels that do not name the stored department. "Active Warrants" is
+# BCSO_ACTIVE_WARRANTS rows from AllActiveWarrants_0.csv (see
+# DEPARTMENT_LABEL_SQL) as well as the "Active Warrants" department, so both
+# share the scope the BCSO writers bump.
+DEPARTMENT_SCOPE_ALIASES = {
+    "active warrants": "bcso active warrants",
+}
+
+
+def record_department_scope(department):
+    text = " ".join(str(department or "").strip().lower().replace("_", " ").split())
+    return f"{RECORDS_SCOPE}:{DEPARTMENT_SCOPE_ALIASES.get(text, text)}"
+
+
+def search_cache_key(parts):
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class SearchCache:
+    def __init__(self, max_entries=SEARCH_CACHE_SIZE, ttl_seconds=SEARCH_CACHE_TTL_SECONDS, disk_dir=SEARCH_CACHE_DIR):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._bump_counter = itertools.count(1)
+        self._puts = 0
+        if disk_dir:
+            os.makedirs(os.path.join(disk_dir, "generations"), exist_ok=True)
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def _generation_path(self, scope):
+        digest = hashlib.sha1(scope.encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, "generations", digest)
+
+    def _entry_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _generation(self, scope):
+        if self.disk_dir:
+            try:
+                with open(self._generation_path(scope), "r", encoding="utf-8") as f:
+                    return f.read().strip() or "0"
+            except FileNotFoundError:
+                return "0"
+        with self._lock:
+            return self._generations.get(scope, "0")
+
+    def generations(self, scopes):
+        return {scope: self._generation(scope) for scope in scopes}
+
+    def bump(self, *scopes):
+        """Invalidate every entry built from any of ``scopes``."""
+        for scope in scopes:
+            # A fresh token instead of read-increment-write, so concurrent
+            # bumps from several workers can never land on the same value.
+            token = f"{time.time_ns()}.{os.getpid()}.{next(self._bump_counter)}"
+            with self._lock:
+                self._generations[scope] = token
+            if self.disk_dir:
+                _write_atomic(self._generation_path(scope), token)
+
+    def _fresh(self, entry, scopes):
+        stored_at, generations, _ = entry
+        if time.time() - stored_at > self.ttl_seconds:
+            return False
+        return generations == self.generations(scopes)
+
+    def get(self, key, scopes):
+        """Return the cached body for ``key`` if none of ``scopes`` changed since it was stored."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self.disk_dir:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            return None
+        if not self._fresh(entry, scopes):
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        return entry[2]
+
+    def put(self, key, generations, body):
+        """Store ``body`` with the generation snapshot taken before it was built."""
+        if not self.enabled:
+            return
+        entry = (time.time(), dict(generations), body)
+        self._remember(key, entry)
+        if self.disk_dir:
+            _write_atomic(
+                self._entry_path(key),
+                json.dumps({"stored_at": entry[0], "generations": entry[1], "body": body.decode("utf-8")}),
+            )
+            self._puts += 1
+            if self._puts % DISK_PRUNE_EVERY_PUTS == 0:
+                self._prune_disk()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read_disk(self, key):
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            return payload["stored_at"], payload["generations"], payload["body"].encode("utf-8")
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _prune_disk(self):
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.disk_dir):
+            path = os.path.join(self.disk_dir, name)
+            if not name.endswith(".json"):
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
+
+
+_default_cache = SearchCache()
+
+
+def get_search_cache():
+    return _default_cache
+
+
+def bump_scopes(*scopes):
+    _default_cache.bump(*scopes)
+
+
+def bump_records(*departments):
+    """Invalidate record searches; with no departments, every department page too."""
+    department_scopes = [record_department_scope(d) for d in departments if d]
+    if not department_scopes:
+        department_scopes = [ALL_RECORD_DEPARTMENTS_SCOPE]
+    _default_cache.bump(RECORDS_SCOPE, *department_scopes)
+
+
+def bump_all():
+    _default_cache.bump(
+        RECORDS_SCOPE,
+        ALL_RECORD_DEPARTMENTS_SCOPE,
+        DAILY_LOGS_SCOPE,
+        RETURNS_SCOPE,
+        DV_PDF_SCOPE,
+    )
@@ -0,0 +1,70 @@
+"""Run the independent /search_all sources concurrently under one deadline.
+
+Each source is a zero-argument callable that opens (and closes) its own
+database connection. A source that misses the deadline or raises is reported
+in the per-source status map instead of failing the whole search; its worker
+thread finishes in the background and releases its connection on its own.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import as_completed
+
+
+SEARCH_SOURCE_OK = "ok"
+SEARCH_SOURCE_TIMEOUT = "timeout"
+SEARCH_SOURCE_ERROR = "error"
+
+
+def _timed(source):
+    started = time.monotonic()
+    value = source()
+    return value, int((time.monotonic() - started) * 1000)
+
+
+def _outcome(name, future):
+    try:
+        value, elapsed_ms = future.result()
+    except Exception as exc:
+        print(f"WARN search source {name} failed: {exc}")
+        return None, {"status": SEARCH_SOURCE_ERROR, "error": str(exc)}
+    return value, {"status": SEARCH_SOURCE_OK, "elapsed_ms": elapsed_ms}
+
+
+def iter_search_sources(executor, sources, deadline_seconds):
+    """Yield ``(name, value, status)`` for each source in completion order.
+
+    Sources still running at the deadline are yielded last with a timeout
+    status and a ``None`` value.
+    """
+    futures = {executor.submit(_timed, source): name for name, source in sources.items()}
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=deadline_seconds):
+            pending.discard(future)
+            name = futures[future]
+            value, status = _outcome(name, future)
+            yield name, value, status
+    except FuturesTimeoutError:
+        pass
+    for future in pending:
+        future.cancel()
+        yield futures[future], None, {"status": SEARCH_SOURCE_TIMEOUT}
+
+
+def run_search_sources(executor, sources, deadline_seconds):
+    """Run ``{name: callable}`` on ``executor``; return ``(results, statuses)``.
+
+    ``results`` only holds the sources that finished in time without raising.
+    ``statuses`` has one ``{"status": ...}`` entry per source, with
+    ``elapsed_ms`` for completed sources and ``error`` for failed ones.
+    """
+    results = {}
+    statuses = {}
+    for name, value, status in iter_search_sources(executor, sources, deadline_seconds):
+        statuses[name] = status
+        if status["status"] == SEARCH_SOURCE_OK:
+            results[name] = value
+    return results, statuses
@@ -1,5 +1,246 @@
+import base64
+import json
+from datetime import datetime
 from typing import List, Optional, Tuple
 
+from demographic_codes import code_for, has_code_columns
+from name_index import name_index_backfilled, token_trigrams
+from phonetic import nysiis, phonetic_words
+from row_format import (
+    RowFormatter,
+    format_date,
+    format_datetime_minutes,
+    format_datetime_seconds,
+    format_us_datetime,
+)
+from schema_registry import has_column
+from search_timing import profile_phase
+
+
+DEPARTMENT_LABEL_SQL = """
+CASE
+    WHEN source_file = 'AllActiveWarrants_0.csv'
+        THEN 'Active Warrants'
+    WHEN department = 'BCSO_ACTIVE_WARRANTS'
+        THEN 'BCSO Active Warrants'
+    ELSE department
+END
+""".strip()
+
+KEYSET_ORDER_BY = "created_at DESC, record_id DESC"
+# The cursor carries created_at as full-precision text (CONVERT style 126,
+# selected as page_created_at): pyodbc truncates DATETIME2(7) to microseconds,
+# which would skip or repeat rows sharing a microsecond at a page boundary.
+KEYSET_SEEK_SQL = """
+(
+    created_at < CAST(? AS datetime2)
+    OR (created_at = CAST(? AS datetime2) AND record_id < ?)
+)
+""".strip()
+
+
+def _date_time_variants(column):
+    return (
+        (column, format_date),
+        (f"{column}_iso", format_datetime_minutes),
+        (f"{column}_display", format_us_datetime),
+    )
+
+
+SEARCH_RECORD_FORMATTER = RowFormatter({
+    "date_of_birth": (("date_of_birth", format_date),),
+    "created_at": (("created_at", format_datetime_seconds),),
+    "issue_date": (("issue_date", format_date),),
+    "intake_date": (("intake_date", format_date),),
+    "date_time_attempted": _date_time_variants("date_time_attempted"),
+    "date_time_served": _date_time_variants("date_time_served"),
+    "prior_attempt_date": (("prior_attempt_date", format_date),),
+    "date_received": (("date_received", format_date),),
+    "record_date": (("record_date", format_date),),
+})
+
+
+NAME_MATCH_LIKE = "like"
+NAME_MATCH_TRIGRAM = "trigram"
+NAME_MATCH_PHONETIC = "phonetic"
+
+CASE_NUMBER_MATCH_PREFIX = "prefix"
+CASE_NUMBER_MATCH_CONTAINS = "contains"
+CASE_NUMBER_STRIP_CHARS = ("/", " ", "-")
+
+# IN-lists and name tokens are bound as one JSON array parameter and unpacked
+# with OPENJSON, so the SQL text (and its cached plan) does not change with the
+# number of values and long lists never approach the 2100-parameter limit.
+OPENJSON_VALUES_SQL = "SELECT value FROM OPENJSON(?)"
+
+# Every token must match at least one name column. CASE keeps NULL names
+# counting as a miss, as the per-token OR of LIKEs did.
+NAME_TOKENS_MATCH_SQL = """
+NOT EXISTS (
+    SELECT 1
+    FROM OPENJSON(?) AS name_token
+    WHERE CASE WHEN (
+        full_name LIKE CONCAT('%', name_token.value, '%')
+        OR tenant_defendant_or_respondent LIKE CONCAT('%', name_token.value, '%')
+        OR resp_name LIKE CONCAT('%', name_token.value, '%')
+        OR petitioner_name LIKE CONCAT('%', name_token.value, '%')
+        OR petitioner_or_plaintiff_name LIKE CONCAT('%', name_token.value, '%')
+    ) THEN 1 ELSE 0 END = 0
+)
+""".strip()
+
+# Candidate records must hold every (token, trigram) pair in their postings;
+# the count parameter is the number of pairs in the JSON array.
+NAME_TRIGRAMS_MATCH_SQL = """
+record_id IN (
+    SELECT nt.record_id
+    FROM OPENJSON(?) WITH (token INT '$.k', trigram NVARCHAR(3) '$.g') AS wanted
+    JOIN search.name_trigrams AS nt ON nt.trigram = wanted.trigram
+    GROUP BY nt.record_id
+    HAVING COUNT(DISTINCT CONCAT(wanted.token, ':', wanted.trigram)) = ?
+)
+""".strip()
+
+# Fuzzy name match: every query word's NYSIIS key must be among the record's
+# phonetic postings. The count parameter is the number of distinct keys.
+NAME_PHONETIC_MATCH_SQL = """
+record_id IN (
+    SELECT pk.record_id
+    FROM OPENJSON(?) AS wanted
+    JOIN search.name_phonetic_keys AS pk ON pk.phonetic_key = wanted.value
+    GROUP BY pk.record_id
+    HAVING COUNT(DISTINCT pk.phonetic_key) = ?
+)
+""".strip()
+
+ADMIN_STATUS_SQL = """
+LTRIM(RTRIM(
+    CASE
+        WHEN department = 'BCSO_ACTIVE_WARRANTS'
+            THEN COALESCE(warrant_status, '')
+        WHEN LOWER(LTRIM(RTRIM(COALESCE(department, '')))) = 'civil papers'
+            THEN COALESCE(administrative_status, disposition, service_disp, '')
+    END
+))
+""".strip()
+
+ADMIN_STATUS_MATCH_SQL = f"LOWER({ADMIN_STATUS_SQL}) IN ({OPENJSON_VALUES_SQL})"
+
+# /search_facets histograms: facet name -> grouped expression. Blank values
+# group as NULL.
+FACET_SQL = {
+    "department": DEPARTMENT_LABEL_SQL,
+    "sex": "NULLIF(LTRIM(RTRIM(sex)), '')",
+    "race": "NULLIF(LTRIM(RTRIM(race)), '')",
+    "issuing_county": "NULLIF(LTRIM(RTRIM(issuing_county)), '')",
+    "court_document_type": "NULLIF(LTRIM(RTRIM(court_document_type)), '')",
+    "admin_status": f"NULLIF({ADMIN_STATUS_SQL}, '')",
+}
+
+# Facet -> the _build_filters_sql argument that filters on it.
+FACET_FILTER_ARGS = {
+    "sex": "sex",
+    "race": "race",
+    "issuing_county": "issuing_county",
+    "court_document_type": "court_doc_types",
+    "admin_status": "admin_status_values",
+}
+
+
+def json_list_param(values):
+    """Bind ``values`` as the single NVARCHAR parameter read by ``OPENJSON(?)``."""
+    return json.dumps(list(values), ensure_ascii=False, separators=(",", ":"))
+
+
+def _normalized_values(values):
+    normalized = []
+    seen = set()
+    for value in values or []:
+        text = str(value or "").strip().lower()
+        if not text or text in seen:
+            continue
+        seen.add(text)
+        normalized.append(text)
+    return normalized
+
+
+def case_number_norm_sql(column="case_number"):
+    """Expression behind the persisted case_number_norm columns."""
+    return (
+        f"CAST(UPPER(REPLACE(REPLACE(REPLACE({column}, '/', ''), ' ', ''), '-', '')) "
+        "AS NVARCHAR(150))"
+    )
+
+
+RECORD_DATE_SOURCE_COLUMNS = (
+    "issue_date",
+    "court_issued_date",
+    "intake_date",
+    "date_time_served",
+    "date_time_attempted",
+    "prior_attempt_date",
+    "date_received",
+)
+
+
+def record_date_sql():
+    """Expression behind the persisted search.records.record_date column."""
+    return f"CAST(COALESCE({', '.join(RECORD_DATE_SOURCE_COLUMNS)}) AS DATE)"
+
+
+def has_record_date_column(cur):
+    return has_column(cur, "search.records", "record_date")
+
+
+def normalize_case_number(value):
+    """Python twin of ``case_number_norm_sql`` for lookup parameters."""
+    text = str(value or "")
+    for ch in CASE_NUMBER_STRIP_CHARS:
+        text = text.replace(ch, "")
+    return text.upper()
+
+
+def resolve_case_number_match(cur, case_number_match=CASE_NUMBER_MATCH_PREFIX):
+    """Requested case-number mode, or None while search.records lacks case_number_norm."""
+    if not has_column(cur, "search.records", "case_number_norm"):
+        return None
+    if case_number_match == CASE_NUMBER_MATCH_CONTAINS:
+        return CASE_NUMBER_MATCH_CONTAINS
+    return CASE_NUMBER_MATCH_PREFIX
+
+
+def resolve_name_match(cur, name_match=NAME_MATCH_LIKE):
+    """Requested name mode, or LIKE until the name postings have been backfilled."""
+    if name_match in (NAME_MATCH_TRIGRAM, NAME_MATCH_PHONETIC) and not name_index_backfilled(cur):
+        return NAME_MATCH_LIKE
+    return name_match
+
+
+def encode_page_cursor(department, created_at, record_id):
+    """Build the opaque cursor that resumes a department listing after one row."""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    payload = {"d": department, "c": created_at, "r": int(record_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(cursor):
+    """Return (department, created_at, record_id) or raise ValueError."""
+    text = str(cursor or "").strip()
+    if not text:
+        raise ValueError("cursor is empty")
+    try:
+        raw = base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+        department = str(payload["d"])
+        created_at = str(payload["c"])
+        record_id = int(payload["r"])
+        datetime.fromisoformat(created_at)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("cursor is invalid") from exc
+    return department, created_at, record_id
+
 
 def _build_filters_sql(
     name_query: str,
@@ -14,45 +255,74 @@ def _build_filters_sql(
     sid: Optional[str] = None,
     court_doc_types: Optional[List[str]] = None,
     admin_status_values: Optional[List[str]] = None,
+    name_match: str = NAME_MATCH_LIKE,
+    case_number_match: Optional[str] = None,
+    record_date_column: bool = False,
+    code_columns: bool = False,
 ) -> Tuple[str, List[object]]:
     name_tokens = [t for t in (name_query or "").strip().split() if t]
     where_clauses = ["1=1"]
     params: List[object] = []
 
-    for token in name_tokens:
-        where_clauses.append(
-            """
-            (
-                full_name LIKE ?
-                OR tenant_defendant_or_respondent LIKE ?
-                OR resp_name LIKE ?
-                OR petitioner_name LIKE ?
-                OR petitioner_or_plaintiff_name LIKE ?
-            )
-            """.strip()
-        )
-        like_token = f"%{token}%"
-        params.extend([like_token, like_token, like_token, like_token, like_token])
+    if name_tokens and name_match == NAME_MATCH_PHONETIC:
+        phonetic_query_keys = sorted({nysiis(word) for word in phonetic_words(name_query)})
+        if phonetic_query_keys:
+            where_clauses.append(NAME_PHONETIC_MATCH_SQL)
+            params.append(json_list_param(phonetic_query_keys))
+            params.append(len(phonetic_query_keys))
+        # Tokens without letters, such as numbers, have no key and stay on LIKE.
+        literal_tokens = [token for token in name_tokens if not phonetic_words(token)]
+        if literal_tokens:
+            where_clauses.append(NAME_TOKENS_MATCH_SQL)
+            params.append(json_list_param(literal_tokens))
+    elif name_tokens:
+        if name_match == NAME_MATCH_TRIGRAM:
+            # Narrow to records whose name postings contain every trigram of
+            # every token; the LIKE check below then only confirms candidates.
+            trigram_pairs = [
+                {"k": index, "g": trigram}
+                for index, token in enumerate(name_tokens)
+                for trigram in token_trigrams(token)
+            ]
+            if trigram_pairs:
+                where_clauses.append(NAME_TRIGRAMS_MATCH_SQL)
+                params.append(json_list_param(trigram_pairs))
+                params.append(len(trigram_pairs))
+        where_clauses.append(NAME_TOKENS_MATCH_SQL)
+        params.append(json_list_param(name_tokens))
 
     if case_number:
-        normalized_case_number = "".join(
-            ch for ch in str(case_number) if ch not in {"/", " ", "-"}
-        )
-        where_clauses.append(
-            "REPLACE(REPLACE(REPLACE(case_number, '/', ''), ' ', ''), '-', '') LIKE ?"
-        )
-        params.append(f"%{normalized_case_number}%")
+        if case_number_match == CASE_NUMBER_MATCH_PREFIX:
+            # Seek on IX_records_case_number_norm instead of scanning every row.
+            where_clauses.append("case_number_norm LIKE ?")
+            params.append(f"{normalize_case_number(case_number)}%")
+        elif case_number_match == CASE_NUMBER_MATCH_CONTAINS:
+            where_clauses.append("case_number_norm LIKE ?")
+            params.append(f"%{normalize_case_number(case_number)}%")
+        else:
+            normalized_case_number = "".join(
+                ch for ch in str(case_number) if ch not in CASE_NUMBER_STRIP_CHARS
+            )
+            where_clauses.append(
+                "REPLACE(REPLACE(REPLACE(case_number, '/', ''), ' ', ''), '-', '') LIKE ?"
+            )
+            params.append(f"%{normalized_case_number}%")
+
+    # With the persisted column the date filters seek on
+    # IX_records_record_date_department instead of computing a COALESCE per row.
+    record_date_expr = "record_date" if record_date_column else "COALESCE(issue_date, intake_date)"
 
     if date_start and date_end:
-        where_clauses.append(
-            """
-            COALESCE(issue_date, intake_date)
-                BETWEEN CAST(? AS date) AND CAST(? AS date)
-            """.strip()
-        )
+        where_clauses.append(f"{record_date_expr} BETWEEN CAST(? AS date) AND CAST(? AS date)")
         params.extend([date_start, date_end])
 
-    if sex:
+    # Known spellings become integer equality on the indexed *_code columns;
+    # anything else keeps the text comparison below.
+    sex_code = code_for("sex_code", sex) if sex and code_columns else None
+    if sex_code is not None:
+        where_clauses.append("sex_code = ?")
+        params.append(sex_code)
+    elif sex:
         normalized_sex = sex.strip().lower()
         if normalized_sex == "male":
             where_clauses.append("LOWER(sex) IN (?, ?)")
@@ -65,31 +335,43 @@ def _build_filters_sql(
             params.append(normalized_sex)
 
     if last_x_days:
-        where_clauses.append(
-            """
-            (
-                issue_date IS NOT NULL
-                OR intake_date IS NOT NULL
+        if not record_date_column:
+            where_clauses.append(
+                """
+                (
+                    issue_date IS NOT NULL
+                    OR intake_date IS NOT NULL
+                )
+                """.strip()
             )
-            """.strip()
-        )
         where_clauses.append(
-            "COALESCE(issue_date, intake_date) >= DATEADD(day, -?, CAST(GETDATE() AS date))"
+            f"{record_date_expr} >= DATEADD(day, -?, CAST(GETDATE() AS date))"
         )
         params.append(int(last_x_days))
 
-    if race:
+    race_code = code_for("race_code", race) if race and code_columns else None
+    if race_code is not None:
+        where_clauses.append("race_code = ?")
+        params.append(race_code)
+    elif race:
         where_clauses.append("LOWER(race) = ?")
         params.append(race.lower())
 
-    if issuing_county:
-        where_clauses.append(
-            """
+    county_like_sql = """
             issuing_county IS NOT NULL
             AND LTRIM(RTRIM(issuing_county)) != ''
             AND LOWER(issuing_county) LIKE ?
             """.strip()
+    county_code = code_for("issuing_county_code", issuing_county) if issuing_county and code_columns else None
+    if county_code is not None:
+        # Stored spellings without an alias have no code; keep matching them
+        # the way the text filter did.
+        where_clauses.append(
+            f"(issuing_county_code = ? OR (issuing_county_code IS NULL AND {county_like_sql}))"
         )
+        params.extend([county_code, f"%{issuing_county.lower()}%"])
+    elif issuing_county:
+        where_clauses.append(county_like_sql)
         params.append(f"%{issuing_county.lower()}%")
 
     if sid:
@@ -100,50 +382,17 @@ def _build_filters_sql(
         where_clauses.append("date_of_birth = CAST(? AS date)")
         params.append(dob)
 
-    if admin_status_values:
-        normalized_admin_statuses = []
-        seen_admin_statuses = set()
-        for value in admin_status_values:
-            text = str(value or "").strip().lower()
-            if not text or text in seen_admin_statuses:
-                continue
-            seen_admin_statuses.add(text)
-            normalized_admin_statuses.append(text)
-        if normalized_admin_statuses:
-            placeholders = ", ".join("?" for _ in normalized_admin_statuses)
-            where_clauses.append(
-                f"""
-                (
-                    (
-                        department = 'BCSO_ACTIVE_WARRANTS'
-                        AND LOWER(LTRIM(RTRIM(COALESCE(warrant_status, '')))) IN ({placeholders})
-                    )
-                    OR
-                    (
-                        LOWER(LTRIM(RTRIM(COALESCE(department, '')))) = 'civil papers'
-                        AND LOWER(LTRIM(RTRIM(COALESCE(administrative_status, disposition, service_disp, '')))) IN ({placeholders})
-                    )
-                )
-                """.strip()
-            )
-            params.extend(normalized_admin_statuses)
-            params.extend(normalized_admin_statuses)
-
-    if court_doc_types:
-        normalized_values = []
-        seen = set()
-        for value in court_doc_types:
-            text = str(value or "").strip().lower()
-            if not text or text in seen:
-                continue
-            seen.add(text)
-            normalized_values.append(text)
-        if normalized_values:
-            placeholders = ", ".join("?" for _ in normalized_values)
-            where_clauses.append(
-                f"LOWER(LTRIM(RTRIM(court_document_type))) IN ({placeholders})"
-            )
-            params.extend(normalized_values)
+    normalized_admin_statuses = _normalized_values(admin_status_values)
+    if normalized_admin_statuses:
+        where_clauses.append(ADMIN_STATUS_MATCH_SQL)
+        params.append(json_list_param(normalized_admin_statuses))
+
+    normalized_doc_types = _normalized_values(court_doc_types)
+    if normalized_doc_types:
+        where_clauses.append(
+            f"LOWER(LTRIM(RTRIM(court_document_type))) IN ({OPENJSON_VALUES_SQL})"
+        )
+        params.append(json_list_param(normalized_doc_types))
 
     return "\n    AND ".join(where_clauses), params
 
@@ -165,7 +414,18 @@ def build_search_sql(
     admin_status_values: Optional[List[str]] = None,
     order_by: str = "created_at DESC",
     extra_where: Optional[List[str]] = None,
+    extra_params: Optional[List[object]] = None,
+    page_size: Optional[int] = None,
+    after: Optional[Tuple[str, int]] = None,
+    name_match: str = NAME_MATCH_LIKE,
+    case_number_match: Optional[str] = None,
+    per_department: Optional[int] = None,
+    record_date_column: bool = False,
+    code_columns: bool = False,
 ) -> Tuple[str, List[object]]:
+    if per_department and (page_size or after):
+        raise ValueError("per_department cannot be combined with keyset paging")
+
     where_sql, params = _build_filters_sql(
         name_query=name_query,
         case_number=case_number,
@@ -179,10 +439,49 @@ def build_search_sql(
         sid=sid,
         court_doc_types=court_doc_types,
         admin_status_values=admin_status_values,
+        name_match=name_match,
+        case_number_match=case_number_match,
+        record_date_column=record_date_column,
+        code_columns=code_columns,
     )
 
     if extra_where:
         where_sql = "\n    AND ".join([where_sql] + [clause for clause in extra_where if clause])
+    if extra_params:
+        params.extend(extra_params)
+
+    paging_sql = ""
+    if page_size:
+        # Keyset paging: seek past the last (created_at, record_id) the client
+        # saw instead of re-reading and discarding the earlier pages.
+        order_by = KEYSET_ORDER_BY
+        if after:
+            created_at, record_id = after
+            where_sql = f"{where_sql}\n    AND {KEYSET_SEEK_SQL}"
+            params.extend([created_at, created_at, int(record_id)])
+        paging_sql = "OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY"
+        params.append(int(page_size))
+
+    if per_department:
+        # First N rows of every department plus its exact total, in one pass.
+        params.append(int(per_department))
+        return f"""
+    WITH matched AS (
+        SELECT
+            {select_sql},
+            ROW_NUMBER() OVER (
+                PARTITION BY {DEPARTMENT_LABEL_SQL}
+                ORDER BY {KEYSET_ORDER_BY}
+            ) AS department_row_number,
+            COUNT(*) OVER (PARTITION BY {DEPARTMENT_LABEL_SQL}) AS department_total
+        FROM {from_sql}
+        WHERE {where_sql}
+    )
+    SELECT *
+    FROM matched
+    WHERE department_row_number <= ?
+    ORDER BY department_row_number
+    """, params
 
     sql = f"""
     SELECT
@@ -190,26 +489,55 @@ def build_search_sql(
     FROM {from_sql}
     WHERE {where_sql}
     ORDER BY {order_by}
+    {paging_sql}
     """
     return sql, params
 
 
-def search_by_name(conn, name_query, case_number=None, dob=None, sex=None, race=None, date_start=None, date_end=None, issuing_county=None, last_x_days=None, sid=None, court_doc_types=None, admin_status_values=None, limit=100):
-    cursor = conn.cursor()
+def search_by_name(conn, name_query, case_number=None, dob=None, sex=None, race=None, date_start=None, date_end=None, issuing_county=None, last_x_days=None, sid=None, court_doc_types=None, admin_status_values=None, limit=100, page_size=None, cursor=None, department=None, name_match=NAME_MATCH_LIKE, case_number_match=CASE_NUMBER_MATCH_PREFIX, profile=None, per_department=None):
+    """Search search.records.
+
+    With ``page_size`` the query returns one keyset page ordered newest first;
+    ``cursor`` (from ``encode_page_cursor``) resumes after the last row of the
+    previous page and also pins the department it was issued for.
+    With ``per_department`` it instead returns the newest N rows of every
+    department, each carrying ``department_row_number`` and
+    ``department_total``; see ``group_rows_by_department``.
+    ``case_number_match`` is a prefix seek by default; pass
+    ``CASE_NUMBER_MATCH_CONTAINS`` for the slower substring match.
+    ``profile`` (a ``search_timing.SearchProfile``) records the execute and
+    fetch phases, the SQL shape and the row count.
+    """
+    after = None
+    if cursor:
+        department, created_at, record_id = decode_page_cursor(cursor)
+        after = (created_at, record_id)
+
+    extra_where = []
+    extra_params = []
+    if department:
+        extra_where.append(f"LOWER({DEPARTMENT_LABEL_SQL}) = LOWER(?)")
+        extra_params.append(department)
+
+    db_cursor = conn.cursor()
 
-    cursor.execute("SELECT COL_LENGTH('search.records', 'geocode_confidence')")
-    has_geocode_confidence = cursor.fetchone()[0] is not None
+    has_geocode_confidence = has_column(db_cursor, "search.records", "geocode_confidence")
     geocode_confidence_select = "geocode_confidence AS geocode_confidence" if has_geocode_confidence else "CAST(NULL AS FLOAT) AS geocode_confidence"
 
-    cursor.execute("SELECT COL_LENGTH('search.records', 'blob_name')")
-    has_blob_name = cursor.fetchone()[0] is not None
+    has_blob_name = has_column(db_cursor, "search.records", "blob_name")
     blob_name_select = "blob_name AS blob_name" if has_blob_name else "CAST(NULL AS NVARCHAR(512)) AS blob_name"
 
+    has_return_pdf_count = has_column(db_cursor, "search.records", "return_pdf_count")
+    return_pdf_count_select = "return_pdf_count" if has_return_pdf_count else "CAST(NULL AS INT) AS return_pdf_count"
+
+    record_date_column = has_record_date_column(db_cursor)
+    record_date_select = "record_date" if record_date_column else f"{record_date_sql()} AS record_date"
+
     select_sql = f"""
         record_id,
         COALESCE(full_name, tenant_defendant_or_respondent, resp_name) AS name,
         sid AS sid,
-        FORMAT(date_of_birth, 'yyyy-MM-dd') AS date_of_birth,
+        date_of_birth AS date_of_birth,
         facility AS facility,
         case_number AS case_number,
         COALESCE(address, tenant_defendant_or_respondent_address, doc_address, location_of_prior_attempt) AS address,
@@ -220,7 +548,8 @@ def search_by_name(conn, name_query, case_number=None, dob=None, sex=None, race=
         global_id,
         globalid,
         parent_document,
-        FORMAT(created_at, 'yyyy-MM-ddTHH:mm:ss') AS created_at,
+        created_at AS created_at,
+        CONVERT(VARCHAR(27), created_at, 126) AS page_created_at,
         COALESCE(served_by, serving_or_attempting_deputy, member_reporting, return_deputy) AS served_by,
         x AS x,
         y AS y,
@@ -229,17 +558,13 @@ def search_by_name(conn, name_query, case_number=None, dob=None, sex=None, race=
         COALESCE(notes, notes_from_attempt) AS notes,
         warrant_type AS warrant_type,
         court_document_type,
-        FORMAT(COALESCE(issue_date, court_issued_date), 'yyyy-MM-dd') AS issue_date,
-        FORMAT(intake_date, 'yyyy-MM-dd') AS intake_date,
-        FORMAT(date_time_attempted, 'yyyy-MM-dd') AS date_time_attempted,
-        FORMAT(date_time_attempted, 'yyyy-MM-ddTHH:mm') AS date_time_attempted_iso,
-        FORMAT(date_time_attempted, 'MM-dd-yyyy hh:mm tt') AS date_time_attempted_display,
-        FORMAT(date_time_served, 'yyyy-MM-dd') AS date_time_served,
-        FORMAT(date_time_served, 'yyyy-MM-ddTHH:mm') AS date_time_served_iso,
-        FORMAT(date_time_served, 'MM-dd-yyyy hh:mm tt') AS date_time_served_display,
-        FORMAT(prior_attempt_date, 'yyyy-MM-dd') AS prior_attempt_date,
-        FORMAT(date_received, 'yyyy-MM-dd') AS date_received,
-        FORMAT(COALESCE(issue_date, court_issued_date, intake_date, date_time_served, date_time_attempted, prior_attempt_date, date_received), 'yyyy-MM-dd') AS record_date,
+        COALESCE(issue_date, court_issued_date) AS issue_date,
+        intake_date AS intake_date,
+        date_time_attempted AS date_time_attempted,
+        date_time_served AS date_time_served,
+        prior_attempt_date AS prior_attempt_date,
+        date_received AS date_received,
+        {record_date_select},
         warrant_status AS warrant_status,
         COALESCE(disposition, administrative_status, service_disp) AS disposition,
         warrant_id_number,
@@ -248,13 +573,8 @@ def search_by_name(conn, name_query, case_number=None, dob=None, sex=None, race=
         issuing_county AS issuing_county,
         source_file,
         {blob_name_select},
-        CASE
-            WHEN source_file = 'AllActiveWarrants_0.csv'
-                THEN 'Active Warrants'
-            WHEN department = 'BCSO_ACTIVE_WARRANTS'
-                THEN 'BCSO Active Warrants'
-            ELSE department
-        END AS department
+        {return_pdf_count_select},
+        {DEPARTMENT_LABEL_SQL} AS department
     """
 
     sql, params = build_search_sql(
@@ -272,16 +592,159 @@ def search_by_name(conn, name_query, case_number=None, dob=None, sex=None, race=
         sid=sid,
         court_doc_types=court_doc_types,
         admin_status_values=admin_status_values,
+        extra_where=extra_where,
+        extra_params=extra_params,
+        page_size=page_size,
+        after=after,
+        name_match=resolve_name_match(db_cursor, name_match),
+        case_number_match=resolve_case_number_match(db_cursor, case_number_match),
+        per_department=per_department,
+        record_date_column=record_date_column,
+        code_columns=has_code_columns(db_cursor),
     )
 
-    cursor.execute(sql, params)
+    if profile is not None:
+        profile.add_sql("records", sql)
+    with profile_phase(profile, "records_sql"):
+        db_cursor.execute(sql, params)
 
-    columns = [col[0] for col in cursor.description]
-    rows = cursor.fetchall()
-    if limit:
+    with profile_phase(profile, "records_fetch"):
+        rows = SEARCH_RECORD_FORMATTER.format_rows(db_cursor)
+    if profile is not None:
+        profile.add_rows("records", len(rows))
+    if limit and not (page_size or per_department):
         rows = rows[:limit]
 
-    return [dict(zip(columns, row)) for row in rows]
+    return rows
+
+
+def group_rows_by_department(rows):
+    """Split ``per_department`` rows into ``({department: total}, {department: rows})``.
+
+    Department labels are title-cased the way the UI tabs are keyed; partitions
+    that only differ by case are merged.
+    """
+    department_counts = {}
+    department_rows = {}
+    for row in rows:
+        dept = str(row["department"]).title()
+        total = row.pop("department_total")
+        if row.pop("department_row_number") == 1:
+            department_counts[dept] = department_counts.get(dept, 0) + int(total)
+        department_rows.setdefault(dept, []).append(row)
+    return department_counts, department_rows
+
+
+def build_facets_sql(**filters):
+    """One GROUPING SETS query counting matches per value of every ``FACET_SQL`` facet.
+
+    ``filters`` are the ``_build_filters_sql`` arguments. A facet's own filter
+    is left out of its histogram, so the counts show what each other option
+    would match; ``department`` and ``total`` apply every filter. Each row is
+    ``(facet, facet_value, row_count, <facet>_count...)`` with one extra count
+    per filtered facet, in ``FACET_FILTER_ARGS`` order.
+    """
+    facet_filters = {
+        facet: filters.pop(argument, None) for facet, argument in FACET_FILTER_ARGS.items()
+    }
+    where_sql, where_params = _build_filters_sql(**filters)
+
+    projections = [f"{expression} AS {facet}" for facet, expression in FACET_SQL.items()]
+    params: List[object] = []
+    match_flags = {}
+    for facet, value in facet_filters.items():
+        if not value:
+            continue
+        clause, clause_params = _build_filters_sql(
+            name_query="",
+            code_columns=filters.get("code_columns", False),
+            **{FACET_FILTER_ARGS[facet]: value},
+        )
+        projections.append(f"CASE WHEN ({clause}) THEN 1 ELSE 0 END AS {facet}_match")
+        params.extend(clause_params)
+        match_flags[facet] = f"{facet}_match"
+    params.extend(where_params)
+
+    def count_sql(excluded=None):
+        flags = [flag for facet, flag in match_flags.items() if facet != excluded]
+        return f"SUM({' * '.join(flags)})" if flags else "COUNT(*)"
+
+    counts = [f"{count_sql()} AS row_count"]
+    counts.extend(f"{count_sql(facet)} AS {facet}_count" for facet in match_flags)
+    projections_sql = ",\n        ".join(projections)
+    facet_names = "\n        ".join(f"WHEN GROUPING({facet}) = 0 THEN '{facet}'" for facet in FACET_SQL)
+    facet_values = "\n        ".join(
+        f"WHEN GROUPING({facet}) = 0 THEN CAST({facet} AS NVARCHAR(255))" for facet in FACET_SQL
+    )
+    grouping_sets = ", ".join(f"({facet})" for facet in FACET_SQL)
+    counts_sql = ",\n    ".join(counts)
+    sql = f"""
+WITH matched AS (
+    SELECT
+        {projections_sql}
+    FROM search.records
+    WHERE {where_sql}
+)
+SELECT
+    CASE
+        {facet_names}
+        ELSE 'total'
+    END AS facet,
+    CASE
+        {facet_values}
+    END AS facet_value,
+    {counts_sql}
+FROM matched
+GROUP BY GROUPING SETS ({grouping_sets}, ())
+"""
+    return sql, params, list(match_flags)
+
+
+def search_facets(conn, name_query, name_match=NAME_MATCH_LIKE, case_number_match=CASE_NUMBER_MATCH_PREFIX, profile=None, **filters):
+    """Count search.records matches per facet value without fetching rows.
+
+    Takes the ``search_by_name`` filters and returns
+    ``{"total": n, facet: {value: count}}`` (see ``build_facets_sql``).
+    Department labels are title-cased like ``group_rows_by_department``;
+    blank values are keyed ``""`` and values with no matches are left out.
+    """
+    db_cursor = conn.cursor()
+    sql, params, filtered_facets = build_facets_sql(
+        name_query=name_query,
+        name_match=resolve_name_match(db_cursor, name_match),
+        case_number_match=resolve_case_number_match(db_cursor, case_number_match),
+        record_date_column=has_record_date_column(db_cursor),
+        code_columns=has_code_columns(db_cursor),
+        **filters,
+    )
+    if profile is not None:
+        profile.add_sql("facets", sql)
+    with profile_phase(profile, "facets_sql"):
+        db_cursor.execute(sql, params)
+        rows = db_cursor.fetchall()
+
+    facets = {"total": 0, **{facet: {} for facet in FACET_SQL}}
+    for facet, value, row_count, *facet_counts in rows:
+        if facet == "total":
+            facets["total"] = int(row_count or 0)
+            continue
+        if facet in filtered_facets:
+            row_count = facet_counts[filtered_facets.index(facet)]
+        if not row_count:
+            continue
+        value = "" if value is None else str(value)
+        if facet == "department":
+            value = value.title()
+        facets[facet][value] = facets[facet].get(value, 0) + int(row_count)
+    return facets
+
+
+def next_page_cursor(rows, page_size, department):
+    """Cursor for the page after ``rows``, or None when the listing is exhausted."""
+    if not page_size or len(rows) < page_size:
+        return None
+    last = rows[-1]
+    return encode_page_cursor(department, last["page_created_at"], last["record_id"])
 
 
 print("🔥 USING CAST DATE VERSION 🔥")
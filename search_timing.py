@@ -0,0 +1,150 @@
+"""Per-request phase timings for /search_all.
+
+A ``SearchProfile`` collects wall-clock durations per named phase (SQL
+execution, fetch, PDF history enrichment, grouping, serialization, ...), the
+row count each source produced and a short hash of each SQL shape that ran.
+It is shared by the fan-out worker threads of one request, so updates are
+locked. The timings go out in a ``Server-Timing`` header, and searches slower
+than ``SLOW_SEARCH_THRESHOLD_MS`` are appended as one JSON line to a rotating
+slow-search log.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+
+SLOW_SEARCH_THRESHOLD_MS = float(os.environ.get("SLOW_SEARCH_THRESHOLD_MS", "2000"))
+SLOW_SEARCH_LOG_PATH = (
+    os.environ.get("SLOW_SEARCH_LOG_PATH")
+    or os.path.join(tempfile.gettempdir(), "slow_searches.log")
+)
+SLOW_SEARCH_LOG_MAX_BYTES = int(os.environ.get("SLOW_SEARCH_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+SLOW_SEARCH_LOG_BACKUPS = int(os.environ.get("SLOW_SEARCH_LOG_BACKUPS", "5"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def sql_shape_hash(sql):
+    """Short stable hash of ``sql`` with whitespace collapsed."""
+    text = _WHITESPACE.sub(" ", sql or "").strip()
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+class SearchProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.row_counts = {}
+        self.sql_shapes = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the block and add it to ``name`` (repeated phases accumulate)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, (time.perf_counter() - started) * 1000)
+
+    def add_phase(self, name, elapsed_ms):
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed_ms
+
+    def add_rows(self, name, count):
+        with self._lock:
+            self.row_counts[name] = self.row_counts.get(name, 0) + int(count)
+
+    def add_sql(self, name, sql):
+        shape = sql_shape_hash(sql)
+        with self._lock:
+            shapes = self.sql_shapes.setdefault(name, [])
+            if shape not in shapes:
+                shapes.append(shape)
+        return shape
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self):
+        """``Server-Timing`` header value: every phase so far plus ``total``."""
+        with self._lock:
+            phases = list(self.phases.items())
+        parts = [f"{name};dur={elapsed_ms:.1f}" for name, elapsed_ms in phases]
+        parts.append(f"total;dur={self.total_ms():.1f}")
+        return ", ".join(parts)
+
+    def summary(self):
+        with self._lock:
+            return {
+                "total_ms": round(self.total_ms(), 1),
+                "phases_ms": {name: round(value, 1) for name, value in self.phases.items()},
+                "row_counts": dict(self.row_counts),
+                "sql_shapes": {name: list(shapes) for name, shapes in self.sql_shapes.items()},
+            }
+
+
+def profile_phase(profile, name):
+    """``profile.phase(name)``, or a no-op when no profile is being collected."""
+    if profile is None:
+        return nullcontext()
+    return profile.phase(name)
+
+
+_slow_search_logger = None
+_slow_search_logger_lock = threading.Lock()
+
+
+def get_slow_search_logger(path=SLOW_SEARCH_LOG_PATH):
+    global _slow_search_logger
+    with _slow_search_logger_lock:
+        if _slow_search_logger is None:
+            logger = logging.getLogger("csvdb.slow_search")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=SLOW_SEARCH_LOG_MAX_BYTES,
+                backupCount=SLOW_SEARCH_LOG_BACKUPS,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            _slow_search_logger = logger
+        return _slow_search_logger
+
+
+def log_slow_search(profile, filters, threshold_ms=SLOW_SEARCH_THRESHOLD_MS, logger=None):
+    """Append the profile to the slow-search log when it ran past ``threshold_ms``.
+
+    Returns True when an entry was written. Logging failures are reported and
+    swallowed so they never fail the search itself.
+    """
+    summary = profile.summary()
+    if summary["total_ms"] < threshold_ms:
+        return False
+    entry = {
+        "logged_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "filters": filters,
+        **summary,
+    }
+    try:
+        (logger or get_slow_search_logger()).info(json.dumps(entry, default=str, sort_keys=True))
+    except Exception as exc:
+        print(f"WARN slow search log failed: {exc}")
+        return False
+    return True
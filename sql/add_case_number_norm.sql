@@ -0,0 +1,33 @@
+IF COL_LENGTH('search.records', 'case_number_norm') IS NULL
+BEGIN
+    ALTER TABLE search.records ADD case_number_norm AS
+        CAST(UPPER(REPLACE(REPLACE(REPLACE(case_number, '/', ''), ' ', ''), '-', '')) AS NVARCHAR(150)) PERSISTED;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_records_case_number_norm'
+      AND object_id = OBJECT_ID('search.records')
+)
+BEGIN
+    CREATE INDEX IX_records_case_number_norm ON search.records(case_number_norm);
+END
+GO
+
+IF COL_LENGTH('search.Returns', 'case_number_norm') IS NULL
+BEGIN
+    ALTER TABLE search.Returns ADD case_number_norm AS
+        CAST(UPPER(REPLACE(REPLACE(REPLACE(case_number, '/', ''), ' ', ''), '-', '')) AS NVARCHAR(150)) PERSISTED;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Returns_case_number_norm'
+      AND object_id = OBJECT_ID('search.Returns')
+)
+BEGIN
+    CREATE INDEX IX_Returns_case_number_norm ON search.Returns(case_number_norm);
+END
+GO
@@ -0,0 +1,36 @@
+IF COL_LENGTH('search.dv_pdf_records', 'case_number_norm') IS NULL
+BEGIN
+    ALTER TABLE search.dv_pdf_records ADD case_number_norm AS
+        CAST(UPPER(REPLACE(REPLACE(REPLACE(case_number, '/', ''), ' ', ''), '-', '')) AS NVARCHAR(150)) PERSISTED;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_dv_pdf_records_case_number_norm'
+      AND object_id = OBJECT_ID('search.dv_pdf_records')
+)
+BEGIN
+    CREATE INDEX IX_dv_pdf_records_case_number_norm ON search.dv_pdf_records(case_number_norm);
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_dv_pdf_records_issue_date'
+      AND object_id = OBJECT_ID('search.dv_pdf_records')
+)
+BEGIN
+    CREATE INDEX IX_dv_pdf_records_issue_date ON search.dv_pdf_records(issue_date);
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_dv_pdf_records_uploaded_at'
+      AND object_id = OBJECT_ID('search.dv_pdf_records')
+)
+BEGIN
+    CREATE INDEX IX_dv_pdf_records_uploaded_at ON search.dv_pdf_records(uploaded_at DESC, id DESC);
+END
+GO
@@ -0,0 +1,85 @@
+IF COL_LENGTH('dbo.esri_events', 'event_number_display') IS NULL
+BEGIN
+    ALTER TABLE dbo.esri_events ADD event_number_display AS
+        CAST(COALESCE(
+            NULLIF(LTRIM(RTRIM(event_number)), ''),
+            CASE
+                WHEN LOWER(COALESCE(activity_type, '')) LIKE '%peace%'
+                  OR LOWER(COALESCE(activity_type, '')) LIKE '%protective%'
+                THEN generated_event_number
+                ELSE NULL
+            END
+        ) AS NVARCHAR(100)) PERSISTED;
+END
+GO
+
+IF COL_LENGTH('dbo.esri_events', 'arrival_time_eastern') IS NULL
+BEGIN
+    ALTER TABLE dbo.esri_events ADD arrival_time_eastern DATETIME2 NULL;
+END
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_esri_events_arrival_time_eastern
+ON dbo.esri_events
+AFTER INSERT, UPDATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF NOT UPDATE(arrival_time)
+        RETURN;
+    UPDATE e
+    SET arrival_time_eastern = CAST(
+        DATEADD(SECOND, TRY_CONVERT(INT, TRY_CONVERT(BIGINT, e.arrival_time) / 1000), '1970-01-01')
+        AT TIME ZONE 'UTC'
+        AT TIME ZONE 'Eastern Standard Time'
+        AS DATETIME2
+    )
+    FROM dbo.esri_events AS e
+    JOIN inserted AS i ON i.id = e.id;
+END
+GO
+
+-- Backfill in id ranges; each UPDATE commits on its own so the log and
+-- locks stay bounded. Search keeps the inline expression until no event
+-- with a parseable arrival_time is missing arrival_time_eastern.
+DECLARE @batch_size INT = 5000;
+DECLARE @start_id INT;
+DECLARE @max_id INT;
+SELECT @start_id = MIN(id), @max_id = MAX(id) FROM dbo.esri_events;
+WHILE @start_id <= @max_id
+BEGIN
+    UPDATE e
+    SET arrival_time_eastern = CAST(
+        DATEADD(SECOND, TRY_CONVERT(INT, TRY_CONVERT(BIGINT, e.arrival_time) / 1000), '1970-01-01')
+        AT TIME ZONE 'UTC'
+        AT TIME ZONE 'Eastern Standard Time'
+        AS DATETIME2
+    )
+    FROM dbo.esri_events AS e
+    WHERE e.id >= @start_id AND e.id < @start_id + @batch_size
+      AND e.arrival_time_eastern IS NULL;
+    SET @start_id = @start_id + @batch_size;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_esri_events_arrival_time_eastern'
+      AND object_id = OBJECT_ID('dbo.esri_events')
+)
+BEGIN
+    CREATE INDEX IX_esri_events_arrival_time_eastern ON dbo.esri_events(arrival_time_eastern DESC, id DESC);
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_esri_events_arrival_time_eastern_pending'
+      AND object_id = OBJECT_ID('dbo.esri_events')
+)
+BEGIN
+    CREATE INDEX IX_esri_events_arrival_time_eastern_pending ON dbo.esri_events(id)
+        INCLUDE (arrival_time)
+        WHERE arrival_time_eastern IS NULL AND arrival_time IS NOT NULL;
+END
+GO
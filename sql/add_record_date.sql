@@ -0,0 +1,16 @@
+IF COL_LENGTH('search.records', 'record_date') IS NULL
+BEGIN
+    ALTER TABLE search.records ADD record_date AS
+        CAST(COALESCE(issue_date, court_issued_date, intake_date, date_time_served, date_time_attempted, prior_attempt_date, date_received) AS DATE) PERSISTED;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_records_record_date_department'
+      AND object_id = OBJECT_ID('search.records')
+)
+BEGIN
+    CREATE INDEX IX_records_record_date_department ON search.records(record_date, department);
+END
+GO
@@ -0,0 +1,11 @@
+-- Keyset paging (search_sql.KEYSET_SEEK_SQL) seeks and orders on
+-- (created_at DESC, record_id DESC); without this index every page scans and sorts.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_records_created_at_record_id'
+      AND object_id = OBJECT_ID('search.records')
+)
+BEGIN
+    CREATE INDEX IX_records_created_at_record_id ON search.records(created_at DESC, record_id DESC);
+END
+GO
@@ -0,0 +1,22 @@
+-- Optional migration:
+-- Adds a denormalized return_pdf_count to search.records so search skips the
+-- civil return PDF history lookup for Civil Papers rows without PDFs.
+-- insert_civil_return_pdf_record keeps it current once the column exists.
+-- Safe to run multiple times.
+
+IF COL_LENGTH('search.records', 'return_pdf_count') IS NULL
+BEGIN
+    ALTER TABLE search.records
+    ADD return_pdf_count INT NULL;
+END
+GO
+
+UPDATE r
+SET return_pdf_count = (
+    SELECT COUNT(DISTINCT LOWER(LTRIM(RTRIM(COALESCE(p.original_filename, p.blob_name)))))
+    FROM search.civil_return_pdfs AS p
+    WHERE p.record_id = r.record_id
+)
+FROM search.records AS r
+WHERE LOWER(LTRIM(RTRIM(COALESCE(r.department, '')))) = 'civil papers';
+GO
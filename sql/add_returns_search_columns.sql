@@ -0,0 +1,25 @@
+IF COL_LENGTH('search.Returns', 'search_text') IS NULL
+BEGIN
+    ALTER TABLE search.Returns ADD search_text AS
+        CAST(LOWER(CONCAT(COALESCE(case_number, ''), ' ', COALESCE(respondent_name, ''), ' ', COALESCE(petitioner_name, ''), ' ', COALESCE(member_reporting, ''))) AS NVARCHAR(1700)) PERSISTED;
+END
+GO
+
+IF COL_LENGTH('search.Returns', 'sort_date') IS NULL
+BEGIN
+    ALTER TABLE search.Returns ADD sort_date AS
+        COALESCE(attempt_date, date_signed, CAST(submitted_at AS date), intake_date, court_issue_date, CONVERT(date, '19000101', 112)) PERSISTED;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Returns_queue'
+      AND object_id = OBJECT_ID('search.Returns')
+)
+BEGIN
+    CREATE INDEX IX_Returns_queue
+        ON search.Returns(is_active, bcso_status, sort_date DESC, mdec_return_id DESC)
+        INCLUDE (search_text);
+END
+GO
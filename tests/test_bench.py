@@ -0,0 +1,57 @@
+import unittest
+
+from bench.generate import (
+    RECORD_COLUMNS,
+    TABLE_GENERATORS,
+    dataset_row_counts,
+    iter_records,
+)
+from bench.load import sql_batches
+from bench.report import compare_reports, summarize
+
+
+class GeneratorTests(unittest.TestCase):
+    def test_same_seed_yields_same_rows(self):
+        for table, (_, columns, generator) in TABLE_GENERATORS.items():
+            with self.subTest(table=table):
+                rows = list(generator(7, 25))
+                self.assertEqual(rows, list(generator(7, 25)))
+                self.assertTrue(all(len(row) == len(columns) for row in rows))
+        self.assertNotEqual(list(iter_records(7, 25)), list(iter_records(8, 25)))
+
+    def test_records_cover_every_search_department(self):
+        department = RECORD_COLUMNS.index("department")
+        departments = {row[department] for row in iter_records(1, 2000)}
+        self.assertIn("Civil Papers", departments)
+        self.assertIn("BCSO_ACTIVE_WARRANTS", departments)
+        self.assertEqual(len(departments), 7)
+
+    def test_companion_tables_scale_with_records(self):
+        counts = dataset_row_counts("100k")
+        self.assertEqual(counts["records"], 100_000)
+        self.assertEqual(counts["raw_records"], 100_000)
+        self.assertEqual(counts["returns"], 10_000)
+
+    def test_schema_script_splits_on_go_lines(self):
+        self.assertEqual(sql_batches("SELECT 1;\nGO\n\nSELECT 2;\n go \n"), ["SELECT 1;", "SELECT 2;"])
+
+
+class ReportTests(unittest.TestCase):
+    def report(self, median):
+        return {"size": "10k", "seed": 1, "results": {"search_all.name": summarize([median] * 3)}}
+
+    def test_flags_only_regressions_over_tolerance(self):
+        baseline = self.report(100)
+        self.assertEqual(compare_reports(self.report(115), baseline, tolerance=0.2), [])
+        regressions = compare_reports(self.report(150), baseline, tolerance=0.2)
+        self.assertEqual([r["name"] for r in regressions], ["search_all.name"])
+        self.assertEqual(regressions[0]["change"], 0.5)
+
+    def test_refuses_to_compare_different_datasets(self):
+        other = dict(self.report(100), size="100k")
+        with self.assertRaises(ValueError):
+            compare_reports(self.report(100), other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import csv
+import gzip
+import io
+import unittest
+from types import SimpleNamespace
+
+from blob_stream import BlockBlobWriter, etag_matches, open_blob_download, parse_byte_range, write_csv_blob
+
+
+class FakeBlobClient:
+    def __init__(self):
+        self.staged = {}
+        self.committed = None
+        self.content_settings = None
+
+    def stage_block(self, block_id, data):
+        self.staged[block_id] = bytes(data)
+
+    def commit_block_list(self, block_list, content_settings=None):
+        self.committed = b"".join(self.staged[block_id] for block_id in block_list)
+        self.content_settings = content_settings
+
+
+class BlockBlobWriterTests(unittest.TestCase):
+    def test_stages_fixed_size_blocks_and_commits_in_order(self):
+        blob = FakeBlobClient()
+        writer = BlockBlobWriter(blob, block_size=4)
+
+        writer.write(b"abcdefghij")
+        self.assertEqual(list(blob.staged.values()), [b"abcd", b"efgh"])
+        writer.commit("settings")
+
+        self.assertEqual(blob.committed, b"abcdefghij")
+        self.assertEqual(blob.content_settings, "settings")
+        self.assertEqual(writer.block_ids, ["000000", "000001", "000002"])
+        self.assertTrue(writer.closed)
+
+    def test_close_without_commit_leaves_no_blob(self):
+        blob = FakeBlobClient()
+        writer = BlockBlobWriter(blob, block_size=4)
+        writer.write(b"abcdef")
+        writer.close()
+        self.assertIsNone(blob.committed)
+
+    def test_empty_blob_commits_one_empty_block(self):
+        blob = FakeBlobClient()
+        BlockBlobWriter(blob).commit()
+        self.assertEqual(blob.committed, b"")
+
+
+class WriteCsvBlobTests(unittest.TestCase):
+    ROWS = [{"record_id": i, "full_name": f"Name {i}", "ignored": "x"} for i in range(200)]
+
+    def test_streams_csv_rows(self):
+        blob = FakeBlobClient()
+
+        count = write_csv_blob(blob, ["record_id", "full_name"], iter(self.ROWS), block_size=256)
+
+        self.assertEqual(count, 200)
+        self.assertGreater(len(blob.staged), 1)
+        rows = list(csv.DictReader(io.StringIO(blob.committed.decode("utf-8"))))
+        self.assertEqual(rows[199], {"record_id": "199", "full_name": "Name 199"})
+
+    def test_gzip_output_round_trips(self):
+        blob = FakeBlobClient()
+
+        write_csv_blob(blob, ["record_id", "full_name"], iter(self.ROWS), compress=True, block_size=256)
+
+        text = gzip.decompress(blob.committed).decode("utf-8")
+        self.assertTrue(text.startswith("record_id,full_name\r\n0,Name 0\r\n"))
+
+    def test_failed_rows_abandon_the_blob(self):
+        def rows():
+            yield {"record_id": 1}
+            raise RuntimeError("cursor failed")
+
+        blob = FakeBlobClient()
+        with self.assertRaises(RuntimeError):
+            write_csv_blob(blob, ["record_id"], rows())
+        self.assertIsNone(blob.committed)
+
+
+class FakeDownloadClient:
+    blob_name = "exports/report.csv"
+
+    def __init__(self, data, etag='"0x1"'):
+        self.data = data
+        self.etag = etag
+        self.reads = []
+
+    def get_blob_properties(self):
+        return SimpleNamespace(
+            size=len(self.data),
+            etag='"0x1"',
+            content_settings=SimpleNamespace(content_type="text/csv", content_encoding=None),
+        )
+
+    def download_blob(self, offset, length):
+        self.reads.append((offset, length))
+        chunk = self.data[offset:offset + length]
+        return SimpleNamespace(properties=SimpleNamespace(etag=self.etag), readall=lambda: chunk)
+
+
+class ParseByteRangeTests(unittest.TestCase):
+    def test_single_ranges(self):
+        self.assertEqual(parse_byte_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_byte_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_byte_range("bytes=90-500", 100), (90, 99))
+        self.assertEqual(parse_byte_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_byte_range("bytes=-500", 100), (0, 99))
+
+    def test_whole_blob_when_absent_malformed_or_multiple(self):
+        for header in (None, "", "items=0-1", "bytes=0-1,5-6", "bytes=abc", "bytes=9-2", "bytes=-"):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_byte_range(header, 100))
+
+    def test_unsatisfiable_ranges(self):
+        for header, size in (("bytes=100-", 100), ("bytes=-0", 100), ("bytes=0-", 0)):
+            with self.subTest(header=header):
+                with self.assertRaises(ValueError):
+                    parse_byte_range(header, size)
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"0x2", W/"0x1"', '"0x1"'))
+        self.assertTrue(etag_matches("*", '"0x1"'))
+        self.assertFalse(etag_matches('"0x2"', '"0x1"'))
+        self.assertFalse(etag_matches(None, '"0x1"'))
+
+
+class OpenBlobDownloadTests(unittest.TestCase):
+    DATA = bytes(range(250))
+
+    def test_streams_whole_blob_in_chunks(self):
+        blob = FakeDownloadClient(self.DATA)
+
+        status, headers, chunks = open_blob_download(blob, chunk_size=100)
+
+        self.assertEqual(blob.reads, [(0, 100)])
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Length"], "250")
+        self.assertEqual(headers["Content-Type"], "text/csv")
+        self.assertEqual(b"".join(chunks), self.DATA)
+        self.assertEqual(blob.reads, [(0, 100), (100, 100), (200, 50)])
+
+    def test_range_request(self):
+        blob = FakeDownloadClient(self.DATA)
+
+        status, headers, chunks = open_blob_download(blob, range_header="bytes=120-", chunk_size=100)
+
+        self.assertEqual(status, 206)
+        self.assertEqual(headers["Content-Range"], "bytes 120-249/250")
+        self.assertEqual(headers["Content-Length"], "130")
+        self.assertEqual(b"".join(chunks), self.DATA[120:])
+
+    def test_stale_if_range_sends_whole_blob(self):
+        blob = FakeDownloadClient(self.DATA)
+        status, _, chunks = open_blob_download(blob, range_header="bytes=0-9", if_range='"0x0"')
+        self.assertEqual(status, 200)
+        self.assertEqual(b"".join(chunks), self.DATA)
+
+    def test_if_none_match_and_unsatisfiable_range_skip_the_download(self):
+        blob = FakeDownloadClient(self.DATA)
+
+        status, headers, chunks = open_blob_download(blob, if_none_match='"0x1"')
+        self.assertEqual((status, list(chunks)), (304, []))
+        self.assertEqual(headers["ETag"], '"0x1"')
+
+        status, headers, chunks = open_blob_download(blob, range_header="bytes=300-")
+        self.assertEqual((status, list(chunks)), (416, []))
+        self.assertEqual(headers["Content-Range"], "bytes */250")
+        self.assertEqual(blob.reads, [])
+
+    def test_blob_replaced_mid_download_fails(self):
+        blob = FakeDownloadClient(self.DATA, etag='"0x2"')
+        with self.assertRaises(RuntimeError):
+            open_blob_download(blob, chunk_size=100)
+
+
+if __name__ == "__main__":
+    unittest.main()
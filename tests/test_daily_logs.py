@@ -1,11 +1,15 @@
 import unittest
 
-from daily_logs import search_daily_logs
+import schema_registry
+from daily_logs import backfill_arrival_time_eastern, reset_arrival_time_ready, search_daily_logs
 
 
 class FakeCursor:
-    def __init__(self, rows):
+    def __init__(self, rows, schema_columns=(), backfill_pending=False):
         self.rows = rows
+        self.schema_columns = list(schema_columns)
+        self.backfill_pending = backfill_pending
+        self.probing = False
         self.description = [
             ("event_number",),
             ("arrival_time",),
@@ -22,24 +26,43 @@ class FakeCursor:
         ]
         self.sql = None
         self.params = None
-
-    def execute(self, sql, params):
+        self.ready_sql = None
+
+    def execute(self, sql, params=None):
+        self.probing = "INFORMATION_SCHEMA" in sql or "THEN 0 ELSE 1 END" in sql
+        if "THEN 0 ELSE 1 END" in sql:
+            self.ready_sql = sql
+        if self.probing:
+            return
         self.sql = sql
         self.params = params
 
     def fetchall(self):
+        if self.probing:
+            return self.schema_columns
         return self.rows
 
+    def fetchone(self):
+        return (0 if self.backfill_pending else 1,)
+
 
 class FakeConnection:
-    def __init__(self, rows):
-        self.cursor_instance = FakeCursor(rows)
+    def __init__(self, rows, schema_columns=(), backfill_pending=False):
+        self.cursor_instance = FakeCursor(rows, schema_columns, backfill_pending)
 
     def cursor(self):
         return self.cursor_instance
 
 
 class SearchDailyLogsTests(unittest.TestCase):
+    def setUp(self):
+        schema_registry.invalidate_schema()
+        reset_arrival_time_ready()
+
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+        reset_arrival_time_ready()
+
     def base_filters(self):
         return {
             "query": "",
@@ -127,6 +150,86 @@ class SearchDailyLogsTests(unittest.TestCase):
         self.assertIn("Eastern Standard Time", connection.cursor_instance.sql)
         self.assertEqual(connection.cursor_instance.params, [7])
 
+    def test_uses_persisted_columns_when_present(self):
+        filters = self.base_filters()
+        filters.update({"case_number": "EVENT-9", "date_start": "2026-06-01", "date_end": "2026-06-10"})
+        connection = FakeConnection([], [
+            ("dbo", "esri_events", "arrival_time_eastern"),
+            ("dbo", "esri_events", "event_number_display"),
+        ])
+
+        search_daily_logs(connection, filters)
+
+        sql = connection.cursor_instance.sql
+        self.assertNotIn("AT TIME ZONE", sql)
+        self.assertNotIn("e.generated_event_number", sql)
+        self.assertIn("e.event_number_display AS event_number", sql)
+        self.assertIn("LOWER(COALESCE(e.event_number_display, '')) LIKE ?", sql)
+        self.assertIn("e.arrival_time_eastern >= CAST(? AS date)", sql)
+        self.assertIn("e.arrival_time_eastern < DATEADD(day, 1, CAST(? AS date))", sql)
+        self.assertIn("ORDER BY e.arrival_time_eastern DESC, e.id DESC", sql)
+        self.assertEqual(connection.cursor_instance.params, ["%event-9%", "2026-06-01", "2026-06-10"])
+
+    def test_keeps_inline_arrival_time_until_backfill_completes(self):
+        filters = self.base_filters()
+        filters.update({"date_start": "2026-06-01", "date_end": "2026-06-10"})
+        connection = FakeConnection([], [
+            ("dbo", "esri_events", "arrival_time_eastern"),
+            ("dbo", "esri_events", "event_number_display"),
+        ], backfill_pending=True)
+
+        search_daily_logs(connection, filters)
+
+        sql = connection.cursor_instance.sql
+        self.assertIn("AT TIME ZONE", sql)
+        self.assertNotIn("e.arrival_time_eastern", sql)
+        self.assertIn("e.event_number_display AS event_number", sql)
+
+    def test_readiness_ignores_unparseable_arrival_times(self):
+        connection = FakeConnection([], [("dbo", "esri_events", "arrival_time_eastern")])
+
+        search_daily_logs(connection, self.base_filters())
+
+        ready_sql = connection.cursor_instance.ready_sql
+        self.assertIn("arrival_time_eastern IS NULL AND arrival_time IS NOT NULL", ready_sql)
+        self.assertIn("TRY_CONVERT(BIGINT, arrival_time) / 1000), '1970-01-01')", ready_sql)
+        self.assertRegex(ready_sql, r"AS DATETIME2\s*\)\s*IS NOT NULL")
+
+
+class BackfillArrivalTimeEasternTests(unittest.TestCase):
+    def test_updates_in_id_ranges(self):
+        class RangeCursor:
+            rowcount = 2
+
+            def __init__(self):
+                self.ranges = []
+
+            def execute(self, sql, *params):
+                if params:
+                    self.ranges.append(params)
+
+            def fetchone(self):
+                return (1, 25)
+
+        class RangeConnection:
+            def __init__(self):
+                self.cursor_instance = RangeCursor()
+                self.commits = 0
+
+            def cursor(self):
+                return self.cursor_instance
+
+            def commit(self):
+                self.commits += 1
+
+        connection = RangeConnection()
+
+        updated = backfill_arrival_time_eastern(connection, batch_size=10)
+
+        self.assertEqual(connection.cursor_instance.ranges, [(1, 11), (11, 21), (21, 31)])
+        self.assertEqual(updated, 6)
+        self.assertEqual(connection.commits, 3)
+
 
 if __name__ == "__main__":
     unittest.main()
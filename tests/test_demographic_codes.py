@@ -0,0 +1,79 @@
+import unittest
+
+import schema_registry
+from demographic_codes import (
+    CODE_ALIASES,
+    CODE_COLUMNS,
+    code_case_sql,
+    code_for,
+    code_label,
+    ensure_records_code_columns,
+)
+
+
+class FakeCursor:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.executed = []
+
+    def execute(self, sql, *params):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+class CodeLookupTests(unittest.TestCase):
+    def test_spellings_share_a_code(self):
+        for value in ("M", " male ", "MALE"):
+            self.assertEqual(code_for("sex_code", value), 1)
+        self.assertEqual(code_for("race_code", "B"), code_for("race_code", "Black"))
+        self.assertEqual(code_for("issuing_county_code", "St Marys Co."), 37)
+        self.assertEqual(code_for("issuing_county_code", "Saint Mary's County"), 37)
+        self.assertEqual(code_for("issuing_county_code", "Baltimore City"), 510)
+
+    def test_ambiguous_and_unknown_values_have_no_code(self):
+        self.assertIsNone(code_for("issuing_county_code", "Baltimore"))
+        self.assertIsNone(code_for("race_code", "Hispanic"))
+        self.assertIsNone(code_for("sex_code", None))
+
+    def test_labels_match_filter_options(self):
+        self.assertEqual(code_label("sex_code", "m"), "Male")
+        self.assertEqual(code_label("issuing_county_code", "PG County"), None)
+        self.assertEqual(code_label("issuing_county_code", "prince georges co"), "Prince George's County")
+
+    def test_every_label_is_an_alias(self):
+        for code_column, (_, codes, _, _) in CODE_COLUMNS.items():
+            for code, label, _ in codes:
+                self.assertEqual(CODE_ALIASES[code_column][label.lower()], code)
+
+
+class CodeColumnSqlTests(unittest.TestCase):
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+
+    def test_case_escapes_apostrophes(self):
+        sql = code_case_sql("issuing_county_code")
+        self.assertTrue(sql.startswith("CAST(CASE LOWER(LTRIM(RTRIM(issuing_county)))"))
+        self.assertIn("WHEN N'prince george''s county' THEN 33", sql)
+        self.assertTrue(sql.endswith("END AS SMALLINT)"))
+
+    def test_ensure_adds_columns_and_indexes(self):
+        schema_registry.invalidate_schema()
+        cursor = FakeCursor()
+        ensure_records_code_columns(cursor)
+        statements = [sql for sql, _ in cursor.executed]
+        for code_column in CODE_COLUMNS:
+            self.assertTrue(any(f"ADD {code_column} AS CAST(CASE" in sql and "PERSISTED" in sql for sql in statements))
+            self.assertTrue(any(f"CREATE INDEX IX_records_{code_column}" in sql for sql in statements))
+        self.assertFalse(any("DROP COLUMN" in sql for sql in statements))
+
+    def test_ensure_skips_existing_columns(self):
+        schema_registry.invalidate_schema()
+        cursor = FakeCursor([("search", "records", column) for column in CODE_COLUMNS])
+        ensure_records_code_columns(cursor)
+        self.assertFalse(any("ALTER TABLE" in sql for sql, _ in cursor.executed))
+
+
+if __name__ == "__main__":
+    unittest.main()
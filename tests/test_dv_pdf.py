@@ -0,0 +1,157 @@
+import json
+import unittest
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import schema_registry
+from dv_pdf import build_dv_pdf_search_sql, parse_dv_issue_date, search_dv_pdf_records
+from search_sql import CASE_NUMBER_MATCH_CONTAINS, encode_page_cursor, next_page_cursor
+
+
+DV_PDF_COLUMNS = (
+    "id",
+    "case_number",
+    "respondent_name",
+    "issue_date",
+    "csv_reverse_geocode_output",
+    "order_type",
+    "csv_order_disposition",
+    "order_status",
+    "pdf_download",
+    "uploaded_at",
+    "case_number_norm",
+)
+
+
+class FakeCursor:
+    def __init__(self, results):
+        self.results = list(results)
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.results.pop(0)
+
+
+class FakeConnection:
+    def __init__(self, results):
+        self.cursor_instance = FakeCursor(results)
+
+    def cursor(self):
+        return self.cursor_instance
+
+
+def dv_row(record_id, uploaded_at, total_count=None):
+    return SimpleNamespace(
+        id=record_id,
+        case_number=" D-01-CV-24-000123 ",
+        respondent_name="Mariah Smith",
+        issue_date=date(2026, 3, 4),
+        reverse_geocode_output=None,
+        order_type="FINAL PROTECTIVE ORDER",
+        order_disposition="Served",
+        order_status="Active",
+        pdf_download="/dv-pdf/file/dv_pdf/1.pdf",
+        uploaded_at=uploaded_at,
+        total_count=total_count,
+    )
+
+
+class ParseIssueDateTests(unittest.TestCase):
+    def test_parses_form_and_iso_dates(self):
+        self.assertEqual(parse_dv_issue_date("03/04/2026"), date(2026, 3, 4))
+        self.assertEqual(parse_dv_issue_date(" 2026-03-04 "), date(2026, 3, 4))
+        self.assertEqual(parse_dv_issue_date(datetime(2026, 3, 4, 9, 30)), date(2026, 3, 4))
+
+    def test_unparseable_dates_are_none(self):
+        self.assertIsNone(parse_dv_issue_date(""))
+        self.assertIsNone(parse_dv_issue_date("March 4"))
+
+
+class BuildDvPdfSearchSqlTests(unittest.TestCase):
+    def test_filters_become_sql_predicates(self):
+        sql, params = build_dv_pdf_search_sql(
+            {
+                "query": " Smith ",
+                "case_number": "d-01-cv",
+                "date_start": "03/01/2026",
+                "date_end": "2026-03-31",
+                "admin_status_values": ["Served", " served", "Not Served"],
+            },
+            page_size=50,
+        )
+        self.assertIn("SELECT TOP (50)", sql)
+        self.assertIn("case_number_norm LIKE ?", sql)
+        self.assertIn("issue_date BETWEEN ? AND ?", sql)
+        self.assertIn("OPENJSON(?)", sql)
+        self.assertIn("COUNT(*) OVER () AS total_count", sql)
+        self.assertIn("ORDER BY uploaded_at DESC, id DESC", sql)
+        self.assertEqual(params[:4], ["%smith%", "D01CV%", date(2026, 3, 1), date(2026, 3, 31)])
+        self.assertEqual(json.loads(params[4]), ["not served", "served"])
+
+    def test_contains_case_match_and_last_x_days(self):
+        sql, params = build_dv_pdf_search_sql(
+            {"case_number": "000123", "case_number_match": CASE_NUMBER_MATCH_CONTAINS, "last_x_days": "30"},
+            page_size=10,
+        )
+        self.assertIn("issue_date >= DATEADD(day, -?, CAST(GETDATE() AS date))", sql)
+        self.assertEqual(params, ["%000123%", 30])
+
+    def test_cursor_seeks_past_last_row_without_count(self):
+        cursor = encode_page_cursor("DV PDF", "2026-03-05T10:00:00", 7)
+        sql, params = build_dv_pdf_search_sql({}, page_size=10, cursor=cursor)
+        self.assertIn("(uploaded_at < ? OR (uploaded_at = ? AND id < ?))", sql)
+        self.assertNotIn("COUNT(*) OVER ()", sql)
+        self.assertEqual(params, ["2026-03-05T10:00:00", "2026-03-05T10:00:00", 7])
+
+    def test_missing_columns_fall_back(self):
+        sql, _ = build_dv_pdf_search_sql(
+            {"case_number": "d-01"},
+            page_size=10,
+            disposition_column=False,
+            reverse_geocode_column=False,
+            case_number_norm_column=False,
+        )
+        self.assertNotIn("csv_order_disposition", sql)
+        self.assertNotIn("case_number_norm", sql)
+        self.assertIsNone(
+            build_dv_pdf_search_sql({"admin_status_values": ["served"]}, page_size=10, disposition_column=False)
+        )
+
+    def test_court_document_type_matches_nothing(self):
+        self.assertIsNone(build_dv_pdf_search_sql({"court_document_type": "Summons"}, page_size=10))
+
+
+class SearchDvPdfRecordsTests(unittest.TestCase):
+    def setUp(self):
+        schema_registry.invalidate_schema()
+
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+
+    def test_returns_total_and_formatted_page(self):
+        probe = [("search", "dv_pdf_records", column) for column in DV_PDF_COLUMNS]
+        uploaded_at = datetime(2026, 3, 5, 10, 0, 0)
+        connection = FakeConnection([probe, [dv_row(9, uploaded_at, 3), dv_row(8, uploaded_at, 3)]])
+
+        total, rows = search_dv_pdf_records(connection, {"query": "smith"}, page_size=2)
+
+        self.assertEqual(total, 3)
+        self.assertEqual(rows[0]["case_number"], "D-01-CV-24-000123")
+        self.assertEqual(rows[0]["issue_date"], "03/04/2026")
+        self.assertEqual(rows[0]["uploaded_at"], "2026-03-05 10:00:00")
+        self.assertEqual(rows[0]["type"], "FINAL PROTECTIVE ORDER")
+        self.assertEqual(rows[0]["reverse_geocode_output"], "")
+        self.assertIsNotNone(next_page_cursor(rows, 2, "DV PDF"))
+
+    def test_court_document_type_skips_the_query(self):
+        connection = FakeConnection([[]])
+        total, rows = search_dv_pdf_records(connection, {"court_document_type": "Summons"}, page_size=10)
+        self.assertEqual((total, rows), (0, []))
+        self.assertEqual(len(connection.cursor_instance.executed), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
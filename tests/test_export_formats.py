@@ -0,0 +1,95 @@
+import io
+import unittest
+from datetime import date, datetime
+
+from export_formats import (
+    EXPORT_COLUMNS,
+    EXPORT_FORMAT_ARROW,
+    EXPORT_FORMAT_PARQUET,
+    column_arrays,
+    columnar_export_available,
+    parse_export_columns,
+    parse_export_format,
+    write_columnar_blob,
+)
+
+
+class FakeBlobClient:
+    def __init__(self):
+        self.staged = {}
+        self.committed = None
+
+    def stage_block(self, block_id, data):
+        self.staged[block_id] = bytes(data)
+
+    def commit_block_list(self, block_list, content_settings=None):
+        self.committed = b"".join(self.staged[block_id] for block_id in block_list)
+
+
+ROWS = [
+    {
+        "record_id": str(i),
+        "full_name": f"Name {i}",
+        "intake_date": "2026-03-04",
+        "record_date": datetime(2026, 3, 5, 9, 0),
+        "x": "-76.6" if i % 2 else "",
+        "y": None,
+    }
+    for i in range(25)
+]
+
+
+class ParseExportOptionsTests(unittest.TestCase):
+    def test_format_defaults_to_csv(self):
+        self.assertEqual(parse_export_format(None), "csv")
+        self.assertEqual(parse_export_format(" Parquet "), "parquet")
+        with self.assertRaises(ValueError):
+            parse_export_format("xlsx")
+
+    def test_columns_keep_export_order(self):
+        self.assertEqual(parse_export_columns(None), list(EXPORT_COLUMNS))
+        self.assertEqual(parse_export_columns("x, record_id"), ["record_id", "x"])
+        self.assertEqual(parse_export_columns(["Event Type", "full_name"]), ["full_name", "Event Type"])
+        with self.assertRaises(ValueError):
+            parse_export_columns(["record_id", "ssn"])
+
+
+class ColumnArraysTests(unittest.TestCase):
+    def test_values_are_coerced_to_column_types(self):
+        arrays = column_arrays(ROWS[:2], ["record_id", "intake_date", "record_date", "x", "notes"])
+        self.assertEqual(arrays["record_id"], [0, 1])
+        self.assertEqual(arrays["intake_date"], [date(2026, 3, 4)] * 2)
+        self.assertEqual(arrays["record_date"], [date(2026, 3, 5)] * 2)
+        self.assertEqual(arrays["x"], [None, -76.6])
+        self.assertEqual(arrays["notes"], [None, None])
+
+
+@unittest.skipUnless(columnar_export_available(), "pyarrow is not installed")
+class WriteColumnarBlobTests(unittest.TestCase):
+    COLUMNS = ["record_id", "full_name", "intake_date", "x"]
+
+    def test_parquet_row_groups(self):
+        import pyarrow.parquet as pq
+
+        blob = FakeBlobClient()
+        count = write_columnar_blob(blob, EXPORT_FORMAT_PARQUET, self.COLUMNS, iter(ROWS), row_group_size=10, block_size=256)
+
+        self.assertEqual(count, 25)
+        parquet = pq.ParquetFile(io.BytesIO(blob.committed))
+        self.assertEqual(parquet.num_row_groups, 3)
+        self.assertEqual(parquet.schema_arrow.names, self.COLUMNS)
+        self.assertEqual(parquet.read().column("record_id").to_pylist(), list(range(25)))
+
+    def test_arrow_ipc_file(self):
+        import pyarrow as pa
+
+        blob = FakeBlobClient()
+        write_columnar_blob(blob, EXPORT_FORMAT_ARROW, self.COLUMNS, iter(ROWS), row_group_size=10)
+
+        table = pa.ipc.open_file(io.BytesIO(blob.committed)).read_all()
+        self.assertEqual(table.num_rows, 25)
+        self.assertEqual(table.column("full_name")[24].as_py(), "Name 24")
+
+
+if __name__ == "__main__":
+    unittest.main()
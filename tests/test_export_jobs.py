@@ -0,0 +1,86 @@
+import threading
+import unittest
+
+from export_jobs import ExportJobQueue
+
+
+class ExportJobQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.queue = ExportJobQueue(max_workers=1, max_queued=1)
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.ran = []
+
+    def tearDown(self):
+        self.release.set()
+        self.queue.shutdown()
+
+    def job(self, token):
+        self.started.set()
+        self.release.wait(5)
+        self.ran.append(token)
+
+    def test_runs_in_order_and_reports_positions(self):
+        self.assertTrue(self.queue.submit("a", self.job, "a"))
+        self.assertTrue(self.started.wait(5))
+        self.assertTrue(self.queue.submit("b", self.job, "b"))
+
+        self.assertEqual(self.queue.position("a"), 0)
+        self.assertEqual(self.queue.position("b"), 1)
+        self.assertIsNone(self.queue.position("unknown"))
+
+        self.release.set()
+        self.queue.shutdown()
+        self.assertEqual(self.ran, ["a", "b"])
+        self.assertIsNone(self.queue.position("b"))
+
+    def test_refuses_jobs_beyond_workers_and_queue(self):
+        self.assertTrue(self.queue.submit("a", self.job, "a"))
+        self.assertTrue(self.queue.submit("b", self.job, "b"))
+        self.assertFalse(self.queue.submit("c", self.job, "c"))
+
+        self.release.set()
+        self.queue.shutdown()
+        self.assertNotIn("c", self.ran)
+
+    def test_failed_job_frees_its_slot(self):
+        finished = threading.Event()
+
+        def fail():
+            try:
+                raise RuntimeError("scan failed")
+            finally:
+                finished.set()
+
+        self.assertTrue(self.queue.submit("a", fail))
+        self.assertTrue(finished.wait(5))
+        self.queue.shutdown()
+        self.assertIsNone(self.queue.position("a"))
+        self.assertEqual(self.queue._running, set())
+
+
+class ExportHeartbeatTests(unittest.TestCase):
+    def test_heartbeats_queued_and_running_jobs(self):
+        beats = []
+        beat = threading.Event()
+        release = threading.Event()
+
+        def heartbeat(tokens):
+            beats.append(sorted(tokens))
+            if len(tokens) == 2:
+                beat.set()
+
+        queue = ExportJobQueue(max_workers=1, max_queued=1, heartbeat=heartbeat, heartbeat_seconds=0.01)
+        try:
+            queue.submit("a", release.wait, 5)
+            queue.submit("b", release.wait, 5)
+            self.assertTrue(beat.wait(5))
+            self.assertIn(["a", "b"], beats)
+        finally:
+            release.set()
+            queue.shutdown()
+        self.assertEqual(queue.tokens(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import name_index
+from name_index import delete_names_where, delete_records_names, refresh_names_where
+
+
+class FakeCursor:
+    def __init__(self, records):
+        # [(record_id, full_name), ...]
+        self.records = records
+        self.executed = []
+        self.many = []
+        self.rows = []
+
+    def execute(self, sql, *params):
+        self.executed.append((sql, list(params)))
+        if "SELECT TOP" in sql:
+            batch_size = int(sql.split("TOP (")[1].split(")")[0])
+            rows = [(record_id, name, None, None, None, None) for record_id, name in self.records if record_id > params[0]]
+            self.rows = rows[:batch_size]
+
+    def executemany(self, sql, rows):
+        self.many.append((sql, list(rows)))
+
+    def fetchall(self):
+        return self.rows
+
+
+class NamePostingMaintenanceTests(unittest.TestCase):
+    def setUp(self):
+        name_index._name_index_ready = True
+
+    def tearDown(self):
+        name_index._name_index_ready = False
+
+    def test_refresh_names_where_indexes_matching_rows_in_batches(self):
+        cursor = FakeCursor([(1, "Ann Lee"), (2, "Bo Ray"), (3, "Cy Dunn")])
+        self.assertEqual(refresh_names_where(cursor, "department = ?", "DOC Jail Population", batch_size=2), 3)
+
+        selects = [entry for entry in cursor.executed if "SELECT TOP" in entry[0]]
+        self.assertEqual([params for _, params in selects], [[0, "DOC Jail Population"], [2, "DOC Jail Population"], [3, "DOC Jail Population"]])
+        self.assertIn("AND (department = ?)", selects[0][0])
+        trigram_inserts = [rows for sql, rows in cursor.many if "INSERT INTO search.name_trigrams" in sql]
+        self.assertIn(("lee", 1), trigram_inserts[0])
+        self.assertIn(("dun", 3), trigram_inserts[1])
+        deletes = [rows for sql, rows in cursor.many if sql.startswith("DELETE FROM search.name_trigrams")]
+        self.assertEqual(deletes, [[(1,), (2,)], [(3,)]])
+
+    def test_deletes_cover_both_posting_tables(self):
+        cursor = FakeCursor([])
+        delete_names_where(cursor, "department = ? AND source_file = ?", "CIVIL PAPERS", "a.csv")
+        self.assertEqual(len(cursor.executed), 2)
+        self.assertIn("DELETE FROM search.name_phonetic_keys", cursor.executed[1][0])
+        self.assertIn("SELECT record_id FROM search.records WHERE department = ? AND source_file = ?", cursor.executed[1][0])
+        self.assertEqual(cursor.executed[0][1], ["CIVIL PAPERS", "a.csv"])
+
+        delete_records_names(cursor, [])
+        self.assertEqual(cursor.many, [])
+        delete_records_names(cursor, [5, "6"])
+        self.assertEqual(cursor.many[1], ("DELETE FROM search.name_phonetic_keys WHERE record_id = ?", [(5,), (6,)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
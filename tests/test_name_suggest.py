@@ -0,0 +1,155 @@
+import threading
+import unittest
+from collections import Counter
+from datetime import datetime
+
+import schema_registry
+from name_suggest import NamePrefixIndex, build_snapshot, fetch_new_names, merge_names, row_names
+
+
+SCHEMA_ROWS = [("search", "records", "record_id"), ("search", "returns", "mdec_return_id")]
+
+
+class FakeCursor:
+    def __init__(self, tables):
+        # {"search.records": [row, ...]} with rows in (created_at, id, *names) order;
+        # created_at only orders the fixtures, the queries page by id.
+        self.tables = tables
+        self.executed = []
+        self.rows = []
+
+    def execute(self, sql, params=()):
+        self.executed.append((sql, list(params)))
+        if "INFORMATION_SCHEMA" in sql:
+            self.rows = SCHEMA_ROWS
+            return
+        table_name = "search.records" if "FROM search.records" in sql else "search.Returns"
+        rows = sorted(row[1:] for row in self.tables.get(table_name, []))
+        if params:
+            rows = [row for row in rows if row[0] > params[0]]
+        batch_size = int(sql.split("TOP (")[1].split(")")[0])
+        self.rows = rows[:batch_size]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, tables):
+        self.cursor_instance = FakeCursor(tables)
+
+    def cursor(self):
+        return self.cursor_instance
+
+    def close(self):
+        pass
+
+
+def record(day, record_id, full_name, resp_name=None):
+    return (datetime(2026, 1, day), record_id, full_name, None, resp_name, None, None)
+
+
+class MergeNamesTests(unittest.TestCase):
+    def test_merges_new_and_existing_names_keeping_keys_sorted(self):
+        snapshot = build_snapshot(Counter({"jones": 1, "adams": 2}))
+        merged = merge_names(snapshot, Counter({"jones": 3, "baker jones": 1, "zed": 1}))
+        self.assertEqual([merged.name(name_id) for name_id in range(len(merged))], ["jones", "adams", "baker jones", "zed"])
+        self.assertEqual(list(merged.counts), [4, 2, 1, 1])
+        keys = [merged.key(position) for position in range(len(merged.key_names))]
+        self.assertEqual(keys, [b"adams", b"baker jones", b"jones", b"jones", b"zed"])
+        self.assertEqual(list(snapshot.counts), [1, 2])
+
+    def test_row_counts_each_name_once(self):
+        self.assertEqual(row_names(["John  SMITH", "john smith", None, " "]), {"john smith"})
+
+
+class FetchNewNamesTests(unittest.TestCase):
+    def test_pages_through_rows_after_watermark(self):
+        cursor = FakeCursor({"search.records": [record(1, 1, "Ann Lee"), record(2, 2, "Ann Lee"), record(3, 3, "Bo Ray")]})
+        additions, watermark = fetch_new_names(cursor, "records", 1, batch_size=1)
+        self.assertEqual(additions, Counter({"ann lee": 1, "bo ray": 1}))
+        self.assertEqual(watermark, 3)
+        self.assertIn("WHERE record_id > ?", cursor.executed[0][0])
+        self.assertIn("ORDER BY record_id", cursor.executed[0][0])
+
+
+class NamePrefixIndexTests(unittest.TestCase):
+    def setUp(self):
+        schema_registry.invalidate_schema()
+
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+
+    def test_suggest_returns_prefix_matches_with_counts(self):
+        tables = {
+            "search.records": [record(1, 1, "Smith, John"), record(2, 2, "Smithers Ann", "smith, john"), record(3, 3, "Snow Jon")],
+            "search.Returns": [(datetime(2026, 1, 1), 7, "SMITH, JOHN", "Acme LLC")],
+        }
+        index = NamePrefixIndex()
+        index.refresh(FakeConnection(tables))
+        self.assertEqual(index.suggest("Smith"), [
+            {"name": "smith, john", "count": 3},
+            {"name": "smithers ann", "count": 1},
+        ])
+        self.assertEqual(index.suggest("smith", limit=1), [{"name": "smith, john", "count": 3}])
+        self.assertEqual(index.suggest("zz"), [])
+
+    def test_suggest_matches_any_word_once_per_name(self):
+        tables = {"search.records": [record(1, 1, "John Smith"), record(2, 2, "Smith Smithers"), record(3, 3, "Jo Ann Smalls")]}
+        index = NamePrefixIndex()
+        index.refresh(FakeConnection(tables))
+        self.assertEqual([entry["name"] for entry in index.suggest("smi")], ["john smith", "smith smithers"])
+        self.assertEqual([entry["name"] for entry in index.suggest("ann sm")], ["jo ann smalls"])
+
+    def test_incremental_refresh_reads_only_new_rows(self):
+        tables = {"search.records": [record(1, 1, "Ann Lee")], "search.Returns": []}
+        connection = FakeConnection(tables)
+        index = NamePrefixIndex()
+        self.assertTrue(index.refresh(connection)["full"])
+        tables["search.records"].append(record(2, 2, "Ann Lee"))
+        result = index.refresh(connection)
+        self.assertFalse(result["full"])
+        self.assertEqual(index.suggest("ann"), [{"name": "ann lee", "count": 2}])
+        records_sql, params = [entry for entry in connection.cursor_instance.executed if "search.records" in entry[0]][-1]
+        self.assertIn("record_id > ?", records_sql)
+        self.assertEqual(params, [1])
+
+    def test_refresh_without_new_rows_keeps_counts(self):
+        tables = {
+            "search.records": [record(1, 1, "Ann Lee")],
+            "search.Returns": [(datetime(2026, 1, 1), 7, "Ann Lee", None)],
+        }
+        connection = FakeConnection(tables)
+        index = NamePrefixIndex()
+        index.refresh(connection)
+        for _ in range(2):
+            self.assertEqual(index.refresh(connection)["added"], 0)
+        self.assertEqual(index.suggest("ann"), [{"name": "ann lee", "count": 2}])
+
+    def test_rebuild_when_due(self):
+        connection = FakeConnection({"search.records": [record(1, 1, "Ann Lee")]})
+        index = NamePrefixIndex(rebuild_seconds=0)
+        index.refresh(connection)
+        self.assertTrue(index.refresh(connection)["full"])
+        self.assertEqual(index.suggest("ann"), [{"name": "ann lee", "count": 1}])
+
+    def test_ensure_fresh_builds_in_background(self):
+        release = threading.Event()
+        connection = FakeConnection({"search.records": [record(1, 1, "Ann Lee")]})
+        index = NamePrefixIndex()
+
+        def connect():
+            release.wait(5)
+            return connection
+
+        index.ensure_fresh(connect)
+        self.assertFalse(index.ready)
+        self.assertEqual(index.suggest("ann"), [])
+        release.set()
+        self.assertTrue(index._refresh_lock.acquire(timeout=5))
+        index._refresh_lock.release()
+        self.assertEqual(index.suggest("ann"), [{"name": "ann lee", "count": 1}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from name_index import delete_record_names, refresh_record_names
+import name_index
+from phonetic import nysiis, phonetic_keys, phonetic_words
+
+
+class FakeCursor:
+    def __init__(self, row=None):
+        self.row = row
+        self.executed = []
+        self.executemany_calls = []
+
+    def execute(self, sql, *params):
+        self.executed.append((sql, params))
+
+    def executemany(self, sql, rows):
+        self.executemany_calls.append((sql, rows))
+
+    def fetchone(self):
+        return self.row
+
+
+class NysiisTests(unittest.TestCase):
+    def test_sound_alike_spellings_share_a_key(self):
+        for left, right in (
+            ("Johnson", "Jonson"),
+            ("Stevens", "Stephens"),
+            ("Phillips", "Filips"),
+            ("Knight", "Night"),
+            ("MacDonald", "McDonald"),
+            ("Brown", "Browne"),
+        ):
+            with self.subTest(left=left, right=right):
+                self.assertEqual(nysiis(left), nysiis(right))
+
+    def test_known_keys(self):
+        self.assertEqual(nysiis("Smith"), "SNAT")
+        self.assertEqual(nysiis("Johnson"), "JANSAN")
+        self.assertEqual(nysiis("Schmidt"), "SNAD")
+        self.assertEqual(nysiis(""), "")
+
+    def test_words_fold_accents_and_apostrophes(self):
+        self.assertEqual(phonetic_words("O'Brien, José-Luis 3rd"), ["obrien", "jose", "luis", "rd"])
+        self.assertEqual(phonetic_keys("SMITH, JOHN"), {"SNAT", "JAN"})
+
+
+class PhoneticPostingTests(unittest.TestCase):
+    def setUp(self):
+        name_index._name_index_ready = True
+
+    def tearDown(self):
+        name_index._name_index_ready = False
+
+    def test_refresh_writes_trigram_and_phonetic_postings(self):
+        cursor = FakeCursor(("Jonson, Ann", None, None, None, None))
+        refresh_record_names(cursor, 7)
+        inserted = {sql.split("INSERT INTO ")[1].split(" ")[0]: rows for sql, rows in cursor.executemany_calls}
+        self.assertEqual(sorted(inserted["search.name_phonetic_keys"]), [("AN", 7), ("JANSAN", 7)])
+        self.assertIn(("ann", 7), inserted["search.name_trigrams"])
+
+    def test_delete_clears_both_tables(self):
+        cursor = FakeCursor()
+        delete_record_names(cursor, 7)
+        statements = [sql for sql, _ in cursor.executed]
+        self.assertIn("DELETE FROM search.name_phonetic_keys WHERE record_id = ?", statements)
+        self.assertIn("DELETE FROM search.name_trigrams WHERE record_id = ?", statements)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,6 +27,11 @@ class ResultsTemplateTests(unittest.TestCase):
             self.template,
         )
 
+    def test_search_streams_ndjson_sections_in_sorted_position(self):
+        self.assertIn('headers: { Accept: "application/x-ndjson" },', self.template)
+        self.assertIn("await readSearchFrames(response, (frame) => {", self.template)
+        self.assertIn("placeDepartmentSection(resultsDiv, div, dept);", self.template)
+
     def test_zero_result_departments_are_not_filtered_out(self):
         self.assertNotIn("if (hasActiveSearchFilters && count === 0)", self.template)
 
@@ -1,14 +1,45 @@
 import unittest
+from datetime import date
 from pathlib import Path
 
+import schema_registry
 from returns import (
+    RETURN_DEDUPE_CASE_NUMBER_SQL,
+    _find_existing_return,
     allowed_return_statuses,
     derived_signature_status,
     is_hard_copy_return,
     normalize_service_disposition,
+    next_returns_cursor,
     parse_cognito_entry_details,
     payload_from_export_row,
+    search_returns,
 )
+from search_sql import decode_page_cursor, encode_page_cursor
+
+
+class FakeCursor:
+    def __init__(self, schema_columns, rows):
+        self.schema_columns = schema_columns
+        self.rows = rows
+        self.description = [("mdec_return_id",), ("case_number",), ("page_created_at",), ("total_count",)]
+        self.executed = []
+
+    def execute(self, sql, *params):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        if len(self.executed) == 1:
+            return self.schema_columns
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, schema_columns, rows=()):
+        self.cursor_instance = FakeCursor(schema_columns, list(rows))
+
+    def cursor(self):
+        return self.cursor_instance
 
 
 class ReturnsParsingTests(unittest.TestCase):
@@ -140,5 +171,115 @@ class ReturnsParsingTests(unittest.TestCase):
         self.assertIn("COALESCE(original_filename, '')", returns_source)
 
 
+class SearchReturnsTests(unittest.TestCase):
+    PERSISTED_COLUMNS = [
+        ("search", "Returns", "mdec_return_id"),
+        ("search", "Returns", "search_text"),
+        ("search", "Returns", "sort_date"),
+    ]
+
+    def setUp(self):
+        schema_registry.invalidate_schema()
+
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+
+    def test_queue_page_uses_persisted_columns_without_ddl(self):
+        connection = FakeConnection(
+            self.PERSISTED_COLUMNS,
+            [(9, "C-1", date(2026, 5, 2), 12), (7, "C-2", date(2026, 5, 1), 12)],
+        )
+
+        total, rows = search_returns(connection, {"query": "Smith"}, exclude_uploaded=True, page_size=2)
+
+        sql, params = connection.cursor_instance.executed[-1]
+        self.assertEqual(len(connection.cursor_instance.executed), 2)
+        self.assertIn("search_text LIKE ?", sql)
+        self.assertIn("(bcso_status <> 'Uploaded' OR bcso_status IS NULL)", sql)
+        self.assertIn("SELECT TOP (2)", sql)
+        self.assertIn("ORDER BY sort_date DESC, mdec_return_id DESC", sql)
+        self.assertNotIn("COALESCE(attempt_date", sql)
+        self.assertEqual(params, ("%smith%",))
+        self.assertEqual(total, 12)
+        self.assertEqual(rows[1]["page_created_at"], "2026-05-01")
+        self.assertNotIn("total_count", rows[0])
+        self.assertEqual(decode_page_cursor(next_returns_cursor(rows, 2)), ("Returns", "2026-05-01", 7))
+        self.assertIsNone(next_returns_cursor(rows, 3))
+
+    def test_cursor_seeks_on_sort_date(self):
+        connection = FakeConnection(self.PERSISTED_COLUMNS)
+        cursor = encode_page_cursor("Returns", "2026-05-01", 7)
+
+        total, rows = search_returns(connection, {}, page_size=2, cursor=cursor)
+
+        sql, params = connection.cursor_instance.executed[-1]
+        self.assertIn("(sort_date < CAST(? AS date) OR (sort_date = CAST(? AS date) AND mdec_return_id < ?))", sql)
+        self.assertNotIn("COUNT(*) OVER ()", sql)
+        self.assertEqual(params, ("2026-05-01", "2026-05-01", 7))
+        self.assertIsNone(total)
+        self.assertEqual(rows, [])
+
+    def test_falls_back_to_inline_expressions_before_migration(self):
+        connection = FakeConnection([("search", "Returns", "mdec_return_id")])
+
+        search_returns(connection, {"query": "smith"})
+
+        sql, _ = connection.cursor_instance.executed[-1]
+        self.assertIn("LOWER(CONCAT(", sql)
+        self.assertIn("ORDER BY COALESCE(attempt_date", sql)
+
+    def test_case_filter_before_case_number_norm_exists(self):
+        connection = FakeConnection([("search", "Returns", "mdec_return_id")])
+
+        search_returns(connection, {"case_number": "c-24-1"})
+
+        sql, params = connection.cursor_instance.executed[-1]
+        self.assertIn("UPPER(REPLACE(REPLACE(REPLACE(case_number", sql)
+        self.assertEqual(params, ("C241%",))
+
+    def test_case_filter_uses_persisted_case_number_norm(self):
+        connection = FakeConnection(self.PERSISTED_COLUMNS + [("search", "Returns", "case_number_norm")])
+
+        search_returns(connection, {"case_number": "c-24-1"})
+
+        sql, _ = connection.cursor_instance.executed[-1]
+        self.assertIn("case_number_norm LIKE ?", sql)
+
+    def test_missing_table_returns_nothing(self):
+        connection = FakeConnection([])
+        self.assertEqual(search_returns(connection, {}), (0, []))
+
+
+class FindExistingReturnTests(unittest.TestCase):
+    class LookupCursor:
+        def __init__(self):
+            self.executed = []
+
+        def execute(self, sql, *params):
+            self.executed.append((sql, params))
+
+        def fetchone(self):
+            return None
+
+    def test_case_number_match_keeps_slashes_significant(self):
+        cursor = self.LookupCursor()
+
+        result = _find_existing_return(cursor, {
+            "case_number": "C-24/1",
+            "original_filename": "return.pdf",
+            "respondent_name": "Ann Lee",
+        })
+
+        self.assertEqual(result, (None, None))
+        filename_sql, filename_params = cursor.executed[0]
+        self.assertIn(RETURN_DEDUPE_CASE_NUMBER_SQL, filename_sql)
+        self.assertEqual(filename_params, ("return.pdf", "C241", "C-24/1"))
+        respondent_sql, respondent_params = cursor.executed[1]
+        self.assertIn(RETURN_DEDUPE_CASE_NUMBER_SQL, respondent_sql)
+        self.assertEqual(respondent_params[:3], ("C241", "C-24/1", "Ann Lee"))
+        self.assertIn("REPLACE(REPLACE(COALESCE(case_number, ''), '-', ''), ' ', '')", RETURN_DEDUPE_CASE_NUMBER_SQL)
+        self.assertNotIn("'/'", RETURN_DEDUPE_CASE_NUMBER_SQL)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from datetime import date, datetime
+
+from row_format import (
+    RowFormatter,
+    format_date,
+    format_datetime_minutes,
+    format_datetime_seconds,
+    format_eastern_datetime,
+    format_us_datetime,
+)
+
+
+class FakeCursor:
+    def __init__(self, columns, rows):
+        self.description = [(column,) for column in columns]
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FormatterTests(unittest.TestCase):
+    def test_matches_sql_format_patterns(self):
+        value = datetime(2026, 5, 1, 15, 4, 9, 123000)
+        self.assertEqual(format_date(date(2026, 5, 1)), "2026-05-01")
+        self.assertEqual(format_date(value), "2026-05-01")
+        self.assertEqual(format_datetime_seconds(value), "2026-05-01T15:04:09")
+        self.assertEqual(format_datetime_minutes(value), "2026-05-01T15:04")
+        self.assertEqual(format_us_datetime(value), "05-01-2026 03:04 PM")
+        self.assertEqual(format_us_datetime(datetime(2026, 5, 1, 0, 7)), "05-01-2026 12:07 AM")
+
+    def test_eastern_stamp_follows_daylight_saving(self):
+        self.assertEqual(format_eastern_datetime(datetime(2026, 1, 15, 17, 30)), "2026-01-15 12:30 PM")
+        self.assertEqual(format_eastern_datetime(datetime(2026, 7, 1, 4, 5)), "2026-07-01 12:05 AM")
+        self.assertEqual(format_eastern_datetime(datetime(2026, 7, 1, 3, 5)), "2026-06-30 11:05 PM")
+
+
+class RowFormatterTests(unittest.TestCase):
+    def test_expands_one_native_column_into_variants(self):
+        formatter = RowFormatter({
+            "date_time_served": (
+                ("date_time_served", format_date),
+                ("date_time_served_iso", format_datetime_minutes),
+                ("date_time_served_display", format_us_datetime),
+            ),
+        })
+        cursor = FakeCursor(
+            ["record_id", "date_time_served"],
+            [(1, datetime(2026, 5, 1, 9, 30)), (2, None)],
+        )
+        self.assertEqual(
+            formatter.format_rows(cursor),
+            [
+                {
+                    "record_id": 1,
+                    "date_time_served": "2026-05-01",
+                    "date_time_served_iso": "2026-05-01T09:30",
+                    "date_time_served_display": "05-01-2026 09:30 AM",
+                },
+                {
+                    "record_id": 2,
+                    "date_time_served": None,
+                    "date_time_served_iso": None,
+                    "date_time_served_display": None,
+                },
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import schema_registry
+from schema_registry import has_column, has_columns, invalidate_schema, table_exists
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = 0
+
+    def execute(self, sql, params=None):
+        self.executed += 1
+
+    def fetchall(self):
+        return self.rows
+
+
+class SchemaRegistryTests(unittest.TestCase):
+    def setUp(self):
+        invalidate_schema()
+        self.cursor = FakeCursor([
+            ("search", "records", "record_id"),
+            ("search", "records", "geocode_confidence"),
+            ("search", "Returns", "case_number"),
+        ])
+
+    def tearDown(self):
+        invalidate_schema()
+
+    def test_probes_once_and_answers_from_cache(self):
+        self.assertTrue(has_column(self.cursor, "search.records", "GEOCODE_CONFIDENCE"))
+        self.assertFalse(has_column(self.cursor, "search.records", "blob_name"))
+        self.assertTrue(has_columns(self.cursor, "search.Returns", ["case_number"]))
+        self.assertTrue(table_exists(self.cursor, "search.returns"))
+        self.assertFalse(table_exists(self.cursor, "search.dv_pdf_records"))
+        self.assertEqual(self.cursor.executed, 1)
+
+    def test_invalidate_forces_a_fresh_probe(self):
+        has_column(self.cursor, "search.records", "record_id")
+        invalidate_schema()
+        has_column(self.cursor, "search.records", "record_id")
+        self.assertEqual(self.cursor.executed, 2)
+
+    def test_expired_snapshot_is_reprobed(self):
+        has_column(self.cursor, "search.records", "record_id")
+        schema_registry._loaded_at -= schema_registry.SCHEMA_REGISTRY_TTL_SECONDS + 1
+        has_column(self.cursor, "search.records", "record_id")
+        self.assertEqual(self.cursor.executed, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
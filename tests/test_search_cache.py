@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+
+from search_cache import (
+    RECORDS_SCOPE,
+    RETURNS_SCOPE,
+    SearchCache,
+    record_department_scope,
+    search_cache_key,
+)
+
+
+class SearchCacheTests(unittest.TestCase):
+    def test_hit_until_a_scope_it_read_is_bumped(self):
+        cache = SearchCache(max_entries=4, ttl_seconds=60)
+        scopes = [RECORDS_SCOPE, RETURNS_SCOPE]
+        cache.put("k", cache.generations(scopes), b'{"Returns": []}')
+
+        self.assertEqual(cache.get("k", scopes), b'{"Returns": []}')
+        cache.bump(record_department_scope("Civil Papers"))
+        self.assertEqual(cache.get("k", scopes), b'{"Returns": []}')
+        cache.bump(RETURNS_SCOPE)
+        self.assertIsNone(cache.get("k", scopes))
+
+    def test_write_during_query_makes_entry_stale(self):
+        cache = SearchCache(max_entries=4, ttl_seconds=60)
+        generations = cache.generations([RETURNS_SCOPE])
+        cache.bump(RETURNS_SCOPE)
+        cache.put("k", generations, b"{}")
+        self.assertIsNone(cache.get("k", [RETURNS_SCOPE]))
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = SearchCache(max_entries=2, ttl_seconds=60)
+        for key in ("a", "b"):
+            cache.put(key, {}, key.encode())
+        cache.get("a", [])
+        cache.put("c", {}, b"c")
+        self.assertIsNone(cache.get("b", []))
+        self.assertEqual(cache.get("a", []), b"a")
+
+    def test_disk_tier_shares_entries_and_generations(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            writer = SearchCache(max_entries=4, ttl_seconds=60, disk_dir=cache_dir)
+            reader = SearchCache(max_entries=4, ttl_seconds=60, disk_dir=cache_dir)
+            writer.put("k", writer.generations([RECORDS_SCOPE]), b'{"x": 1}')
+
+            self.assertEqual(reader.get("k", [RECORDS_SCOPE]), b'{"x": 1}')
+            writer.bump(RECORDS_SCOPE)
+            self.assertIsNone(reader.get("k", [RECORDS_SCOPE]))
+
+    def test_department_scope_matches_search_labels(self):
+        self.assertEqual(
+            record_department_scope("BCSO_ACTIVE_WARRANTS"),
+            record_department_scope("Bcso Active Warrants"),
+        )
+        self.assertEqual(search_cache_key({"b": 1, "a": 2}), search_cache_key({"a": 2, "b": 1}))
+
+    def test_active_warrants_label_shares_the_bcso_writer_scope(self):
+        self.assertEqual(record_department_scope("Active Warrants"), record_department_scope("BCSO_ACTIVE_WARRANTS"))
+        self.assertNotEqual(record_department_scope("Active Warrants"), record_department_scope("Civil Papers"))
+
+
+if __name__ == "__main__":
+    unittest.main()
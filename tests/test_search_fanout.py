@@ -0,0 +1,86 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from search_fanout import (
+    SEARCH_SOURCE_ERROR,
+    SEARCH_SOURCE_OK,
+    SEARCH_SOURCE_TIMEOUT,
+    iter_search_sources,
+    run_search_sources,
+)
+
+
+class SearchFanoutTests(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown(wait=True)
+
+    def test_sources_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=2)
+
+        def source(value):
+            def run():
+                barrier.wait()
+                return value
+            return run
+
+        results, statuses = run_search_sources(
+            self.executor,
+            {"records": source([1]), "returns": source([2])},
+            deadline_seconds=2,
+        )
+        self.assertEqual(results, {"records": [1], "returns": [2]})
+        self.assertEqual(statuses["records"]["status"], SEARCH_SOURCE_OK)
+        self.assertIn("elapsed_ms", statuses["returns"])
+
+    def test_slow_and_failing_sources_return_partial_results(self):
+        def slow():
+            self.release.wait(2)
+            return ["late"]
+
+        def broken():
+            raise RuntimeError("connection reset")
+
+        results, statuses = run_search_sources(
+            self.executor,
+            {"records": lambda: ["fast"], "daily_logs": slow, "returns": broken},
+            deadline_seconds=0.05,
+        )
+        self.assertEqual(results, {"records": ["fast"]})
+        self.assertEqual(statuses["daily_logs"], {"status": SEARCH_SOURCE_TIMEOUT})
+        self.assertEqual(statuses["returns"]["status"], SEARCH_SOURCE_ERROR)
+        self.assertEqual(statuses["returns"]["error"], "connection reset")
+
+    def test_iter_yields_in_completion_order_with_timeouts_last(self):
+        first_done = threading.Event()
+
+        def fast():
+            first_done.set()
+            return "fast"
+
+        def after_fast():
+            first_done.wait(2)
+            time.sleep(0.05)
+            return "second"
+
+        def slow():
+            self.release.wait(2)
+            return "late"
+
+        outcomes = list(iter_search_sources(
+            self.executor,
+            {"slow": slow, "second": after_fast, "fast": fast},
+            deadline_seconds=0.5,
+        ))
+        self.assertEqual([name for name, _, _ in outcomes], ["fast", "second", "slow"])
+        self.assertEqual(outcomes[-1][1:], (None, {"status": SEARCH_SOURCE_TIMEOUT}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,440 @@
+import json
+import unittest
+from datetime import datetime
+
+from name_index import name_trigrams, reset_name_index_backfilled, token_trigrams
+import schema_registry
+from search_sql import (
+    CASE_NUMBER_MATCH_CONTAINS,
+    CASE_NUMBER_MATCH_PREFIX,
+    NAME_MATCH_LIKE,
+    NAME_MATCH_PHONETIC,
+    NAME_MATCH_TRIGRAM,
+    build_facets_sql,
+    build_search_sql,
+    decode_page_cursor,
+    group_rows_by_department,
+    encode_page_cursor,
+    next_page_cursor,
+    normalize_case_number,
+    resolve_case_number_match,
+    resolve_name_match,
+    search_by_name,
+    search_facets,
+)
+
+
+class FakeCursor:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.description = [("record_id",), ("created_at",), ("department",)]
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchone(self):
+        return (1,)
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, rows=None):
+        self.cursor_instance = FakeCursor(rows)
+
+    def cursor(self):
+        return self.cursor_instance
+
+
+class KeysetPagingTests(unittest.TestCase):
+    def test_page_cursor_round_trips(self):
+        cursor = encode_page_cursor("Civil Papers", "2026-05-01T10:15:30.123000", 42)
+        self.assertEqual(
+            decode_page_cursor(cursor),
+            ("Civil Papers", "2026-05-01T10:15:30.123000", 42),
+        )
+
+    def test_invalid_cursor_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            decode_page_cursor("not-a-cursor")
+
+    def test_page_size_pushes_keyset_seek_and_fetch_into_sql(self):
+        sql, params = build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="smith",
+            page_size=50,
+            after=("2026-05-01T10:15:30", 42),
+        )
+        self.assertIn("created_at < CAST(? AS datetime2)", sql)
+        self.assertIn("ORDER BY created_at DESC, record_id DESC", sql)
+        self.assertIn("OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY", sql)
+        self.assertEqual(params[-4:], ["2026-05-01T10:15:30", "2026-05-01T10:15:30", 42, 50])
+
+    def test_search_by_name_filters_cursor_department(self):
+        connection = FakeConnection()
+        cursor = encode_page_cursor("Civil Papers", "2026-05-01T10:15:30", 42)
+
+        search_by_name(connection, "", page_size=25, cursor=cursor)
+
+        sql, params = connection.cursor_instance.executed[-1]
+        self.assertIn("= LOWER(?)", sql)
+        self.assertIn("Civil Papers", params)
+        self.assertEqual(params[-1], 25)
+
+    def test_search_rows_carry_full_precision_created_at_for_the_cursor(self):
+        created_at = datetime(2026, 5, 1, 10, 15, 30, 123456)
+        connection = FakeConnection(rows=[(7, created_at, "2026-05-01T10:15:30.1234567", "Civil Papers")])
+        connection.cursor_instance.description = [("record_id",), ("created_at",), ("page_created_at",), ("department",)]
+
+        rows = search_by_name(connection, "smith", page_size=1)
+
+        sql = connection.cursor_instance.executed[-1][0]
+        self.assertNotIn("FORMAT(", sql)
+        self.assertIn("CONVERT(VARCHAR(27), created_at, 126) AS page_created_at", sql)
+        self.assertEqual(rows[0]["created_at"], "2026-05-01T10:15:30")
+        cursor = next_page_cursor(rows, 1, "Civil Papers")
+        self.assertEqual(decode_page_cursor(cursor)[1], "2026-05-01T10:15:30.1234567")
+
+        search_by_name(connection, "smith", page_size=1, cursor=cursor)
+        self.assertIn("2026-05-01T10:15:30.1234567", connection.cursor_instance.executed[-1][1])
+
+    def test_next_page_cursor_only_for_full_pages(self):
+        rows = [{"record_id": 9, "page_created_at": "2026-05-01T10:15:30"}]
+        self.assertIsNone(next_page_cursor(rows, 2, "Civil Papers"))
+        cursor = next_page_cursor(rows, 1, "Civil Papers")
+        self.assertEqual(decode_page_cursor(cursor)[2], 9)
+
+
+class PerDepartmentSearchTests(unittest.TestCase):
+    def test_window_functions_rank_and_count_each_department(self):
+        sql, params = build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="smith",
+            per_department=25,
+        )
+        self.assertIn("ROW_NUMBER() OVER (", sql)
+        self.assertIn("ORDER BY created_at DESC, record_id DESC", sql)
+        self.assertIn("COUNT(*) OVER (PARTITION BY", sql)
+        self.assertIn("WHERE department_row_number <= ?", sql)
+        self.assertEqual(params[-1], 25)
+
+    def test_per_department_excludes_keyset_paging(self):
+        with self.assertRaises(ValueError):
+            build_search_sql(select_sql="record_id", from_sql="search.records", name_query="", page_size=10, per_department=10)
+
+    def test_grouping_takes_totals_from_first_row_of_each_partition(self):
+        rows = [
+            {"record_id": 9, "department": "Civil Papers", "department_row_number": 1, "department_total": 120},
+            {"record_id": 4, "department": "BCSO Active Warrants", "department_row_number": 1, "department_total": 3},
+            {"record_id": 8, "department": "Civil Papers", "department_row_number": 2, "department_total": 120},
+        ]
+        counts, grouped = group_rows_by_department(rows)
+        self.assertEqual(counts, {"Civil Papers": 120, "Bcso Active Warrants": 3})
+        self.assertEqual([row["record_id"] for row in grouped["Civil Papers"]], [9, 8])
+        self.assertEqual(grouped["Civil Papers"][0], {"record_id": 9, "department": "Civil Papers"})
+
+
+class TrigramNameSearchTests(unittest.TestCase):
+    def test_name_trigrams_cover_each_word(self):
+        self.assertEqual(token_trigrams("Smith"), ["ith", "mit", "smi"])
+        self.assertEqual(name_trigrams(["Ann Lee", None]), {"ann", "lee"})
+
+    def test_trigram_mode_intersects_postings_before_like_check(self):
+        sql, params = build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="smith jo",
+            name_match=NAME_MATCH_TRIGRAM,
+        )
+        self.assertIn("JOIN search.name_trigrams AS nt", sql)
+        # Tokens shorter than a trigram only take part in the LIKE check.
+        self.assertEqual(
+            json.loads(params[0]),
+            [{"k": 0, "g": "ith"}, {"k": 0, "g": "mit"}, {"k": 0, "g": "smi"}],
+        )
+        self.assertEqual(params[1], 3)
+        self.assertEqual(json.loads(params[2]), ["smith", "jo"])
+
+    def test_like_mode_is_the_default(self):
+        sql, _ = build_search_sql(select_sql="record_id", from_sql="search.records", name_query="smith")
+        self.assertNotIn("name_trigrams", sql)
+
+
+class PhoneticNameSearchTests(unittest.TestCase):
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+
+    def test_phonetic_mode_joins_keys_without_like(self):
+        sql, params = build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="Jonson  Smith",
+            name_match=NAME_MATCH_PHONETIC,
+        )
+        self.assertIn("JOIN search.name_phonetic_keys AS pk", sql)
+        self.assertNotIn("LIKE CONCAT", sql)
+        self.assertEqual(json.loads(params[0]), ["JANSAN", "SNAT"])
+        self.assertEqual(params[1], 2)
+
+    def test_tokens_without_letters_keep_like(self):
+        sql, params = build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="smith 1234",
+            name_match=NAME_MATCH_PHONETIC,
+        )
+        self.assertIn("LIKE CONCAT", sql)
+        self.assertEqual(json.loads(params[2]), ["1234"])
+
+    def test_falls_back_to_like_until_backfilled(self):
+        schema_registry.invalidate_schema()
+        reset_name_index_backfilled()
+        self.assertEqual(resolve_name_match(FakeCursor(), NAME_MATCH_PHONETIC), NAME_MATCH_LIKE)
+        self.assertEqual(resolve_name_match(FakeCursor(), NAME_MATCH_TRIGRAM), NAME_MATCH_LIKE)
+
+        schema_registry.invalidate_schema()
+        reset_name_index_backfilled()
+        cursor = FakeCursor([("search", "name_index_backfills", "completed_at")])
+        cursor.fetchone = lambda: (0,)
+        self.assertEqual(resolve_name_match(cursor, NAME_MATCH_PHONETIC), NAME_MATCH_LIKE)
+
+        reset_name_index_backfilled()
+        cursor.fetchone = lambda: (1,)
+        self.assertEqual(resolve_name_match(cursor, NAME_MATCH_PHONETIC), NAME_MATCH_PHONETIC)
+        self.assertEqual(resolve_name_match(cursor, NAME_MATCH_TRIGRAM), NAME_MATCH_TRIGRAM)
+        schema_registry.invalidate_schema()
+        reset_name_index_backfilled()
+
+
+class StableQueryShapeTests(unittest.TestCase):
+    def build(self, **filters):
+        return build_search_sql(select_sql="record_id", from_sql="search.records", **filters)
+
+    def test_sql_text_does_not_depend_on_list_lengths(self):
+        short_sql, short_params = self.build(
+            name_query="smith",
+            court_doc_types=["Summons"],
+            admin_status_values=["served"],
+        )
+        long_sql, long_params = self.build(
+            name_query="ann marie smith",
+            court_doc_types=["Summons", "Writ", "Notice"],
+            admin_status_values=["served", "not served", "active"],
+        )
+        self.assertEqual(short_sql, long_sql)
+        self.assertEqual(len(short_params), len(long_params))
+
+    def test_lists_bind_as_one_json_parameter(self):
+        sql, params = self.build(
+            name_query="",
+            court_doc_types=[" Summons", "summons", "Writ"],
+            admin_status_values=[f"status {i}" for i in range(3000)],
+        )
+        self.assertEqual(sql.count("OPENJSON(?)"), 2)
+        self.assertEqual(len(params), 2)
+        self.assertEqual(len(json.loads(params[0])), 3000)
+        self.assertEqual(json.loads(params[1]), ["summons", "writ"])
+
+
+class CaseNumberSearchTests(unittest.TestCase):
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+
+    def test_normalize_case_number_matches_persisted_expression(self):
+        self.assertEqual(normalize_case_number("c-24-cv 12/34"), "C24CV1234")
+
+    def test_prefix_mode_seeks_on_normalized_column(self):
+        sql, params = build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="",
+            case_number="c-24-cv",
+            case_number_match=CASE_NUMBER_MATCH_PREFIX,
+        )
+        self.assertIn("case_number_norm LIKE ?", sql)
+        self.assertEqual(params, ["C24CV%"])
+
+    def test_contains_mode_only_when_requested(self):
+        _, params = build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="",
+            case_number="24-cv",
+            case_number_match=CASE_NUMBER_MATCH_CONTAINS,
+        )
+        self.assertEqual(params, ["%24CV%"])
+
+    def test_falls_back_to_legacy_expression_without_column(self):
+        schema_registry.invalidate_schema()
+        cursor = FakeCursor([("search", "records", "case_number")])
+        self.assertIsNone(resolve_case_number_match(cursor))
+        sql, params = build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="",
+            case_number="24-cv",
+            case_number_match=None,
+        )
+        self.assertIn("REPLACE(REPLACE(REPLACE(case_number", sql)
+        self.assertEqual(params, ["%24cv%"])
+
+    def test_resolves_prefix_by_default_when_column_exists(self):
+        schema_registry.invalidate_schema()
+        cursor = FakeCursor([("search", "records", "case_number_norm")])
+        self.assertEqual(resolve_case_number_match(cursor), CASE_NUMBER_MATCH_PREFIX)
+        self.assertEqual(
+            resolve_case_number_match(cursor, CASE_NUMBER_MATCH_CONTAINS),
+            CASE_NUMBER_MATCH_CONTAINS,
+        )
+
+
+class RecordDateSearchTests(unittest.TestCase):
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+
+    def build(self, record_date_column, **filters):
+        return build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="",
+            record_date_column=record_date_column,
+            **filters,
+        )
+
+    def test_date_filters_use_persisted_column(self):
+        sql, params = self.build(True, date_start="2026-01-01", date_end="2026-01-31", last_x_days="7")
+        self.assertIn("record_date BETWEEN CAST(? AS date) AND CAST(? AS date)", sql)
+        self.assertIn("record_date >= DATEADD(day, -?, CAST(GETDATE() AS date))", sql)
+        self.assertNotIn("COALESCE(issue_date, intake_date)", sql)
+        self.assertEqual(params, ["2026-01-01", "2026-01-31", 7])
+
+    def test_falls_back_to_coalesce_without_column(self):
+        sql, _ = self.build(False, last_x_days="7")
+        self.assertIn("COALESCE(issue_date, intake_date) >= DATEADD", sql)
+        self.assertIn("issue_date IS NOT NULL", sql)
+
+    def test_search_by_name_selects_column_when_present(self):
+        schema_registry.invalidate_schema()
+        connection = FakeConnection()
+        connection.cursor_instance.rows = [("search", "records", "record_date")]
+        search_by_name(connection, "", page_size=5, last_x_days="30")
+        sql = connection.cursor_instance.executed[-1][0]
+        self.assertIn("record_date >= DATEADD", sql)
+        self.assertIn("        record_date,\n", sql)
+        self.assertNotIn("intake_date, date_time_served", sql)
+
+    def test_search_by_name_selects_return_pdf_count_when_present(self):
+        schema_registry.invalidate_schema()
+        connection = FakeConnection()
+        search_by_name(connection, "", page_size=5)
+        self.assertIn("CAST(NULL AS INT) AS return_pdf_count", connection.cursor_instance.executed[-1][0])
+        schema_registry.invalidate_schema()
+        connection = FakeConnection()
+        connection.cursor_instance.rows = [("search", "records", "return_pdf_count")]
+        search_by_name(connection, "", page_size=5)
+        self.assertIn("        return_pdf_count,\n", connection.cursor_instance.executed[-1][0])
+
+
+class DemographicCodeSearchTests(unittest.TestCase):
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+
+    def build(self, code_columns, **filters):
+        return build_search_sql(
+            select_sql="record_id",
+            from_sql="search.records",
+            name_query="",
+            code_columns=code_columns,
+            **filters,
+        )
+
+    def test_known_values_use_code_equality(self):
+        sql, params = self.build(True, sex="Male", race="Asian/Pacific Islander", issuing_county="Prince George's County")
+        self.assertIn("sex_code = ?", sql)
+        self.assertIn("race_code = ?", sql)
+        self.assertIn("issuing_county_code = ?", sql)
+        self.assertNotIn("LOWER(race)", sql)
+        self.assertEqual(params, [1, 3, 33, "%prince george's county%"])
+
+    def test_county_code_keeps_uncoded_spellings(self):
+        sql, params = self.build(True, issuing_county="Baltimore City")
+        self.assertIn("(issuing_county_code = ? OR (issuing_county_code IS NULL AND", sql)
+        self.assertIn("LOWER(issuing_county) LIKE ?", sql)
+        self.assertEqual(params, [510, "%baltimore city%"])
+
+    def test_unknown_values_keep_text_filters(self):
+        sql, params = self.build(True, race="Hispanic", issuing_county="Baltimore")
+        self.assertIn("LOWER(race) = ?", sql)
+        self.assertIn("LOWER(issuing_county) LIKE ?", sql)
+        self.assertEqual(params, ["hispanic", "%baltimore%"])
+
+    def test_text_filters_without_columns(self):
+        sql, params = self.build(False, sex="Female")
+        self.assertIn("LOWER(sex) IN (?, ?)", sql)
+        self.assertEqual(params, ["female", "f"])
+
+    def test_search_by_name_detects_columns(self):
+        schema_registry.invalidate_schema()
+        connection = FakeConnection()
+        connection.cursor_instance.rows = [
+            ("search", "records", column) for column in ("sex_code", "race_code", "issuing_county_code")
+        ]
+        search_by_name(connection, "", page_size=5, issuing_county="Baltimore City")
+        sql, params = connection.cursor_instance.executed[-1]
+        self.assertIn("issuing_county_code = ?", sql)
+        self.assertIn(510, params)
+
+
+class FacetSearchTests(unittest.TestCase):
+    def tearDown(self):
+        schema_registry.invalidate_schema()
+
+    def test_one_grouping_sets_query_without_facet_filters(self):
+        sql, params, filtered = build_facets_sql(name_query="smith", last_x_days="7")
+        self.assertIn("GROUP BY GROUPING SETS ((department), (sex), (race), (issuing_county), (court_document_type), (admin_status), ())", sql)
+        self.assertIn("COUNT(*) AS row_count", sql)
+        self.assertEqual(filtered, [])
+        self.assertEqual(params, ['["smith"]', 7])
+
+    def test_facet_filters_become_match_flags(self):
+        sql, params, filtered = build_facets_sql(name_query="", sex="Female", admin_status_values=["Served"])
+        self.assertEqual(filtered, ["sex", "admin_status"])
+        self.assertNotIn("WHERE 1=1\n    AND LOWER(sex)", sql)
+        self.assertIn("AS sex_match", sql)
+        self.assertIn("SUM(sex_match * admin_status_match) AS row_count", sql)
+        self.assertIn("SUM(admin_status_match) AS sex_count", sql)
+        self.assertIn("SUM(sex_match) AS admin_status_count", sql)
+        self.assertEqual(params, ["female", "f", '["served"]'])
+
+    def test_search_facets_reads_histograms(self):
+        schema_registry.invalidate_schema()
+        connection = FakeConnection()
+        rows = [
+            ("total", None, 3, 3),
+            ("department", "CIVIL PAPERS", 2, 2),
+            ("department", "civil papers", 1, 1),
+            ("sex", "M", 3, 3),
+            ("sex", "F", 0, 4),
+            ("race", None, 3, 3),
+            ("race", "B", 0, 1),
+        ]
+
+        def execute(sql, params=None):
+            connection.cursor_instance.executed.append((sql, params))
+            if "GROUPING SETS" in sql:
+                connection.cursor_instance.rows = rows
+
+        connection.cursor_instance.execute = execute
+        facets = search_facets(connection, "", sex="Male")
+        self.assertEqual(facets["total"], 3)
+        self.assertEqual(facets["department"], {"Civil Papers": 3})
+        self.assertEqual(facets["sex"], {"M": 3, "F": 4})
+        self.assertEqual(facets["race"], {"": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from logging.handlers import RotatingFileHandler
+
+from search_sql import search_by_name
+from search_timing import SearchProfile, log_slow_search, profile_phase, sql_shape_hash
+
+
+class FakeCursor:
+    description = [("record_id",), ("created_at",), ("department",)]
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchone(self):
+        return (1,)
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.cursor_instance = FakeCursor(rows)
+
+    def cursor(self):
+        return self.cursor_instance
+
+
+class SearchProfileTests(unittest.TestCase):
+    def test_repeated_phases_accumulate_into_server_timing(self):
+        profile = SearchProfile()
+        profile.add_phase("records_sql", 10)
+        profile.add_phase("records_sql", 2.5)
+        with profile_phase(profile, "serialize"):
+            pass
+        with profile_phase(None, "ignored"):
+            pass
+
+        header = profile.server_timing()
+        self.assertTrue(header.startswith("records_sql;dur=12.5, serialize;dur="))
+        self.assertIn(", total;dur=", header)
+        self.assertNotIn("ignored", header)
+
+    def test_sql_shape_ignores_whitespace(self):
+        self.assertEqual(sql_shape_hash("SELECT 1\n  FROM t"), sql_shape_hash("SELECT 1 FROM t"))
+        self.assertNotEqual(sql_shape_hash("SELECT 1"), sql_shape_hash("SELECT 2"))
+
+    def test_search_by_name_records_phases_shape_and_rows(self):
+        profile = SearchProfile()
+        connection = FakeConnection(rows=[(1, None, "Civil Papers"), (2, None, "Civil Papers")])
+        search_by_name(connection, "smith", page_size=10, department="Civil Papers", profile=profile)
+        search_by_name(connection, "smith", page_size=10, department="Field Services Department", profile=profile)
+
+        summary = profile.summary()
+        self.assertEqual(set(summary["phases_ms"]), {"records_sql", "records_fetch"})
+        self.assertEqual(summary["row_counts"], {"records": 4})
+        self.assertEqual(len(summary["sql_shapes"]["records"]), 1)
+
+
+class SlowSearchLogTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "slow.log")
+        self.logger = logging.getLogger(f"test.slow_search.{id(self)}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.handler = RotatingFileHandler(self.path, maxBytes=1024, backupCount=1)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+        self.tmp.cleanup()
+
+    def test_only_searches_over_threshold_are_logged(self):
+        profile = SearchProfile()
+        profile.add_rows("returns", 3)
+        self.assertFalse(log_slow_search(profile, {"query": "fast"}, threshold_ms=60000, logger=self.logger))
+        self.assertTrue(log_slow_search(profile, {"query": "slow"}, threshold_ms=0, logger=self.logger))
+
+        with open(self.path, encoding="utf-8") as handle:
+            entries = [json.loads(line) for line in handle]
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["filters"], {"query": "slow"})
+        self.assertEqual(entries[0]["row_counts"], {"returns": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
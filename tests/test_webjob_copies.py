@@ -0,0 +1,23 @@
+import filecmp
+import os
+import unittest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEBJOB_DIR = os.path.join(ROOT, "webjob_active_warrants")
+# Modules the webjob ships its own copy of; they must not drift from the app's.
+SHARED_MODULES = ("db_connect.py", "name_index.py", "phonetic.py", "schema_registry.py")
+
+
+class WebjobCopiesTests(unittest.TestCase):
+    def test_shared_modules_match_the_app(self):
+        for name in SHARED_MODULES:
+            with self.subTest(module=name):
+                self.assertTrue(
+                    filecmp.cmp(os.path.join(ROOT, name), os.path.join(WEBJOB_DIR, name), shallow=False),
+                    f"webjob_active_warrants/{name} differs from {name}",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 from db_connect import get_conn
+from name_index import delete_names_where, refresh_record_names
 import json
 import pandas as pd
 from azure.storage.blob import BlobServiceClient
@@ -71,7 +72,9 @@ def insert_search_record_warrants(cursor, record):
 
     
     
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 def insert_search_record_active_warrants(cursor, record):
     sql = """
@@ -113,7 +116,9 @@ def insert_search_record_active_warrants(cursor, record):
     )
 
     cursor.execute(sql, values)
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 def insert_search_record_population(cursor, record):
     sql = """
@@ -143,7 +148,9 @@ def insert_search_record_population(cursor, record):
     )
 
     cursor.execute(sql, *values)
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 
 def insert_search_record_fsdw(cursor, record):
@@ -187,7 +194,9 @@ def insert_search_record_fsdw(cursor, record):
     ))
 
     cursor.execute(sql, *values)
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 
 
@@ -229,7 +238,9 @@ def insert_search_record_odyssey(cursor, record):
         record.get("notes"),
     ))
     cursor.execute(sql, *values)
-    return cursor.fetchone()[0]
+    record_id = cursor.fetchone()[0]
+    refresh_record_names(cursor, record_id)
+    return record_id
 
 
 APT_RE = re.compile(r"(?i)\bapt\.?\s*#?\s*([A-Za-z0-9-]+)\b")
@@ -556,6 +567,7 @@ def ingest_population_from_table(table_name, display_department, source_file):
         cursor = conn.cursor()
 
         # OPTIONAL safety: remove prior inserts for this same source_file + department
+        delete_names_where(cursor, "department = ? AND source_file = ?", display_department, source_file)
         cursor.execute("""
             DELETE FROM search.records
             WHERE department = ? AND source_file = ?
@@ -0,0 +1,107 @@
+"""NYSIIS phonetic keys for misspelling-tolerant name search.
+
+NYSIIS (New York State Identification and Intelligence System) maps names
+that sound alike, such as "Jonson" and "Johnson", to the same short key.
+It was built for matching names in criminal-justice records, gives one key
+per word, and needs no external dependency. Keys use the original
+six-character truncation.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+
+NYSIIS_KEY_LENGTH = 6
+VOWELS = frozenset("AEIOU")
+
+_FIRST_LETTERS = (
+    ("MAC", "MCC"),
+    ("KN", "NN"),
+    ("K", "C"),
+    ("PH", "FF"),
+    ("PF", "FF"),
+    ("SCH", "SSS"),
+)
+_LAST_LETTERS = (
+    ("EE", "Y"),
+    ("IE", "Y"),
+    ("DT", "D"),
+    ("RT", "D"),
+    ("RD", "D"),
+    ("NT", "D"),
+    ("ND", "D"),
+)
+_WORD = re.compile(r"[a-z]+")
+
+
+def phonetic_words(text):
+    """Lowercase ASCII words of ``text``.
+
+    Accents are folded and apostrophes dropped ("O'Brien" is one word);
+    any other non-letter splits words.
+    """
+    folded = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode("ascii")
+    return _WORD.findall(folded.lower().replace("'", ""))
+
+
+def nysiis(word):
+    """NYSIIS key of one word, or "" when it has no letters."""
+    name = "".join(ch for ch in str(word or "").upper() if "A" <= ch <= "Z")
+    if not name:
+        return ""
+    for prefix, replacement in _FIRST_LETTERS:
+        if name.startswith(prefix):
+            name = replacement + name[len(prefix):]
+            break
+    for suffix, replacement in _LAST_LETTERS:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)] + replacement
+            break
+
+    chars = list(name)
+    key = chars[0]
+    i = 1
+    while i < len(chars):
+        ch = chars[i]
+        following = chars[i + 1] if i + 1 < len(chars) else ""
+        if ch == "E" and following == "V":
+            chars[i:i + 2] = ["A", "F"]
+        elif ch in VOWELS:
+            chars[i] = "A"
+        elif ch == "Q":
+            chars[i] = "G"
+        elif ch == "Z":
+            chars[i] = "S"
+        elif ch == "M":
+            chars[i] = "N"
+        elif ch == "K":
+            if following == "N":
+                del chars[i]
+            else:
+                chars[i] = "C"
+        elif ch == "S" and chars[i + 1:i + 3] == ["C", "H"]:
+            chars[i:i + 3] = ["S", "S", "S"]
+        elif ch == "P" and following == "H":
+            chars[i:i + 2] = ["F", "F"]
+        elif ch == "H" and (chars[i - 1] not in VOWELS or following not in VOWELS):
+            chars[i] = chars[i - 1]
+        elif ch == "W" and chars[i - 1] in VOWELS:
+            chars[i] = chars[i - 1]
+        if chars[i] != key[-1]:
+            key += chars[i]
+        i += 1
+
+    if len(key) > 1 and key.endswith("S"):
+        key = key[:-1]
+    if key.endswith("AY"):
+        key = key[:-2] + "Y"
+    if len(key) > 1 and key.endswith("A"):
+        key = key[:-1]
+    return key[:NYSIIS_KEY_LENGTH]
+
+
+def phonetic_keys(text):
+    """Distinct NYSIIS keys of every word in ``text``."""
+    return {key for key in (nysiis(word) for word in phonetic_words(text)) if key}